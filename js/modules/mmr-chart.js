@@ -5,7 +5,7 @@
 
 // Configuration
 const CONFIG = {
-  dataUrl: 'data/mmr-data.json',
+  dataUrl: 'data/mmr-data.min.json',
   gc1Threshold: 1435,
   padding: { top: 20, right: 20, bottom: 40, left: 60 },
   
@@ -100,7 +100,7 @@ function cacheElements() {
  * Load MMR data from JSON
  */
 async function loadData() {
-  const response = await fetch(CONFIG.dataUrl);
+  const response = await fetch(CONFIG.dataUrl, { cache: 'no-cache' });
   if (!response.ok) throw new Error('Failed to load MMR data');
   return response.json();
 }
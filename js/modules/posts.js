@@ -287,7 +287,7 @@ export async function initPostsFeed() {
   console.log("[PostsFeed]", POSTS_JS_VERSION);
 
   try {
-    const resp = await fetch("./data/posts.json", { cache: "no-store" });
+    const resp = await fetch("./data/posts.min.json", { cache: "no-cache" });
     if (!resp.ok) throw new Error("posts");
 
     const data = await resp.json();
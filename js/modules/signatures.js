@@ -8,6 +8,9 @@ const SIGNED_FLAG_EXPIRY = 10 * 60 * 1000; // 10 minutes
 const SHEET_CSV_URL =
   "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ2OBJcuF8Ou9z2a9-68cLtIEV1nDSuWFhJpvhbbVsR9Z4Ez4m3HbtiKjUmKOsqaNXJjeM9Xs_zsyPa/pub?gid=867923593&single=true&output=csv";
 
+// Paged fallback written by tools/update_signatures.py (summary.json + signatures-NNNN.json)
+const SIGNATURE_PAGES_DIR = "./signatures-pages";
+
 // Column headers we care about
 const COL_APPROVAL_STATUS = "approval_status";
 const COL_PUBLIC_DISPLAY_NAME = "public_display_name";
@@ -179,6 +182,51 @@ async function fetchSignaturesFromSheet() {
   };
 }
 
+/**
+ * Render the signature chips (entries are { name, comment } objects)
+ */
+function renderChips(listEl, emptyEl, entries, limit, highlightFirst) {
+  // Clear existing chips
+  listEl.innerHTML = "";
+
+  if (entries.length === 0) {
+    if (emptyEl) emptyEl.style.display = "";
+    return;
+  }
+
+  if (emptyEl) emptyEl.style.display = "none";
+
+  // Initialize tooltip system
+  initTooltips();
+
+  // Render chips with staggered animation
+  const displayEntries = entries.slice(0, limit);
+
+  displayEntries.forEach((entry, index) => {
+    const chip = document.createElement("div");
+    chip.className = "sigChip";
+    chip.textContent = entry.name;
+
+    // Add comment as data attribute for tooltip
+    if (entry.comment) {
+      // Don't add extra quotes - the CSS handles the styling
+      chip.setAttribute("data-comment", entry.comment);
+      console.log(`[SignatureWall] Chip with comment: ${entry.name} -> "${entry.comment}"`);
+    }
+
+    // Stagger the animation delay
+    const delay = index * CHIP_STAGGER_DELAY;
+    chip.style.animationDelay = `${delay}ms`;
+
+    // Highlight newest chip if just signed
+    if (highlightFirst && index === 0) {
+      chip.classList.add("sigNew");
+    }
+
+    listEl.appendChild(chip);
+  });
+}
+
 /**
  * Check if user just came back from signing
  */
@@ -473,59 +521,29 @@ export async function initSignatureWall(settings) {
     // Render milestones
     renderMilestones(total);
 
-    // Clear existing chips
-    listEl.innerHTML = "";
-
-    if (entries.length === 0) {
-      if (emptyEl) emptyEl.style.display = "";
-      return;
-    }
-
-    if (emptyEl) emptyEl.style.display = "none";
-
-    // Initialize tooltip system
-    initTooltips();
-
-    // Render chips with staggered animation
-    const limit = settings.signatureLimit || 250;
-    const displayEntries = entries.slice(0, limit);
-
-    displayEntries.forEach((entry, index) => {
-      const chip = document.createElement("div");
-      chip.className = "sigChip";
-      chip.textContent = entry.name;
-
-      // Add comment as data attribute for tooltip
-      if (entry.comment) {
-        // Don't add extra quotes - the CSS handles the styling
-        chip.setAttribute("data-comment", entry.comment);
-        console.log(`[SignatureWall] Chip with comment: ${entry.name} -> "${entry.comment}"`);
-      }
-
-      // Stagger the animation delay
-      const delay = index * CHIP_STAGGER_DELAY;
-      chip.style.animationDelay = `${delay}ms`;
-
-      // Highlight newest chip if just signed
-      if (justSigned && index === 0) {
-        chip.classList.add("sigNew");
-      }
-
-      listEl.appendChild(chip);
-    });
+    renderChips(listEl, emptyEl, entries, settings.signatureLimit || 250, justSigned);
   } catch (err) {
     console.error("[SignatureWall] Failed to load signatures:", err);
 
-    // Fallback to local JSON
+    // Fallback to the paged local JSON: the summary plus the first page only
     try {
-      console.log("[SignatureWall] Trying fallback to signatures.json...");
-      const resp = await fetch("./signatures.json", { cache: "no-store" });
+      console.log(`[SignatureWall] Trying fallback to ${SIGNATURE_PAGES_DIR}/...`);
+      const resp = await fetch(`${SIGNATURE_PAGES_DIR}/summary.min.json`, { cache: "no-cache" });
       if (resp.ok) {
         const fallbackData = await resp.json();
         totalEl.textContent = String(fallbackData.total_signatures ?? 0);
         approvedEl.textContent = String(fallbackData.approved_signatures ?? 0);
         updateProgressBar(fallbackData.total_signatures ?? 0);
         renderMilestones(fallbackData.total_signatures ?? 0);
+
+        if (fallbackData.pages > 0) {
+          const pageResp = await fetch(`${SIGNATURE_PAGES_DIR}/signatures-0001.min.json`, { cache: "no-cache" });
+          if (pageResp.ok) {
+            const names = await pageResp.json();
+            const entries = names.map((name) => ({ name, comment: "" }));
+            renderChips(listEl, emptyEl, entries, settings.signatureLimit || 250, false);
+          }
+        }
       }
     } catch {
       // Silent fail
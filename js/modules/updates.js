@@ -76,7 +76,7 @@ export async function initUpdatesFeed() {
   if (!feed) return;
 
   try {
-    const resp = await fetch("./data/updates.json", { cache: "no-store" });
+    const resp = await fetch("./data/updates.min.json", { cache: "no-cache" });
     if (!resp.ok) throw new Error("updates");
 
     const data = await resp.json();
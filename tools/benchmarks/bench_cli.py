@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark: wall time of one `python -m mmr` invocation.
+
+Each run is a fresh interpreter processing a synthetic TRN response
+(benchmarks/synthetic.py) from a file (--input) into a temporary data dir,
+so the numbers include interpreter start-up, imports, archive
+load/merge/save and every published file.
+
+    startup   - `python -c pass`, the floor
+    import    - `python -c "import mmr.cli"`
+    first     - empty data dir: full archive write + display + LOD tiers
+    repeat    - same response again: merge finds nothing new
+
+Usage:
+    python tools/benchmarks/bench_cli.py [--count 2000] [--runs 5] [--seed 28]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import trn_response
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+
+
+def wall(cmd, env):
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def report(label, times):
+    print(f"  {label:<8} min {min(times) * 1000:7.1f} ms   median {statistics.median(times) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="TRN entries in the response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(TOOLS_DIR))
+    tmp = Path(tempfile.mkdtemp(prefix="bench-cli-"))
+    try:
+        response = tmp / "trn-raw.json"
+        response.write_text(json.dumps(trn_response(args.count, args.seed, shape="listed")), encoding="utf-8")
+        data_dir = tmp / "data"
+        run = [sys.executable, "-m", "mmr", "--ci", "--input", str(response), "--data-dir", str(data_dir)]
+
+        print(f"  {args.count:,} TRN entries, {args.runs} runs each")
+        report("startup", [wall([sys.executable, "-c", "pass"], env) for _ in range(args.runs)])
+        report("import", [wall([sys.executable, "-c", "import mmr.cli"], env) for _ in range(args.runs)])
+
+        first = []
+        for _ in range(args.runs):
+            shutil.rmtree(data_dir, ignore_errors=True)
+            first.append(wall(run, env))
+        report("first", first)
+        report("repeat", [wall(run, env) for _ in range(args.runs)])
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Date-handling benchmark: string/strptime dedupe + gap fill vs epoch-day ints.
+
+The series is a synthetic multi-year history with sparse play: most days
+have no games, active days come in streaks with several samples each, and
+there are breaks of weeks to months, so gap filling has plenty to do.
+
+    strings   - the original implementation: dedupe keyed on date[:10]
+                slices, strptime twice per adjacent pair, strftime per gap
+                point (kept here as the reference)
+    ints      - points -> MmrSeries (parse_day) -> iter_daily/iter_gap_filled
+                on epoch days -> point dicts (format_day); each pass parses
+                or formats a run of same-day samples once
+
+Both produce the same point dicts; the script checks that before timing.
+
+Usage:
+    python tools/benchmarks/bench_dates.py [--years 10 50 100] [--samples 4] [--seed 28]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mmr.ranks import get_rank
+from mmr.series import MmrSeries
+from mmr.transforms import iter_daily, iter_gap_filled
+
+
+def sparse_history(years, samples, seed):
+    """Point dicts over `years` years: ~15% of days played, `samples` per active day."""
+    rng = random.Random(seed)
+    day = datetime(1990, 1, 1, tzinfo=timezone.utc)
+    end = day + timedelta(days=365 * years)
+    mmr, points = 900, []
+    while day < end:
+        roll = rng.random()
+        if roll < 0.02:
+            day += timedelta(days=rng.randint(30, 120))  # break
+            continue
+        if roll < 0.85:
+            day += timedelta(days=1)  # no games today
+            continue
+        for i in range(rng.randint(1, samples)):
+            mmr = min(2300, max(0, mmr + rng.randint(-25, 25)))
+            rank, division = get_rank(mmr)
+            when = day + timedelta(hours=8 + i * 3, minutes=rng.randint(0, 59))
+            points.append({"date": when.isoformat(), "mmr": mmr, "rank": rank, "division": division})
+        day += timedelta(days=1)
+    return points
+
+
+def strings_pipeline(points):
+    """Reference: the pre-MmrSeries dedupe_to_daily + fill_daily_gaps on point dicts."""
+    daily = {}
+    for point in points:
+        daily[point["date"][:10]] = point
+    result = sorted(daily.values(), key=lambda x: x["date"])
+
+    filled = []
+    for i, point in enumerate(result):
+        filled.append(point)
+        if i < len(result) - 1:
+            current_date = datetime.strptime(point["date"][:10], "%Y-%m-%d")
+            next_date = datetime.strptime(result[i + 1]["date"][:10], "%Y-%m-%d")
+            if (next_date - current_date).days > 1:
+                end_of_gap = next_date - timedelta(days=1)
+                filled.append({
+                    "date": end_of_gap.strftime("%Y-%m-%dT00:00:00+00:00"),
+                    "mmr": point["mmr"],
+                    "rank": point["rank"],
+                    "division": point["division"],
+                })
+    return filled
+
+
+def ints_pipeline(points):
+    series = MmrSeries.from_points(points)
+    return MmrSeries(iter_gap_filled(iter_daily(series.rows()))).to_points()
+
+
+def best_of(runs, fn, *args):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--samples", type=int, default=4, help="max samples per active day")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    print(f"  {'years':>5} {'points':>8} {'output':>8}  {'strings':>10} {'ints':>10}")
+    for years in args.years:
+        points = sparse_history(years, args.samples, args.seed)
+        expected = strings_pipeline(points)
+        if ints_pipeline(points) != expected:
+            print("  MISMATCH between string and int pipelines")
+            return 1
+
+        strings_s = best_of(args.runs, strings_pipeline, points)
+        ints_s = best_of(args.runs, ints_pipeline, points)
+        print(f"  {years:>5} {len(points):>8,} {len(expected):>8,}  {strings_s * 1000:7.1f} ms "
+              f"{ints_s * 1000:7.1f} ms   ({strings_s / ints_s:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
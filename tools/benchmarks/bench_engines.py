@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Transform engines: property check + timing, pure Python vs NumPy.
+
+First the NumPy engine (mmr.npengine) is checked against the row
+generators in mmr.transforms on many random series: every transform and
+the rank classifier must give exactly the same columns. The series mix
+the cases that matter - empty and one-row series, many samples per day,
+long gaps, flat runs, MMR at division boundaries, days out of order (both
+engines must treat them alike). Any mismatch is printed and the script
+exits 1 before timing anything.
+
+Then both engines are timed on synthetic TRN histories:
+
+    dedupe, gap_fill, consolidate, display (all three fused), ranks
+
+Usage:
+    python tools/benchmarks/bench_engines.py [--cases 2000] [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mmr import npengine, transforms
+from mmr.pipeline import PLAYLIST_ID
+from mmr.ranks import _DIVISION_BOUNDS, rank_indices
+from mmr.series import MmrSeries
+from mmr.trn import extract_playlist
+from synthetic import trn_response
+
+STAGES = {
+    "dedupe": (transforms.iter_daily, npengine.dedupe_to_daily),
+    "gap_fill": (transforms.iter_gap_filled, npengine.fill_daily_gaps),
+    "consolidate": (transforms.iter_consolidated, npengine.consolidate_flat_periods),
+    "display": (transforms.iter_display, npengine.display_series),
+}
+
+
+def random_series(rng):
+    """A random (mostly date-ordered) series exercising the transform edge cases."""
+    n = rng.choice([0, 1, 2, 3, rng.randint(4, 40), rng.randint(40, 600)])
+    boundaries = [int(b) for b in _DIVISION_BOUNDS]
+    day, mmr, rows = rng.randint(0, 20000), rng.randint(0, 2300), []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.3:
+            pass  # same day
+        elif roll < 0.7:
+            day += 1
+        elif roll < 0.95:
+            day += rng.randint(2, 60)
+        else:
+            day -= rng.randint(1, 3)  # out of order
+        roll = rng.random()
+        if roll < 0.15:
+            mmr = rng.choice(boundaries) + rng.choice((-1, 0, 1))
+        elif roll < 0.6:
+            mmr = max(0, min(2300, mmr + rng.randint(-30, 30)))
+        rows.append((day, mmr, rng.randint(0, 88), rng.randint(0, 5)))
+    return MmrSeries(rows)
+
+
+def check(cases, seed):
+    """Compare both engines on `cases` random series. Returns the number of mismatches."""
+    rng = random.Random(seed)
+    bad = 0
+    for case in range(cases):
+        series = random_series(rng)
+        for name, (rows_fn, np_fn) in STAGES.items():
+            if np_fn(series) != MmrSeries(rows_fn(series.rows())):
+                bad += 1
+                print(f"  MISMATCH: {name}, case {case} ({len(series)} rows)")
+        mmrs = list(series.mmrs) + [rng.uniform(-5, 2500) for _ in range(10)]
+        if npengine.rank_indices(mmrs).tolist() != rank_indices(mmrs):
+            bad += 1
+            print(f"  MISMATCH: ranks, case {case}")
+    return bad
+
+
+def best_of(runs, fn, *args):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000, help="random series in the property check")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    if not npengine.HAS_NUMPY:
+        print("  numpy is not installed - nothing to compare")
+        return 1
+    bad = check(args.cases, args.seed)
+    if bad:
+        print(f"  {bad} mismatch(es) between the engines")
+        return 1
+    print(f"  Property check: {args.cases} random series, engines agree\n")
+
+    print(f"  {'stage':<12} {'entries':>10} {'python':>11} {'numpy':>11}")
+    for size in args.sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, series = extract_playlist(trn_response(size, args.seed), PLAYLIST_ID)
+        for name, (rows_fn, np_fn) in STAGES.items():
+            py_s = best_of(args.runs, lambda: MmrSeries(rows_fn(series.rows())))
+            np_s = best_of(args.runs, np_fn, series)
+            print(f"  {name:<12} {size:>10,} {py_s * 1000:8.1f} ms {np_s * 1000:8.1f} ms   ({py_s / np_s:.0f}x)")
+        mmrs = list(series.mmrs)
+        py_s = best_of(args.runs, rank_indices, mmrs)
+        np_s = best_of(args.runs, npengine.rank_indices, mmrs)
+        print(f"  {'ranks':<12} {size:>10,} {py_s * 1000:8.1f} ms {np_s * 1000:8.1f} ms   ({py_s / np_s:.0f}x)")
+    print(f"\n  auto engine: NumPy from {transforms.NUMPY_MIN_ROWS:,} rows "
+          f"({transforms.NUMPY_LOADED_MIN_ROWS:,} once numpy is imported)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
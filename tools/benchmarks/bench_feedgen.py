@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+feedgen bulk import: one write per item (the interactive path) vs `feedgen batch`.
+
+For each size, a backlog of synthetic posts (images, YouTube cards, links,
+random dates) is imported into a copy of data/posts.json:
+
+    per-item  - what N interactive runs do: load_json -> add_item_at_top ->
+                save_json (pretty + min rewrite) once per item
+    batch     - feedgen.main(["batch", "posts", backlog.jsonl]): read,
+                validate all, one merge, one write
+
+Both feeds must end up holding the same items (batch additionally keeps
+them in date order). Re-running the batch must add nothing.
+
+Usage:
+    python tools/benchmarks/bench_feedgen.py [--sizes 100 500] [--seed 28]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import feedgen
+
+REPO = Path(__file__).resolve().parent.parent.parent
+
+
+def backlog(count, rng):
+    """Synthetic post items, as a feed author would write them in a JSONL file."""
+    start = date(2025, 1, 1)
+    items = []
+    for i in range(count):
+        item = {
+            "date": (start + timedelta(days=rng.randint(0, 400))).isoformat(),
+            "title": f"Post {i}",
+            "body": f"Day {i} of the campaign.\nStill no controller.",
+        }
+        if rng.random() < 0.5:
+            item["time"] = f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+        roll = rng.random()
+        if roll < 0.3:
+            item["media"] = [{"type": "image", "src": f"assets/img/post-{i}.png", "alt": "Post image"}]
+        elif roll < 0.6:
+            item["media"] = [{"type": "video", "url": f"https://youtu.be/vid{i:06d}"}]
+        if rng.random() < 0.4:
+            item["links"] = [{"label": "Tracker", "url": f"https://example.com/{i}"}]
+        items.append(item)
+    return items
+
+
+def fresh_repo(root):
+    shutil.rmtree(root, ignore_errors=True)
+    (root / "data").mkdir(parents=True)
+    shutil.copy(REPO / "data" / "posts.json", root / "data" / "posts.json")
+    return str(root / "data" / "posts.json")
+
+
+def per_item(path, items):
+    for item in items:
+        data = feedgen.load_json(path)
+        feedgen.add_item_at_top(data, feedgen.validate_item(item, "posts"))
+        feedgen.save_json(path, data)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-feedgen-"))
+    print(f"  {'items':>6}  {'per-item':>10}  {'batch':>10}  {'re-run':>10}")
+    try:
+        for count in args.sizes:
+            items = backlog(count, random.Random(args.seed))
+            source = tmp / f"backlog-{count}.jsonl"
+            source.write_text("".join(json.dumps(item) + "\n" for item in items), encoding="utf-8")
+
+            one_path = fresh_repo(tmp / "one")
+            _, one_s = timed(per_item, one_path, items)
+            fresh_repo(tmp / "batch")
+            argv = ["--repo", str(tmp / "batch"), "batch", "posts", str(source)]
+            code, batch_s = timed(feedgen.main, argv)
+            before = (tmp / "batch" / "data" / "posts.json").read_bytes()
+            _, rerun_s = timed(feedgen.main, argv)
+
+            one = json.loads(Path(one_path).read_text(encoding="utf-8"))["items"]
+            batch = json.loads(before)["items"]
+            key = lambda item: json.dumps(item, sort_keys=True)
+            if code != 0 or sorted(map(key, one)) != sorted(map(key, batch)):
+                print("  MISMATCH between per-item and batch imports")
+                return 1
+            if batch != sorted(batch, key=feedgen.item_sort_key, reverse=True):
+                print("  Batch feed is not in date order")
+                return 1
+            if (tmp / "batch" / "data" / "posts.json").read_bytes() != before:
+                print("  Re-running the batch changed the feed")
+                return 1
+            print(f"  {count:>6,}  {one_s * 1000:7.1f} ms  {batch_s * 1000:7.1f} ms  {rerun_s * 1000:7.1f} ms")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
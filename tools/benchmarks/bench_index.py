@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Archive index: every query checked against a plain scan, plus build vs update time.
+
+A seeded random archive (a random walk from Bronze to SSL with long
+gaps) and a "wobble" archive (Champion I d1 -> d2 -> d1 with
+nothing in between) are written with the pipeline's archive writer and
+indexed by mmr.index.update_index(). Then:
+
+    residency   - with and without a division, against a scan of the series
+    range/at    - a middle third of the archive, and the run on its last day
+    first       - the first point at the highest rank reached
+    incremental - the last 200 points rewritten: updating the index from
+                  there must give the same offsets/runs/records as a full
+                  rebuild
+    mismatch    - a series that does not match the archive on disk drops
+                  the index instead of raising; the next good update
+                  builds it again
+
+Any mismatch is printed and the script exits 1. Otherwise the times of
+the full build and of the incremental update at --points are printed.
+
+Usage:
+    python tools/benchmarks/bench_index.py [--points 3000] [--seed 28]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mmr.index import ArchiveIndex, index_path_for, update_index
+from mmr.pipeline import write_json_archive
+from mmr.ranks import RANK_LABELS, rank_index
+from mmr.series import GAP_TIME, MmrSeries, format_day, parse_day, time_id
+
+
+def expected_periods(series, rank, division=None):
+    """residency() computed by a plain scan over the series (the reference)."""
+    periods, prev = [], None
+    for pos, label in enumerate(series.ranks):
+        name, div = RANK_LABELS[label]
+        inside = name == rank and (division is None or div == division)
+        if inside and prev == pos - 1:
+            period = periods[-1]
+            period[3] = pos
+            if period[1] != div:
+                period[1] = None
+        elif inside:
+            periods.append([name, div, pos, pos])
+        prev = pos if inside else prev
+    return [(name, div, first, last) for name, div, first, last in periods]
+
+
+def spans(index, periods):
+    """(rank, division, first position, last position) of residency() periods."""
+    return [(p["rank"], p["division"], bisect_left(index.days, parse_day(p["start"])),
+             bisect_left(index.days, parse_day(p["end"]))) for p in periods]
+
+
+def random_series(points, rng):
+    mmr, rows, day = 900, [], 19000
+    for _ in range(points):
+        day += rng.choice((1, 1, 1, 2, 9))
+        mmr = min(1900, max(100, mmr + rng.randint(-30, 30)))
+        rows.append((day, mmr, rank_index(mmr), time_id("T12:00:00+00:00")))
+    return MmrSeries(rows)
+
+
+def check_queries(name, index, case, check):
+    points_out = case.to_points()
+    for rank in {RANK_LABELS[label][0] for label in case.ranks}:
+        check(f"{name} residency {rank}", spans(index, index.residency(rank)), expected_periods(case, rank))
+        for division in (1, 2, 3, 4):
+            check(f"{name} residency {rank} {division}", spans(index, index.residency(rank, division)),
+                  expected_periods(case, rank, division))
+    first, last = len(case) // 3, 2 * len(case) // 3
+    check(f"{name} range", index.range(points_out[first]["date"][:10], points_out[last]["date"][:10]),
+          points_out[first:last + 1])
+    at = index.at(points_out[last]["date"][:10])
+    check(f"{name} at", (at["rank"], at["division"]), (points_out[last]["rank"], points_out[last]["division"]))
+    best = max(case.ranks)
+    check(f"{name} first", index.first_reached(*RANK_LABELS[best]), points_out[list(case.ranks).index(best)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=3000, help="points in the random archive")
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(label, got, expected):
+        if got != expected:
+            failures.append(f"{label}: got {got!r}, expected {expected!r}")
+
+    series = random_series(args.points, random.Random(args.seed))
+    wobble = MmrSeries([(d, m, rank_index(m), GAP_TIME) for d, m in
+                        ((18000, 1000), (18001, 1031), (18002, 1050), (18003, 1032), (18004, 1120))])
+
+    with tempfile.TemporaryDirectory(prefix="bench-index-") as tmp, contextlib.redirect_stdout(io.StringIO()):
+        for name, case in (("random", series), ("wobble", wobble)):
+            path = Path(tmp) / f"{name}-archive.json"
+            write_json_archive({"dataPoints": case, "lastUpdated": None}, path)
+            start = time.perf_counter()
+            index = update_index(path, case)
+            if case is series:
+                build_s = time.perf_counter() - start
+            check_queries(name, index, case, check)
+        check("wobble divisions", [RANK_LABELS[label] for label in wobble.ranks][1:4],
+              [("Champion I", 1), ("Champion I", 2), ("Champion I", 1)])
+        check("wobble periods", [(p["start"], p["end"], p["division"]) for p in index.residency("Champion I")],
+              [(format_day(18001), format_day(18003), None)])
+
+        # Incremental update after a rewritten tail == a full rebuild
+        path = Path(tmp) / "random-archive.json"
+        tail = max(0, len(series) - 200)
+        changed = MmrSeries(series.rows())
+        changed.truncate(tail)
+        changed.extend((d, min(1900, m + 5), rank_index(min(1900, m + 5)), t)
+                       for d, m, _, t in list(series.rows(tail)))
+        write_json_archive({"dataPoints": changed, "lastUpdated": None}, path)
+        start = time.perf_counter()
+        incremental = update_index(path, changed, tail)
+        update_s = time.perf_counter() - start
+        rebuilt = ArchiveIndex(path)
+        rebuilt.update(changed)
+        check("incremental update", (incremental.offsets, incremental.runs, incremental.records),
+              (rebuilt.offsets, rebuilt.runs, rebuilt.records))
+
+        # An archive that does not match the series drops the index instead of raising;
+        # the next update with the right series builds it again
+        longer = MmrSeries(changed.rows())
+        longer.extend((d + 400, m, r, t) for d, m, r, t in list(changed.rows(len(changed) - 3)))
+        check("mismatched archive", (update_index(path, longer, tail), index_path_for(path).exists()),
+              (None, False))
+        again = update_index(path, changed, tail)
+        check("rebuilt after drop", again is not None and again.offsets, rebuilt.offsets)
+
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    if failures:
+        print(f"  {len(failures)} mismatch(es) between the index and a plain scan")
+        return 1
+    print(f"  {args.points:,} points: every query matches a plain scan")
+    print(f"  full build {build_s * 1000:.1f} ms, update of the last 200 points {update_s * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
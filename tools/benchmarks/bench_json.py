@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+JSON codec benchmark: jsoncodec (orjson/msgspec when installed) vs stdlib.
+
+For each size, a synthetic TRN response is written to a temp file, then:
+
+    decode      - whole response: json.loads vs jsoncodec.loads
+    extract     - playlist 28 from the file: full load + extract_playlist
+                  vs the streaming extract_playlist_file (time + peak memory)
+    pretty      - the archive's point list: json.dumps(indent=2) vs
+                  jsoncodec.dumps_pretty (also checked byte-identical)
+    compact     - same, compact separators
+
+Before that, each value the fast encoders spell differently (non-ASCII
+text, 1e-05, 1e+16, NaN, +-Infinity, huge ints) must encode to the same
+bytes as the stdlib, with NaN and +-Infinity as null, in both forms and
+on both the installed backend and the stdlib fallback.
+
+Usage:
+    python tools/benchmarks/bench_json.py [--sizes 10000 100000 1000000] [--seed 28]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import jsoncodec
+from mmr.pipeline import PLAYLIST_ID
+from mmr.trn import extract_playlist, extract_playlist_file
+from synthetic import trn_response
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def peak_of(fn, *args):
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def full_extract(path):
+    return extract_playlist(jsoncodec.load_path(path), PLAYLIST_ID)
+
+
+EDGE_CASES = {"text": "Zoë", "small": 0.00001, "big": 1e16, "nan": float("nan"), "inf": float("inf"),
+              "-inf": float("-inf"), "none": None, "huge": 2**70, "float": 1000.5}
+
+
+@contextlib.contextmanager
+def stdlib_only():
+    """jsoncodec with its fast backends switched off."""
+    saved = jsoncodec.HAS_ORJSON, jsoncodec.HAS_MSGSPEC
+    jsoncodec.HAS_ORJSON = jsoncodec.HAS_MSGSPEC = False
+    try:
+        yield
+    finally:
+        jsoncodec.HAS_ORJSON, jsoncodec.HAS_MSGSPEC = saved
+
+
+def edge_mismatches():
+    """
+    Edge-case values (each in its own document, so no other value forces
+    the stdlib path) where jsoncodec differs from the stdlib, with NaN and
+    +-Infinity expected as null. Checked on the installed backend and on
+    the stdlib fallback.
+    """
+    bad = []
+    for backend, ctx in ((jsoncodec.BACKEND, contextlib.nullcontext), ("json", stdlib_only)):
+        with ctx():
+            for key, value in EDGE_CASES.items():
+                doc = {"points": [{"value": value}, {"value": None}]}
+                finite = {"points": [{"value": value if not isinstance(value, float) or math.isfinite(value) else None},
+                                     {"value": None}]}
+                for ensure_ascii in (True, False):
+                    if jsoncodec.dumps_pretty(doc, ensure_ascii) != \
+                            json.dumps(finite, indent=2, ensure_ascii=ensure_ascii).encode("utf-8") or \
+                            jsoncodec.dumps_compact(doc, ensure_ascii) != \
+                            json.dumps(finite, separators=(",", ":"), ensure_ascii=ensure_ascii).encode("utf-8"):
+                        bad.append(f"{key} ({backend}, ensure_ascii={ensure_ascii})")
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    print(f"  jsoncodec backend: {jsoncodec.BACKEND}")
+    bad = edge_mismatches()
+    if bad:
+        print(f"  MISMATCH with the stdlib on edge-case values: {', '.join(bad)}")
+        return 1
+    print(f"  {'entries':>9}  {'step':<8} {'stdlib/full':>12} {'jsoncodec':>12}")
+    tmp = Path(tempfile.mkdtemp(prefix="bench-json-"))
+    try:
+        for count in args.sizes:
+            path = tmp / f"trn-{count}.json"
+            path.write_text(json.dumps(trn_response(count, args.seed, shape="listed")), encoding="utf-8")
+            body = path.read_bytes()
+
+            _, std_s = timed(json.loads, body)
+            _, codec_s = timed(jsoncodec.loads, body)
+            print(f"  {count:>9,}  {'decode':<8} {std_s * 1000:9.1f} ms {codec_s * 1000:9.1f} ms")
+
+            (_, full), full_s = timed(full_extract, path)
+            (_, streamed), stream_s = timed(extract_playlist_file, path, PLAYLIST_ID)
+            if full != streamed:
+                print("  MISMATCH between full and streaming extract")
+                return 1
+            print(f"  {count:>9,}  {'extract':<8} {full_s * 1000:9.1f} ms {stream_s * 1000:9.1f} ms")
+            print(f"  {count:>9,}  {'  peak':<8} {peak_of(full_extract, path) / 2**20:8.1f} MiB "
+                  f"{peak_of(extract_playlist_file, path, PLAYLIST_ID) / 2**20:8.1f} MiB")
+
+            archive = {"dataPoints": full.to_points(), "lastUpdated": None}
+            text, std_s = timed(json.dumps, archive, indent=2)
+            data, codec_s = timed(jsoncodec.dumps_pretty, archive)
+            if text.encode("utf-8") != data:
+                print("  MISMATCH in pretty output")
+                return 1
+            print(f"  {count:>9,}  {'pretty':<8} {std_s * 1000:9.1f} ms {codec_s * 1000:9.1f} ms")
+            _, std_s = timed(json.dumps, archive, separators=jsoncodec.COMPACT_SEPARATORS)
+            _, codec_s = timed(jsoncodec.dumps_compact, archive)
+            print(f"  {count:>9,}  {'compact':<8} {std_s * 1000:9.1f} ms {codec_s * 1000:9.1f} ms")
+            path.unlink()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Signature name dedupe: normalized-name index on synthetic sheets up to 1M rows.
+
+Rows come from bench_signatures.sheet_rows (~10% repeat submissions of an
+earlier name, re-typed with other case, spacing or fullwidth letters).
+
+    normalize   - update_signatures.normalize_name over every name (ASCII
+                  fast path) vs the always-NFKC/casefold form
+    dedupe      - NameIndex (one dict lookup per row) vs scanning a list of
+                  the keys seen so far (the naive approach; only run up to
+                  --naive-max rows, it is quadratic)
+    parse       - parse_signatures over the whole CSV (full scan)
+    append      - the incremental run: checkpoint prefix hashed, --append new
+                  rows deduplicated against the loaded index
+    index i/o   - save/load of the persisted index (size on disk)
+
+The NameIndex results are checked against plain-set dedupe first.
+
+Usage:
+    python tools/benchmarks/bench_names.py [--rows 10000 100000 1000000] [--append 1000]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import shutil
+import sys
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_signatures import sheet_rows, to_csv
+from update_signatures import NameIndex, load_index, normalize_name, parse_signatures, save_index
+
+
+def normalize_generic(name):
+    return " ".join(unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", name).casefold()).split())
+
+
+def naive_dedupe(names):
+    seen, unique = [], 0
+    for name in names:
+        key = normalize_generic(name)
+        if key not in seen:
+            seen.append(key)
+            unique += 1
+    return unique
+
+
+def index_dedupe(names):
+    index = NameIndex()
+    for name in names:
+        index.add(name, True)
+    return index
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def parse(body, index, state=None, previous=None):
+    lines = io.StringIO(body.decode("utf-8"), newline="")
+    return parse_signatures(lines, index, state, previous)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--append", type=int, default=1000, help="rows added for the incremental run")
+    parser.add_argument("--naive-max", type=int, default=20_000, help="largest size for the list-scan dedupe")
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-names-"))
+    print(f"  {'rows':>9}  {'step':<10} {'time':>10}  notes")
+    try:
+        for count in args.rows:
+            rng = random.Random(args.seed)
+            rows = sheet_rows(count, rng)
+            names = [row[2].strip() for row in rows]
+
+            expected = len({normalize_generic(n) for n in names if n}) + names.count("")
+            if any(normalize_name(n) != normalize_generic(n) for n in names):
+                print("  MISMATCH: ASCII fast path differs from NFKC/casefold")
+                return 1
+            index, dedupe_s = timed(index_dedupe, names)
+            if index.unique_signers != expected:
+                print(f"  MISMATCH: NameIndex found {index.unique_signers} unique signers, sets {expected}")
+                return 1
+
+            _, fast_s = timed(lambda: [normalize_name(n) for n in names])
+            _, generic_s = timed(lambda: [normalize_generic(n) for n in names])
+            print(f"  {count:>9,}  {'normalize':<10} {fast_s * 1000:7.1f} ms  "
+                  f"(always NFKC: {generic_s * 1000:.1f} ms)")
+            note = f"{index.unique_signers:,} unique, {index.duplicates:,} repeats"
+            if count <= args.naive_max:
+                _, naive_s = timed(naive_dedupe, names)
+                note += f" (list scan: {naive_s * 1000:.1f} ms)"
+            print(f"  {count:>9,}  {'dedupe':<10} {dedupe_s * 1000:7.1f} ms  {note}")
+
+            body = to_csv(rows)
+            full_index = NameIndex()
+            (data, state), parse_s = timed(parse, body, full_index)
+            print(f"  {count:>9,}  {'parse':<10} {parse_s * 1000:7.1f} ms  "
+                  f"{data['approved_signatures']:,} on the wall")
+
+            index_file = tmp / f"index-{count}.json"
+            _, save_s = timed(save_index, index_file, full_index, state["digest"])
+            loaded, load_s = timed(load_index, index_file, state)
+            print(f"  {count:>9,}  {'index i/o':<10} {(save_s + load_s) * 1000:7.1f} ms  "
+                  f"save {save_s * 1000:.1f} ms + load {load_s * 1000:.1f} ms, "
+                  f"{index_file.stat().st_size / 2**20:.1f} MiB")
+
+            rows += sheet_rows(args.append, rng, start=len(rows))
+            appended_body = to_csv(rows)
+            (appended, _), append_s = timed(parse, appended_body, loaded, state, data)
+            (reference, _), _ = timed(parse, appended_body, NameIndex())
+            if appended != reference:
+                print("  MISMATCH: incremental run differs from a full scan")
+                return 1
+            print(f"  {len(rows):>9,}  {'append':<10} {append_s * 1000:7.1f} ms  "
+                  f"+{args.append:,} rows against the loaded index")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
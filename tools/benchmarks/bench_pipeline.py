@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Per-stage benchmark of the MMR pipeline against a stored baseline.
+
+For each size a seeded synthetic TRN response (benchmarks/synthetic.py:
+same-day repeats, gaps, long breaks, flat runs, four playlists) is pushed
+through every stage, each timed on its own (best of several runs) and
+then re-run under tracemalloc for its peak memory:
+
+    extract      - mmr.trn.extract_playlist (response -> MmrSeries)
+    merge        - merge_with_archive of the newest 20% (+30 days overlap)
+                   into an archive holding the rest
+    dedupe       - transforms.dedupe_to_daily
+    gap_fill     - transforms.fill_daily_gaps
+    consolidate  - transforms.consolidate_flat_periods
+    display      - pipeline.build_display_data (fused stages + bands)
+
+Every stage runs on one engine (mmr.transforms.set_engine), --engine
+python by default, so the numbers don't depend on whether numpy happens
+to be installed. --engine numpy runs them all on mmr.npengine, which
+trades about 2-6x the pure-Python peak (masks and intermediate arrays)
+for 10-40x less time at 1M rows.
+
+Results are compared with the baseline of the same engine in
+benchmarks/baseline.json ("engines": {"python": ..., "numpy": ...}). A stage slower than
+baseline * (1 + --time-tolerance) + --slack-ms, or peaking above
+baseline * (1 + --memory-tolerance) bytes, is reported as a REGRESSION and
+the script exits 1. Timings are machine specific: after an intended change, or
+on a new machine, rerun with --update-baseline and commit the file.
+
+Usage:
+    python tools/benchmarks/bench_pipeline.py [--sizes 1000 10000 100000 1000000]
+    python tools/benchmarks/bench_pipeline.py --engine numpy
+    python tools/benchmarks/bench_pipeline.py [--engine numpy] --update-baseline
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from mmr.pipeline import PLAYLIST_ID, build_display_data, merge_with_archive
+from mmr.series import MmrSeries
+from mmr.transforms import consolidate_flat_periods, dedupe_to_daily, fill_daily_gaps, set_engine
+from mmr.trn import extract_playlist
+from synthetic import trn_response
+
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+OVERLAP_DAYS = 30
+MIN_TIMED = 0.2
+MAX_RUNS = 200
+
+
+def split_for_merge(series):
+    """(archive dict, new series): archive = one-per-day history before the TRN window."""
+    cutoff = series.days[int(len(series) * 0.8)]
+    archive = dedupe_to_daily(MmrSeries(r for r in series.rows() if r[0] < cutoff))
+    new = MmrSeries(r for r in series.rows() if r[0] >= cutoff - OVERLAP_DAYS)
+    return archive, new
+
+
+def stages(response):
+    """(name, setup, run) per stage; setup() builds fresh input so runs don't share state."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, series = extract_playlist(response, PLAYLIST_ID)
+    archive, new = split_for_merge(series)
+    daily = dedupe_to_daily(series)
+    filled = fill_daily_gaps(daily)
+    return [
+        ("extract", lambda: (response, PLAYLIST_ID), lambda args: extract_playlist(*args)),
+        ("merge", lambda: ({"dataPoints": MmrSeries(archive.rows())}, new),
+         lambda args: merge_with_archive(*args)),
+        ("dedupe", lambda: series, dedupe_to_daily),
+        ("gap_fill", lambda: daily, fill_daily_gaps),
+        ("consolidate", lambda: filled, consolidate_flat_periods),
+        ("display", lambda: daily, build_display_data),
+    ]
+
+
+def measure(setup, run, repeat):
+    """
+    (best seconds, peak bytes above the stage's input). Fast stages are
+    repeated until about MIN_TIMED seconds have been spent, so millisecond
+    timings are a minimum over many runs rather than a single noisy one.
+    """
+    best, spent, runs = None, 0.0, 0
+    while runs < repeat or (spent < MIN_TIMED and runs < MAX_RUNS):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        spent += elapsed
+        runs += 1
+
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(args)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return best, peak
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance, slack):
+    """Regressions of `results` against one engine's `baseline` stages (descriptions)."""
+    regressions = []
+    for stage, by_size in results.items():
+        for size, result in by_size.items():
+            ref = baseline.get(stage, {}).get(size)
+            if ref is None:
+                continue
+            slow = result["seconds"] > ref["seconds"] * (1 + time_tolerance) + slack
+            big = result["peakBytes"] > ref["peakBytes"] * (1 + memory_tolerance)
+            if slow:
+                regressions.append(f"{stage} @ {int(size):,}: {result['seconds'] * 1000:.1f} ms "
+                                   f"vs baseline {ref['seconds'] * 1000:.1f} ms")
+            if big:
+                regressions.append(f"{stage} @ {int(size):,}: peak {result['peakBytes'] / 2**20:.2f} MiB "
+                                   f"vs baseline {ref['peakBytes'] / 2**20:.2f} MiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="TRN entries per run")
+    parser.add_argument("--seed", type=int, default=28)
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python",
+                        help="transform engine for every stage; each has its own baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="minimum timed runs per stage (best is kept)")
+    parser.add_argument("--time-tolerance", type=float, default=1.0, help="allowed slowdown (1.0 = 2x)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="allowed peak memory growth")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="slowdown always allowed, in ms")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE))
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args()
+
+    try:
+        set_engine(args.engine)
+    except RuntimeError as e:
+        print(f"  {e}")
+        return 1
+
+    baseline_path = Path(args.baseline)
+    stored = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+    baseline = stored.get("engines", {}).get(args.engine, {})
+
+    results = {}
+    print(f"  {'stage':<12} {'entries':>10} {'time':>11} {'peak':>11} {'vs baseline':>12}")
+    for size in args.sizes:
+        response = trn_response(size, args.seed)
+        repeat = args.repeat if size < 1_000_000 else min(args.repeat, 2)
+        for name, setup, run in stages(response):
+            seconds, peak = measure(setup, run, repeat)
+            results.setdefault(name, {})[str(size)] = {"seconds": round(seconds, 6), "peakBytes": peak}
+            ref = baseline.get(name, {}).get(str(size))
+            ratio = f"{seconds / ref['seconds']:.2f}x" if ref and ref["seconds"] else "-"
+            print(f"  {name:<12} {size:>10,} {seconds * 1000:>8.1f} ms {peak / 2**20:>7.2f} MiB {ratio:>12}")
+        del response
+
+    if args.update_baseline:
+        engines = stored.get("engines", {})
+        for name, by_size in results.items():
+            engines.setdefault(args.engine, {}).setdefault(name, {}).update(by_size)
+        baseline_path.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "engines": engines,
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"\n  {args.engine} baseline written to {baseline_path.name}")
+        return 0
+
+    if not baseline:
+        print(f"\n  No {args.engine} baseline in {baseline_path} - run with --update-baseline to create one")
+        return 0
+    if stored.get("seed") != args.seed:
+        print(f"\n  Baseline was recorded with seed {stored.get('seed')}, not {args.seed} - not comparing")
+        return 0
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance, args.slack_ms / 1000)
+    if regressions:
+        print("\n  REGRESSION against baseline:")
+        for line in regressions:
+            print(f"    {line}")
+        return 1
+    print("\n  No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: linear-scan get_rank vs the bisect classifier in mmr.ranks.
+
+Usage:
+    python tools/benchmarks/bench_ranks.py [--count 1000000] [--seed 28]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mmr.ranks import RANK_THRESHOLDS, classify_many, get_rank
+
+
+def linear_get_rank(mmr):
+    """The original per-point scan, kept here as the reference."""
+    for i, (threshold, rank) in enumerate(RANK_THRESHOLDS):
+        if mmr >= threshold:
+            next_t = RANK_THRESHOLDS[i - 1][0] if i > 0 else threshold + 200
+            div = min(4, int((mmr - threshold) / ((next_t - threshold) / 4)) + 1)
+            return rank, div
+    return "Unranked", 0
+
+
+def timed(label, fn, baseline=None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms{speedup}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mmrs = [rng.randint(-50, 2300) for _ in range(args.count)]
+
+    print(f"  Classifying {args.count:,} MMR values")
+    expected, base = timed("linear scan", lambda: [linear_get_rank(m) for m in mmrs])
+    single, _ = timed("bisect get_rank", lambda: [get_rank(m) for m in mmrs], base)
+    batch, _ = timed("bisect classify_many", lambda: classify_many(mmrs), base)
+
+    if single != expected or batch != expected:
+        print("  MISMATCH against linear scan")
+        return 1
+    print("  Results identical to linear scan")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: point dicts vs the columnar MmrSeries.
+
+"retained" is everything still allocated after the build, including any
+module-level state the conversion leaves behind (date memos, interned time
+suffixes); for MmrSeries that share is also shown on its own. The export
+step streams every point out through iter_points() and keeps none of
+them, so what it retains is purely such state.
+
+Usage:
+    python tools/benchmarks/bench_series_memory.py [--count 1000000] [--seed 28]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mmr.ranks import classify_many
+from mmr.series import GAP_TIME_SUFFIX, MmrSeries
+
+
+def synthetic_entries(count, seed):
+    """(date string, mmr) pairs, one per day, random-walk MMR."""
+    rng = random.Random(seed)
+    mmr = 900
+    for i in range(count):
+        mmr = min(2300, max(0, mmr + rng.randint(-25, 25)))
+        yield date.fromordinal(1 + i).isoformat() + GAP_TIME_SUFFIX, mmr
+
+
+def measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} retained {current / 2**20:8.1f} MiB   peak {peak / 2**20:8.1f} MiB")
+    return obj, current
+
+
+def build_dicts(entries):
+    ranks = classify_many(mmr for _, mmr in entries)
+    return [{"date": d, "mmr": mmr, "rank": r, "division": div}
+            for (d, mmr), (r, div) in zip(entries, ranks)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    print(f"  {args.count:,} points")
+    entries = list(synthetic_entries(args.count, args.seed))
+    dicts, dict_bytes = measure("dicts", lambda: build_dicts(entries))
+    series, series_bytes = measure("MmrSeries", lambda: MmrSeries.from_entries(entries))
+    print(f"  column buffers {series.nbytes() / 2**20:.1f} MiB, "
+          f"{(series_bytes - series.nbytes()) / 2**20:.1f} MiB held outside the series, "
+          f"{dict_bytes / max(series_bytes, 1):.1f}x smaller than dicts")
+    measure("export", lambda: sum(1 for _ in series.iter_points()))
+
+    if series.to_points() != dicts:
+        print("  MISMATCH between dict and MmrSeries round trip")
+        return 1
+    print("  Round trip identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
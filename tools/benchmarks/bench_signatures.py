@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Signature ingestion: full vs incremental update_signatures runs against a local sheet.
+
+A fixture server (http.server on 127.0.0.1) stands in for the published
+Google Sheet and serves a synthetic CSV: Google's column layout, CRLF line
+endings, quoted names with commas/quotes/newlines, non-ASCII names, blank
+display names, every approval status and ~10% repeat submissions of an
+earlier name in another spelling (case, spacing, fullwidth). It sends an
+ETag and answers If-None-Match with 304, and can fail the next N requests
+with 503. update_signatures.main() is run against it with a temp output,
+checkpoint and fetch cache (backoff shortened to milliseconds):
+
+    full        - first run, no checkpoint: every row is filtered
+    unchanged   - same sheet again: 304, nothing parsed or written
+    same body   - same sheet without ETag: 200, same hash, nothing parsed
+    appended    - --append rows added at the end: only those are filtered
+    edited      - a status changed before the checkpoint: full rescan of
+                  the local copy (no second download)
+    flaky       - rows appended, first two requests fail: retried
+    outage      - every request fails: the cached copy is used
+
+After every step the output must equal the original DictReader
+implementation on the whole CSV (kept here as the reference), and the
+pages must add up to the same entries. The "pages" column lists the page
+files rewritten; an append should only touch the last one(s).
+
+Usage:
+    python tools/benchmarks/bench_signatures.py [--rows 10000 100000] [--append 100] [--seed 28]
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import update_signatures
+
+HEADER = ["Timestamp", "email", "public_display_name", "country", "message", "approval_status"]
+STATUSES = ["approved", "auto_approved", "pending", "rejected", "Approved ", "AUTO_APPROVED"]
+NAMES = ["Bear", "Zoë", "Łukasz", "ケン", "Ana, Maria", 'The "GC" Grinder', "Line\nBreak", " padded ", ""]
+
+
+class SheetFixture:
+    """Serves `body` (bytes, swappable between requests) as text/csv on a free local port."""
+
+    def __init__(self):
+        self.body = b""
+        self.requests = 0
+        self.etag = True  # send ETags and honour If-None-Match
+        self.fail = 0  # answer the next N requests with 503
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixture.requests += 1
+                if fixture.fail:
+                    fixture.fail -= 1
+                    self.send_error(503)
+                    return
+                etag = f'"{hashlib.sha1(fixture.body).hexdigest()[:16]}"'
+                if fixture.etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(len(fixture.body)))
+                if fixture.etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(fixture.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/pub?output=csv"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def variant(name, rng):
+    """The same signer typed differently: case, padding, doubled spaces or fullwidth letters."""
+    roll = rng.random()
+    if roll < 0.3:
+        return name.upper()
+    if roll < 0.6:
+        return f"  {name.replace(' ', '  ')} "
+    if roll < 0.8:
+        return "".join(chr(ord(c) + 0xFEE0) if "!" <= c <= "~" else c for c in name)
+    return name
+
+
+def sheet_rows(count, rng, start=0, repeat=0.1):
+    """Sheet rows; about `repeat` of them re-submit an earlier name as a variant spelling."""
+    rows = []
+    for i in range(start, start + count):
+        name = rng.choice(NAMES)
+        name = f"{name} {i}" if name and rng.random() < 0.9 else name
+        if rows and rng.random() < repeat:
+            name = variant(rng.choice(rows)[2].strip(), rng)
+        rows.append([f"2026-01-01 00:{i % 60:02d}:00", f"user{i}@example.com", name,
+                     rng.choice(["US", "DE", "JP", ""]), "Let's go!", rng.choice(STATUSES)])
+    return rows
+
+
+def to_csv(rows):
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\r\n")
+    writer.writerow(HEADER)
+    writer.writerows(rows)
+    return out.getvalue().rstrip("\r\n").encode("utf-8")  # the sheet has no final newline
+
+
+def reference(body):
+    """The original csv.DictReader parse over the whole body, deduplicated with plain sets."""
+    names, total, unnamed, seen, shown = [], 0, 0, set(), set()
+    for row in csv.DictReader(io.StringIO(body.decode("utf-8"))):
+        total += 1
+        status = row.get("approval_status", "").strip().lower()
+        name = row.get("public_display_name", "").strip()
+        if not name:
+            unnamed += 1
+            continue
+        key = " ".join(unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", name).casefold()).split())
+        seen.add(key)
+        if status in update_signatures.APPROVED_STATUSES and key not in shown:
+            shown.add(key)
+            names.append(name)
+    return {"total_signatures": total, "unique_signers": len(seen) + unnamed,
+            "approved_signatures": len(names), "entries": names}
+
+
+def mtimes(directory):
+    return {p.name: p.stat().st_mtime_ns for p in directory.glob("signatures-*.json")} if directory.exists() else {}
+
+
+def run(fixture, output, state, pages_dir, full=False):
+    """One update_signatures run. Returns (seconds, output rewritten?, requests made, pages rewritten)."""
+    before, mtime = fixture.requests, output.stat().st_mtime_ns if output.exists() else None
+    pages_before = mtimes(pages_dir)
+    argv = ["--url", fixture.url, "--output", str(output), "--state", str(state),
+            "--pages-dir", str(pages_dir), "--index", str(state.with_suffix(".index.json")),
+            "--cache", str(state.with_suffix(".cache.json"))] + (["--full"] if full else [])
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        update_signatures.main(argv)
+    elapsed = time.perf_counter() - start
+    pages = sorted({int(name[11:15]) for name, t in mtimes(pages_dir).items() if pages_before.get(name) != t})
+    return elapsed, output.stat().st_mtime_ns != mtime, fixture.requests - before, pages
+
+
+def read_pages(pages_dir):
+    """(summary, entries from every page) as the site would load them."""
+    summary = json.loads((pages_dir / "summary.min.json").read_text(encoding="utf-8"))
+    entries = []
+    for number in range(1, summary["pages"] + 1):
+        entries += json.loads((pages_dir / f"signatures-{number:04d}.min.json").read_text(encoding="utf-8"))
+    return summary, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--append", type=int, default=100, help="rows added between runs")
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    update_signatures.BACKOFF_BASE = 0.005
+    fixture = SheetFixture()
+    tmp = Path(tempfile.mkdtemp(prefix="bench-signatures-"))
+    print(f"  {'rows':>9}  {'step':<10} {'time':>10}  {'written':>7}  {'fetches':>7}  pages")
+    try:
+        for count in args.rows:
+            rng = random.Random(args.seed)
+            output, state = tmp / f"signatures-{count}.json", tmp / f"state-{count}.json"
+            pages_dir = tmp / f"pages-{count}"
+            rows = sheet_rows(count, rng)
+
+            def step(name, expect_written, expect_fetches, full=False, etag=True, fail=0):
+                fixture.body, fixture.etag, fixture.fail = to_csv(rows), etag, fail
+                elapsed, written, fetches, pages = run(fixture, output, state, pages_dir, full)
+                expected = reference(fixture.body)
+                summary, paged = read_pages(pages_dir)
+                ok = json.loads(output.read_text(encoding="utf-8")) == expected and paged == expected["entries"]
+                ok = ok and summary["approved_signatures"] == len(paged) and summary["total_signatures"] == expected["total_signatures"]
+                ok = ok and written == expect_written and fetches == expect_fetches
+                shown = ", ".join(map(str, pages)) if len(pages) <= 4 else f"{len(pages)} pages"
+                print(f"  {len(rows):>9,}  {name:<10} {elapsed * 1000:7.1f} ms  {str(written):>7}  {fetches:>7}  {shown or '-'}")
+                return ok
+
+            ok = step("full", True, 1)
+            ok = step("unchanged", False, 1) and ok
+            ok = step("same body", False, 1, etag=False) and ok
+            rows += sheet_rows(args.append, rng, start=len(rows))
+            ok = step("appended", True, 1) and ok
+            edit = next(i for i in range(len(rows) // 2, len(rows)) if rows[i][5] == "pending" and rows[i][2].strip())
+            rows[edit][5] = "approved"
+            ok = step("edited", True, 1) and ok
+            rows += sheet_rows(args.append, rng, start=len(rows))
+            ok = step("flaky", True, 3, fail=2) and ok
+            ok = step("outage", False, update_signatures.FETCH_ATTEMPTS, fail=10**6) and ok
+            if not ok:
+                print("  MISMATCH: output differs from the reference or was (not) written unexpectedly")
+                return 1
+    finally:
+        fixture.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Archive update benchmark: JSON (full rewrite) vs the SQLite backend (upsert).
+
+For each archive size, one TRN-sized update (90-day window: mostly
+unchanged days, a few corrected ones and some new ones) is merged through
+mmr.pipeline's load -> merge -> save, the same path update_mmr.py takes.
+
+    load    - read the whole archive into an MmrSeries
+    merge   - merge_tail of the new window
+    save    - JSON: rewrite mmr-archive.json; SQLite: executemany upsert
+
+Usage:
+    python tools/benchmarks/bench_sqlite.py [--sizes 10000 100000 1000000] [--seed 28]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mmr import sqlite_archive
+from mmr.archive import changed_points
+from mmr.pipeline import archive_key, load_archive, merge_with_archive, save_archive, write_json_archive
+from mmr.ranks import rank_indices
+from mmr.series import GAP_TIME, MmrSeries
+
+WINDOW = 90
+
+
+def synthetic_archive(count, seed):
+    """One point per day from 1970-01-01, random-walk MMR."""
+    rng = random.Random(seed)
+    mmrs, mmr = [], 900
+    for _ in range(count):
+        mmr = min(2300, max(0, mmr + rng.randint(-25, 25)))
+        mmrs.append(mmr)
+    return MmrSeries(zip(range(count), mmrs, rank_indices(mmrs), [GAP_TIME] * count))
+
+
+def trn_window(archive, seed):
+    """The last WINDOW days as TRN would return them: 5 corrected, 30 new."""
+    rng = random.Random(seed)
+    rows = [list(archive.row(i)) for i in range(len(archive) - (WINDOW - 30), len(archive))]
+    for row in rng.sample(rows, 5):
+        row[1] = max(0, row[1] + rng.choice((-7, 7)))
+    day, mmr = rows[-1][0], rows[-1][1]
+    for _ in range(30):
+        day, mmr = day + 1, max(0, mmr + rng.randint(-25, 25))
+        rows.append([day, mmr, 0, GAP_TIME])
+    ranks = rank_indices(r[1] for r in rows)
+    return MmrSeries((d, m, r, t) for (d, m, _, t), r in zip(rows, ranks))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run_update(fmt, path, new):
+    archive, load_s = timed(load_archive, fmt, path)
+    (merged, diff), merge_s = timed(merge_with_archive, archive, new)
+    _, save_s = timed(save_archive, archive, fmt, path, changed_points(diff, new))
+    return load_s, merge_s, save_s, len(merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=28)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-sqlite-"))
+    try:
+        print(f"  {'points':>9}  {'backend':<7} {'load':>9} {'merge':>9} {'save':>9} {'total':>9}")
+        for count in args.sizes:
+            archive = synthetic_archive(count, args.seed)
+            new = trn_window(archive, args.seed)
+            paths = {"json": tmp / f"archive-{count}.json", "sqlite": tmp / f"archive-{count}.sqlite"}
+            write_json_archive({"dataPoints": archive, "lastUpdated": None}, paths["json"])
+            sqlite_archive.import_archive(paths["sqlite"], archive_key(), {"dataPoints": archive})
+
+            results = {}
+            for fmt, path in paths.items():
+                load_s, merge_s, save_s, merged = run_update(fmt, path, new)
+                results[fmt] = merged
+                print(f"  {count:>9,}  {fmt:<7} {load_s * 1000:7.1f}ms {merge_s * 1000:7.1f}ms "
+                      f"{save_s * 1000:7.1f}ms {(load_s + merge_s + save_s) * 1000:7.1f}ms")
+            if results["json"] != results["sqlite"]:
+                print("  MISMATCH between backends")
+                return 1
+            for path in paths.values():
+                path.unlink()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
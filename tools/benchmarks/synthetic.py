@@ -0,0 +1,63 @@
+"""
+Seeded synthetic TRN player-history responses for the benchmarks.
+
+Every playlist gets its own random walk with a mix of the patterns real
+histories have:
+    - several samples on the same day (TRN collects more than once a day)
+    - one sample a day
+    - short gaps (2-10 days) and occasional long breaks (1-4 months)
+    - flat runs where the MMR does not move for days
+    - entries without a rating, which the parser must skip
+
+The same seed always produces the same response.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+PLAYLISTS = (28, 11, 13, 10)
+START = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def playlist_entries(count, rng, start=START):
+    """`count` TRN entries ({"collectDate", "rating"}) for one playlist."""
+    when = start
+    mmr = rng.randint(600, 1200)
+    flat = 0
+    entries = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.25:
+            when += timedelta(hours=rng.randint(1, 6))
+        elif roll < 0.85:
+            when += timedelta(days=1)
+        elif roll < 0.998:
+            when += timedelta(days=rng.randint(2, 10))
+        else:
+            when += timedelta(days=rng.randint(30, 120))
+
+        if flat:
+            flat -= 1
+        elif rng.random() < 0.05:
+            flat = rng.randint(3, 30)
+        else:
+            mmr = min(2300, max(0, mmr + rng.randint(-25, 25)))
+
+        rating = None if rng.random() < 0.001 else mmr
+        entries.append({"collectDate": when.isoformat(), "rating": rating})
+    return entries
+
+
+def trn_response(count, seed=28, playlists=PLAYLISTS, shape="keyed"):
+    """
+    A TRN response with `count` entries for the first playlist and a tenth
+    of that for each of the others. `shape` is "keyed" ({"data": {"28": [...]}})
+    or "listed" ({"data": [{"attributes": {"playlistId"}, "data": [...]}]}).
+    """
+    rng = random.Random(seed)
+    data = {}
+    for i, playlist_id in enumerate(playlists):
+        data[playlist_id] = playlist_entries(count if i == 0 else max(1, count // 10), rng)
+    if shape == "listed":
+        return {"data": [{"attributes": {"playlistId": pid}, "data": entries} for pid, entries in data.items()]}
+    return {"data": {str(pid): entries for pid, entries in data.items()}}
@@ -8,7 +8,25 @@ import os
 import re
 import sys
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsoncodec import loads
+from static_output import format_report, publish_json
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+if HAS_YAML:
+    class _BatchYamlLoader(yaml.SafeLoader):
+        """SafeLoader that leaves unquoted dates as strings for validate_item() to check per item."""
+
+    _BatchYamlLoader.yaml_implicit_resolvers = {
+        first: [(tag, regexp) for tag, regexp in resolvers if tag != "tag:yaml.org,2002:timestamp"]
+        for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+    }
 
 
 def repo_root_from_this_file() -> str:
@@ -33,9 +51,8 @@ def load_json(path: str) -> Dict[str, Any]:
 
 
 def save_json(path: str, data: Dict[str, Any]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    report = publish_json(path, data, ensure_ascii=False, trailing_newline=True)
+    print(format_report(report))
 
 
 def prompt(msg: str, default: Optional[str] = None) -> str:
@@ -168,6 +185,228 @@ def make_media_interactive() -> Optional[Any]:
     raise RuntimeError("Invalid choice. Pick 1-5.")
 
 
+# ----------------------------------------------------------------------------
+# Batch import: many items from JSONL/JSON/YAML, validated up front, one write
+# ----------------------------------------------------------------------------
+
+FEED_FIELDS = {
+    "posts": {"date", "time", "tz", "title", "body", "inlineLink", "afterLinkBody", "media", "links"},
+    "updates": {"date", "time", "tz", "title", "body", "links"},
+}
+BATCH_FORMATS = ("jsonl", "json", "yaml")
+TIME_RE = re.compile(r"^([01][0-9]|2[0-3]):[0-5][0-9]$")
+
+
+def batch_format(source: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    ext = os.path.splitext(source)[1].lower()
+    if ext in (".yaml", ".yml"):
+        return "yaml"
+    if ext == ".json":
+        return "json"
+    return "jsonl"  # .jsonl/.ndjson and stdin
+
+
+def read_batch(source: str, fmt: str) -> List[Tuple[str, Any]]:
+    """Raw items as (where, item) from a file or "-" (stdin). `where` locates errors."""
+    if source == "-":
+        text = sys.stdin.read()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            text = f.read()
+
+    if fmt == "jsonl":
+        items = []
+        for lineno, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append((f"line {lineno}", loads(line)))
+            except ValueError as e:
+                raise RuntimeError(f"Invalid JSON on line {lineno}: {e}") from e
+        return items
+
+    if fmt == "yaml":
+        if not HAS_YAML:
+            raise RuntimeError("YAML input needs PyYAML (pip install pyyaml); or use JSONL")
+        try:
+            doc = yaml.load(text, Loader=_BatchYamlLoader)
+        except (yaml.YAMLError, ValueError) as e:  # ValueError: an explicit !!timestamp that is no date
+            raise RuntimeError(f"Invalid YAML: {e}") from e
+    else:
+        try:
+            doc = loads(text)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid JSON: {e}") from e
+
+    # A list of items, or a feed-shaped {"items": [...]} document
+    if isinstance(doc, dict) and isinstance(doc.get("items"), list):
+        doc = doc["items"]
+    if doc is None:
+        doc = []
+    if not isinstance(doc, list):
+        raise RuntimeError("Expected a list of items (or {\"items\": [...]})")
+    return [(f"item {i}", item) for i, item in enumerate(doc, 1)]
+
+
+def _text(item: Dict[str, Any], key: str, required: bool = False) -> str:
+    value = item.get(key, "")
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    if required and not value.strip():
+        raise ValueError(f"{key} is required")
+    return value
+
+
+def _link(value: Any, what: str) -> Dict[str, str]:
+    if not isinstance(value, dict) or set(value) - {"label", "url"}:
+        raise ValueError(f"{what} must be {{label, url}}")
+    label = _text(value, "label", required=True)
+    try:
+        url = safe_https_url(_text(value, "url", required=True))
+    except RuntimeError as e:
+        raise ValueError(f"{what}: {e}") from e
+    return {"label": label, "url": url}
+
+
+def _media(value: Any) -> Dict[str, Any]:
+    """One media entry, checked and filled in like make_media_interactive() does."""
+    if not isinstance(value, dict):
+        raise ValueError("media entries must be objects")
+    kind = value.get("type")
+    media = dict(value)
+    try:
+        if kind == "image":
+            media["src"] = ensure_relative_asset_path(_text(value, "src", required=True))
+            media["alt"] = _text(value, "alt") or "Post image"
+        elif kind == "video":
+            media["url"] = safe_https_url(_text(value, "url", required=True))
+            vid = extract_youtube_id(media["url"])
+            if not vid and not value.get("thumb"):
+                raise ValueError(f"could not extract a YouTube video id from {media['url']}")
+            media.setdefault("platform", "youtube")
+            media["thumb"] = value.get("thumb") or youtube_thumb_from_id(vid)
+            media["label"] = _text(value, "label") or "Watch on YouTube"
+        elif kind == "embed":
+            media["url"] = safe_https_url(_text(value, "url", required=True))
+            media["title"] = _text(value, "title") or "Embedded media"
+            height = value.get("height", 352)
+            if isinstance(height, bool) or not isinstance(height, (int, str)) or not str(height).isdigit():
+                raise ValueError("embed height must be a whole number of px")
+            media["height"] = int(height)
+        elif kind == "link":
+            media.update(_link({"label": value.get("label") or "Open link", "url": value.get("url", "")}, "link media"))
+        else:
+            raise ValueError(f"unknown media type {kind!r} (image/video/embed/link)")
+    except RuntimeError as e:
+        raise ValueError(str(e)) from e
+    return media
+
+
+def validate_item(raw: Any, feed: str) -> Dict[str, Any]:
+    """A checked, normalized copy of one batch item; ValueError says what is wrong."""
+    if not isinstance(raw, dict):
+        raise ValueError("item must be an object")
+    unknown = set(raw) - FEED_FIELDS[feed]
+    if unknown:
+        raise ValueError(f"unknown field(s) for {feed}: {', '.join(sorted(unknown))}")
+
+    item: Dict[str, Any] = dict(raw)
+    day = raw.get("date")
+    if isinstance(day, date):  # an explicit YAML !!timestamp
+        day = day.isoformat()
+    try:
+        item["date"] = date.fromisoformat(day).isoformat() if isinstance(day, str) and len(day) == 10 else None
+    except ValueError:
+        item["date"] = None
+    if item["date"] is None:
+        raise ValueError(f"date must be YYYY-MM-DD (got {day!r})")
+    if "time" in raw:
+        if not isinstance(raw["time"], str) or not TIME_RE.match(raw["time"].strip()):
+            raise ValueError(f"time must be a quoted \"HH:MM\" string (got {raw['time']!r})")
+        item["time"] = raw["time"].strip()
+    if "tz" in raw:
+        item["tz"] = _text(raw, "tz").strip()
+
+    item["title"] = _text(raw, "title", required=True)
+    item["body"] = _text(raw, "body").strip()
+    if "afterLinkBody" in raw:
+        _text(raw, "afterLinkBody")
+    if "inlineLink" in raw:
+        item["inlineLink"] = _link(raw["inlineLink"], "inlineLink")
+    if "media" in raw:
+        media = raw["media"]
+        item["media"] = [_media(m) for m in media] if isinstance(media, list) else _media(media)
+    if "links" in raw:
+        if not isinstance(raw["links"], list):
+            raise ValueError("links must be a list of {label, url}")
+        item["links"] = [_link(link, "links entry") for link in raw["links"]]
+    return item
+
+
+def item_sort_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    return (str(item.get("date", "")), str(item.get("time", "")))
+
+
+def item_identity(item: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (str(item.get("date", "")), str(item.get("title", "")), str(item.get("body", "")))
+
+
+def merge_items(existing: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge new items into a newest-first feed in one pass. New items go
+    above existing ones with the same date/time (like add_item_at_top), and
+    the existing items keep their order.
+    """
+    new = sorted(new, key=item_sort_key, reverse=True)  # stable: equal keys keep input order
+    merged: List[Dict[str, Any]] = []
+    i = 0
+    for item in existing:
+        key = item_sort_key(item)
+        while i < len(new) and item_sort_key(new[i]) >= key:
+            merged.append(new[i])
+            i += 1
+        merged.append(item)
+    merged.extend(new[i:])
+    return merged
+
+
+def run_batch(feed_path: str, feed: str, source: str, fmt: Optional[str], dry_run: bool = False) -> None:
+    raws = read_batch(source, batch_format(source, fmt))
+
+    # Validate everything before touching the feed; report every problem at once
+    data = load_json(feed_path)
+    seen = {item_identity(item) for item in data["items"] if isinstance(item, dict)}
+    items: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    skipped = 0
+    for where, raw in raws:
+        try:
+            item = validate_item(raw, feed)
+        except ValueError as e:
+            errors.append(f"  {where}: {e}")
+            continue
+        if item_identity(item) in seen:
+            skipped += 1  # already in the feed (or earlier in this batch)
+            continue
+        seen.add(item_identity(item))
+        items.append(item)
+    if errors:
+        raise RuntimeError(f"{len(errors)} invalid item(s), nothing written:\n" + "\n".join(errors))
+
+    print(f"Batch: {len(raws)} item(s) read, {len(items)} new, {skipped} already in {os.path.basename(feed_path)}")
+    if not items:
+        return
+    if dry_run:
+        print("Dry run. Nothing written.")
+        return
+
+    data["items"] = merge_items(data["items"], items)
+    save_json(feed_path, data)
+    print(f"Wrote {len(items)} item(s) to: {feed_path}")
+
+
 def current_hhmm() -> str:
     now = datetime.now().astimezone()
     return now.strftime("%H:%M")
@@ -268,28 +507,56 @@ def run_updates(updates_path: str) -> None:
     print(f"Wrote update to: {updates_path}")
 
 
-def main() -> int:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Add a new item to data/posts.json or data/updates.json"
-    )
-    parser.add_argument(
-        "feed",
-        choices=["posts", "updates"],
-        help="Which feed to edit"
+        description="Add new items to data/posts.json or data/updates.json"
     )
     parser.add_argument(
         "--repo",
         default=repo_root_from_this_file(),
         help="Path to repo root (defaults to parent of tools/)"
     )
-    args = parser.parse_args()
+    # Also accepted after the subcommand (feedgen.py posts --repo ...)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--repo", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+
+    commands = parser.add_subparsers(dest="command", required=True, metavar="{posts,updates,batch}")
+    commands.add_parser("posts", parents=[common], help="Add one post interactively")
+    commands.add_parser("updates", parents=[common], help="Add one update interactively")
+    batch = commands.add_parser(
+        "batch",
+        parents=[common],
+        help="Import many items from a JSONL/JSON/YAML file or stdin, in one write"
+    )
+    batch.add_argument("feed", choices=["posts", "updates"], help="Which feed to import into")
+    batch.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="Items file: .jsonl (one object per line), .json or .yaml (a list, or "
+             "{\"items\": [...]}); \"-\" or omitted for stdin"
+    )
+    batch.add_argument(
+        "--format",
+        choices=BATCH_FORMATS,
+        help="Input format (default: from the file extension; jsonl for stdin)"
+    )
+    batch.add_argument("--dry-run", action="store_true", help="Validate and report only")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
 
     repo = os.path.abspath(args.repo)
     posts_path = os.path.join(repo, "data", "posts.json")
     updates_path = os.path.join(repo, "data", "updates.json")
 
     try:
-        if args.feed == "posts":
+        if args.command == "batch":
+            feed_path = posts_path if args.feed == "posts" else updates_path
+            run_batch(feed_path, args.feed, args.input, args.format, args.dry_run)
+        elif args.command == "posts":
             run_posts(posts_path)
         else:
             run_updates(updates_path)
@@ -0,0 +1,262 @@
+"""
+jsoncodec.py — Pluggable JSON encode/decode for the tools.
+
+Uses orjson when it is installed, else msgspec for decoding and compact
+encoding, else the stdlib json module (BACKEND says which). Output is
+byte-for-byte what the stdlib writes:
+
+    dumps_pretty(obj)   == json.dumps(obj, indent=2).encode()
+    dumps_compact(obj)  == json.dumps(obj, separators=(",", ":")).encode()
+
+except for NaN and +-Infinity, which are not JSON (the browser's
+JSON.parse rejects the stdlib's NaN literal): every backend writes them as
+null, as orjson and msgspec do. The stdlib encoder runs with
+allow_nan=False, so only an object that really holds one is copied with
+the non-finite floats replaced.
+
+The fast encoders write non-ASCII characters raw and spell some floats
+differently (orjson: 0.00001 and 1e16, stdlib: 1e-05 and 1e+16), so their
+output is only kept when it has neither kind of float and, with
+ensure_ascii=True, no non-ASCII byte. Otherwise, or if the fast encoder
+rejects the object (ints beyond 64 bits, unsupported types), the stdlib
+encoder runs instead. Decoding falls back
+the same way, so NaN/Infinity literals and huge ints still load.
+
+dumps_cache(obj) is for local cache files nobody diffs: whatever the
+fastest backend writes (compact, UTF-8), with no stdlib-identity check.
+
+JsonStream is a small pull parser over a text file for documents too big to
+load whole: callers walk objects/arrays and decode only the values they
+want, one at a time (see mmr.trn.stream_playlist_entries).
+"""
+
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+BACKEND = "orjson" if HAS_ORJSON else "msgspec" if HAS_MSGSPEC else "json"
+COMPACT_SEPARATORS = (",", ":")
+PRETTY_INDENT = 2  # the only indent orjson writes (OPT_INDENT_2)
+
+# Floats the stdlib writes in exponent form show up in fast-encoder output
+# as "<digit>e" or "0.0000". Digits are folded to "0" first so one substring
+# search finds them all; matches inside strings only cost a stdlib re-encode.
+_FOLD_DIGITS = bytes.maketrans(b"123456789", b"000000000")
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _compatible(data: bytes, ensure_ascii: bool) -> bool:
+    """Whether fast-encoder output is byte-identical to the stdlib's."""
+    if ensure_ascii and (not data.isascii() or b"\x7f" in data):
+        return False
+    return b"0.0000" not in data and b"0e" not in data.translate(_FOLD_DIGITS)
+
+
+def _finite(value: Any, default: Optional[Callable]) -> Any:
+    """Copy of `value` (and of what `default` turns its values into) with NaN/+-Infinity as None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v, default) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v, default) for v in value]
+    if default is not None and not isinstance(value, (str, int, type(None))):
+        return _finite(default(value), default)
+    return value
+
+
+def _stdlib_dumps(obj: Any, default: Optional[Callable], **kwargs) -> bytes:
+    """json.dumps(obj, **kwargs) as UTF-8 bytes, with non-finite floats written as null."""
+    try:
+        return json.dumps(obj, allow_nan=False, default=default, **kwargs).encode("utf-8")
+    except ValueError:
+        return json.dumps(_finite(obj, default), allow_nan=False, default=default, **kwargs).encode("utf-8")
+
+
+def loads(data) -> Any:
+    """Decode JSON from bytes or str."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    elif HAS_MSGSPEC:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            pass
+    return json.loads(data)
+
+
+def load_path(path) -> Any:
+    """Decode a JSON file."""
+    return loads(Path(path).read_bytes())
+
+
+def dumps_pretty(obj: Any, ensure_ascii: bool = True, default: Optional[Callable] = None) -> bytes:
+    """json.dumps(obj, indent=2, ...) as UTF-8 bytes."""
+    if HAS_ORJSON:
+        try:
+            data = orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+        else:
+            if _compatible(data, ensure_ascii):
+                return data
+    return _stdlib_dumps(obj, default, indent=PRETTY_INDENT, ensure_ascii=ensure_ascii)
+
+
+def dumps_compact(obj: Any, ensure_ascii: bool = True, default: Optional[Callable] = None) -> bytes:
+    """json.dumps(obj, separators=(",", ":"), ...) as UTF-8 bytes."""
+    data = None
+    try:
+        if HAS_ORJSON:
+            data = orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+        elif HAS_MSGSPEC:
+            data = msgspec.json.encode(obj, enc_hook=default)
+    except (TypeError, ValueError, OverflowError):
+        data = None
+    if data is not None and _compatible(data, ensure_ascii):
+        return data
+    return _stdlib_dumps(obj, default, separators=COMPACT_SEPARATORS, ensure_ascii=ensure_ascii)
+
+
+def dumps_cache(obj: Any) -> bytes:
+    """Compact UTF-8 JSON from the fastest backend; not necessarily stdlib-identical."""
+    try:
+        if HAS_ORJSON:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        if HAS_MSGSPEC:
+            return msgspec.json.encode(obj)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return json.dumps(obj, separators=COMPACT_SEPARATORS, ensure_ascii=False).encode("utf-8")
+
+
+class JsonStream:
+    """
+    Pull parser over a text stream. Walk containers with members() and
+    items(); at each yielded position the caller must consume exactly one
+    value with value() (decoded whole), skip(), or by walking it.
+    Only one top-level child is ever held in memory at a time.
+    """
+
+    CHUNK = 1 << 16
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+    _DELIMITER = re.compile(r"[,\]} \t\n\r]")
+
+    def __init__(self, fp, chunk: int = CHUNK):
+        self.fp = fp
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, grow: bool = False) -> bool:
+        """
+        Read another chunk into the buffer. False at end of input.
+        `grow` reads at least as much as is buffered, so retrying a large
+        value stays linear.
+        """
+        if self.eof:
+            return False
+        size = max(self.chunk, len(self.buf) - self.pos) if grow else self.chunk
+        more = self.fp.read(size)
+        if not more:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + more
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character ("" at end of input)."""
+        while True:
+            self.pos = self._WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"Expected {' or '.join(repr(ch) for ch in chars)} near offset {self.pos}, got {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        if self.peek() not in "{[\"":
+            # A number or literal is only complete once a delimiter follows it
+            while not self._DELIMITER.search(self.buf, self.pos) and self._fill():
+                pass
+        while True:
+            try:
+                obj, self.pos = self._decoder.raw_decode(self.buf, self.pos)
+                return obj
+            except json.JSONDecodeError:
+                if not self._fill(grow=True):
+                    raise
+
+    def values(self) -> Iterator[Any]:
+        """Walk an array, decoding its elements one at a time."""
+        for _ in self.items():
+            yield self.value()
+
+    def skip(self) -> None:
+        """Consume the next value, decoding at most one child of it at a time."""
+        c = self.peek()
+        if c == "[":
+            for _ in self.values():
+                pass
+        elif c == "{":
+            for _ in self.members():
+                self.value()
+        else:
+            self.value()
+
+    def items(self) -> Iterator[int]:
+        """Walk an array: yields each element's index, positioned at it."""
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        i = 0
+        while True:
+            yield i
+            i += 1
+            if self._expect(",]") == "]":
+                return
+
+    def members(self) -> Iterator[str]:
+        """Walk an object: yields each key, positioned at its value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError(f"Expected an object key near offset {self.pos}")
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
@@ -0,0 +1,25 @@
+"""
+Shared MMR pipeline code for the MaGnetBear tools.
+
+Run it with `python -m mmr` (tools/ on PYTHONPATH) or tools/update_mmr.py.
+
+Modules:
+    archive        - Incremental merge of new points into the archive
+    batch          - Roster-driven concurrent fetch/process runner
+    cli            - Command line entry point (fetch, manual fallback, watch mode, maintenance flags)
+    fetch          - Pooled TRN session with a conditional-request cache
+    index          - On-disk date/rank-run index over the JSON archive, with a query CLI
+    jsonl_archive  - Append-only JSON Lines archive backend with compaction
+    lod            - Chart level-of-detail tiers (monthly/weekly OHLC, LTTB, per-year daily)
+    npengine       - Optional NumPy engine for the display transforms and rank classifier
+    pipeline       - Per-playlist archive merge, display build and publish
+    profiling      - Opt-in --profile stage timers, tracemalloc peaks and the run log
+    ranks          - Rumble rank thresholds and the rank/division classifier
+    series         - Columnar MmrSeries container (epoch days, int16 MMR, rank index)
+    shards         - Per-month archive shards with a manifest index
+    sqlite_archive - SQLite archive backend (WAL, executemany upserts, keyed by player/playlist/date)
+    stats          - Incremental rolling stats (averages, volatility, streaks, GC1 projection)
+    transforms     - Streaming display stages over series rows
+    trn            - TRN response parsing (both response shapes)
+    watch          - inotify/stat-polling watcher for saved TRN responses (--watch, manual mode)
+"""
@@ -0,0 +1,7 @@
+"""python -m mmr (with tools/ on PYTHONPATH) - see mmr.cli."""
+
+import sys
+
+from mmr.cli import main
+
+sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Archive merging for MMR data points.
+
+The archive holds one point per day, sorted by date. TRN only returns a
+recent window, so a merge only needs to touch the archive from the first
+day in that window onwards: the overlap is found by binary search and the
+merged tail is spliced back in place.
+"""
+
+from bisect import bisect_left
+
+from mmr.series import format_day, parse_day, row_sort_key, row_to_point
+
+
+def day_key(point):
+    """Epoch day of a point's date (the dedupe key: one point per day)."""
+    return parse_day(point["date"])
+
+
+def merge_tail(archive, new):
+    """
+    Merge a new MmrSeries into a date-sorted, one-per-day archive series IN PLACE.
+    - Latest value wins for the same date (new rows overwrite)
+    - Only archive rows on/after the first new day are touched
+
+    Returns a diff of the new days (YYYY-MM-DD strings):
+        {"added": [day, ...], "updated": [day, ...], "unchanged": [day, ...]}
+    """
+    diff = {"added": [], "updated": [], "unchanged": []}
+    if not new:
+        return diff
+
+    start = bisect_left(archive.days, min(new.days))
+
+    tail = {row[0]: row for row in archive.rows(start)}
+    incoming = {row[0]: row for row in new.rows()}
+
+    for day in sorted(incoming):
+        row = incoming[day]
+        old = tail.get(day)
+        if old is None:
+            diff["added"].append(format_day(day))
+        elif old == row:
+            diff["unchanged"].append(format_day(day))
+            continue
+        else:
+            diff["updated"].append(format_day(day))
+        tail[day] = row
+
+    if diff["added"] or diff["updated"]:
+        archive.truncate(start)
+        archive.extend(sorted(tail.values(), key=row_sort_key))
+    return diff
+
+
+def diff_changed(diff):
+    """True if a merge diff added or updated any day."""
+    return bool(diff["added"] or diff["updated"])
+
+
+def changed_points(diff, new):
+    """Point dicts for the winning new row of every added/updated day."""
+    changed = {parse_day(day) for day in diff["added"] + diff["updated"]}
+    latest = {}
+    for row in new.rows():
+        if row[0] in changed:
+            latest[row[0]] = row
+    return [row_to_point(row) for row in sorted(latest.values(), key=row_sort_key)]
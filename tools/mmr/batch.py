@@ -0,0 +1,92 @@
+"""
+Roster-driven batch updates.
+
+A roster file lists the profiles to track:
+
+    {
+      "workers": 4,
+      "players": [
+        {"platform": "epic", "username": "MaGnetBear", "id": 41100349},
+        {"platform": "epic", "username": "Someone", "id": 123, "playlists": [11, 13]}
+      ]
+    }
+
+"playlists" is optional (default: every playlist in the response) and so
+is "outputDir" (default: data/players/<platform>-<username>).
+
+Fetches run on a bounded thread pool; processing runs on the calling thread
+as each fetch completes, so file writes never race. A failure in one
+profile is recorded and does not stop the others.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_WORKERS = 4
+
+
+def load_roster(path):
+    """Load and validate a roster file."""
+    with open(path, "r", encoding="utf-8") as f:
+        roster = json.load(f)
+    players = roster.get("players")
+    if not isinstance(players, list) or not players:
+        raise ValueError(f"{path}: expected a non-empty \"players\" list")
+    for i, player in enumerate(players):
+        missing = [k for k in ("platform", "username", "id") if k not in player]
+        if missing:
+            raise ValueError(f"{path}: players[{i}] is missing {', '.join(missing)}")
+    return roster
+
+
+def profile_label(player):
+    return f"{player['platform']}/{player['username']}"
+
+
+def profile_dir_name(player):
+    return f"{player['platform']}-{player['username']}"
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run_batch(players, fetch, process, workers=DEFAULT_WORKERS):
+    """
+    Fetch every player concurrently (at most `workers` at a time) and
+    process each response as it arrives.
+    - fetch(player) -> data, runs on a pool thread; raise to fail the profile
+    - process(player, data) -> summary, runs on the calling thread
+
+    Returns one result per player, in roster order:
+        {"profile", "ok", "error", "fetchSeconds", "processSeconds", "summary"}
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_timed, fetch, player): i for i, player in enumerate(players)}
+        for future in as_completed(futures):
+            i = futures[future]
+            player = players[i]
+            result = {
+                "profile": profile_label(player),
+                "ok": False,
+                "error": None,
+                "fetchSeconds": None,
+                "processSeconds": None,
+                "summary": None,
+            }
+            results[i] = result
+            try:
+                data, result["fetchSeconds"] = future.result()
+            except Exception as e:
+                result["error"] = f"fetch: {e}"
+                continue
+            try:
+                result["summary"], result["processSeconds"] = _timed(process, player, data)
+                result["ok"] = True
+            except Exception as e:
+                result["error"] = f"process: {e}"
+    return [results[i] for i in range(len(players))]
@@ -0,0 +1,608 @@
+"""
+Command line entry point: fetch TRN MMR history and update data/.
+
+    python -m mmr                        (with tools/ on PYTHONPATH)
+    python tools/update_mmr.py           (same thing)
+
+Everything heavier than argparse is imported inside the function that needs
+it, so maintenance commands and no-change runs stay cheap and cloudscraper
+is only loaded when a fetch actually happens.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Paths
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = TOOLS_DIR.parent
+DATA_DIR = PROJECT_ROOT / "data"
+COOKIES_FILE = TOOLS_DIR / "cookies.txt"
+FETCH_CACHE_FILE = TOOLS_DIR / ".trn-cache.json"  # ETag/Last-Modified/hash of last responses
+RUN_LOG_FILE = TOOLS_DIR / ".mmr-runs.jsonl"  # --profile run reports, one JSON line per run
+
+# File names inside the data dir
+RAW_NAME = "trn-raw.json"
+OUTPUT_NAME = "mmr-data.json"
+LOD_NAME = "mmr-lod"  # Chart level-of-detail tiers + index.json
+STATS_NAME = "mmr-stats.json"  # Rolling stats (+ mmr-stats-state.json checkpoint)
+ARCHIVE_FORMATS = ("json", "jsonl", "shards", "sqlite")
+_ARCHIVE_SUFFIXES = {"json": ".json", "jsonl": ".jsonl", "shards": "-shards", "sqlite": ".sqlite"}
+
+# URLs
+TRACKER_URL = "https://rocketleague.tracker.network/rocket-league/profile/epic/MaGnetBear/mmr?playlist=28"
+API_URL = "https://api.tracker.gg/api/v1/rocket-league/player-history/mmr/41100349"
+
+MANUAL_TIMEOUT = 300
+STREAM_INPUT_BYTES = 32 << 20  # --input files this big are streamed instead of loaded whole
+
+
+def archive_name(archive_format, playlist_id=None):
+    """
+    Archive file/dir name: mmr-archive.json (.jsonl, -shards/, .sqlite) for the main
+    playlist, mmr-archive-<id>.json etc. for one playlist in batch mode.
+    """
+    stem = "mmr-archive" if playlist_id is None else f"mmr-archive-{playlist_id}"
+    return stem + _ARCHIVE_SUFFIXES[archive_format]
+
+
+def send_notification(title, message, is_error=False):
+    """Send Windows toast notification (winotify is installed on first error)."""
+    try:
+        from winotify import Notification, audio
+    except ImportError:
+        if not is_error:
+            return
+        try:
+            import subprocess
+            subprocess.run([sys.executable, "-m", "pip", "install", "winotify"], check=True)
+            from winotify import Notification, audio
+        except Exception:
+            return
+
+    try:
+        toast = Notification(
+            app_id="MaGnetBear MMR Updater",
+            title=title,
+            msg=message,
+            duration="long" if is_error else "short"
+        )
+        if is_error:
+            toast.set_audio(audio.Default, loop=False)
+        toast.show()
+    except Exception as e:
+        print(f"  (Notification failed: {e})")
+
+
+def find_chrome():
+    for p in [r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+              r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+              os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe")]:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+_fetcher = None
+
+
+def get_fetcher(force=False):
+    """The process-wide TrnFetcher (one pooled session, shared by every fetch)."""
+    global _fetcher
+    if _fetcher is None:
+        from mmr.fetch import TrnFetcher
+        _fetcher = TrnFetcher(COOKIES_FILE, FETCH_CACHE_FILE, use_cache=not force)
+    return _fetcher
+
+
+def fetch_with_cookies(force=False):
+    """
+    Try to fetch API data using cookies.txt + cloudscraper for Cloudflare bypass.
+    Returns a FetchResult; .unchanged means TRN has nothing new since the last
+    processed response.
+    """
+    from mmr.fetch import FetchResult
+
+    if not COOKIES_FILE.exists():
+        return FetchResult(error="No cookies.txt found")
+
+    try:
+        print(f"  Fetching from API...")
+        result = get_fetcher(force).fetch(API_URL)
+        print(f"  Response: {result.status}")
+        return result
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return FetchResult(error=str(e))
+
+
+def input_path(source):
+    """Path of a saved TRN response, or None (with capture instructions) if it is missing."""
+    path = Path(source)
+    if not path.exists():
+        print(f"  Input file not found: {path}")
+        print(f"""
+  To capture a response by hand:
+    1. Open {TRACKER_URL}
+    2. DevTools (F12) -> Network tab -> F5 refresh
+    3. Find request to: api.tracker.gg/api/v1/rocket-league/player-history/mmr/...
+    4. Right-click -> Copy -> Copy Response
+    5. Save to: {path}
+""")
+        return None
+    return path
+
+
+def read_input(source):
+    """Load a saved TRN response from a file, or stdin for "-". None on failure."""
+    from jsoncodec import load_path, loads
+
+    if source == "-":
+        print("  Reading from stdin...")
+        try:
+            return loads(sys.stdin.buffer.read())
+        except ValueError as e:
+            print(f"  Error reading stdin: {e}")
+            return None
+
+    path = input_path(source)
+    if path is None:
+        return None
+    print(f"  Reading from: {path}")
+    try:
+        return load_path(path)
+    except Exception as e:
+        print(f"  Error reading file: {e}")
+        return None
+
+
+def capture_manually(raw_file):
+    """Open the tracker page and wait for the user to save the response. None on timeout."""
+    import subprocess
+
+    from mmr.watch import open_watcher
+
+    # Watch before the browser opens so a quick save is not missed
+    with open_watcher(raw_file, skip_unchanged=False) as watcher:
+        chrome = find_chrome()
+        if chrome:
+            subprocess.Popen([chrome, TRACKER_URL])
+        else:
+            import webbrowser
+            webbrowser.open(TRACKER_URL)
+
+        print(f"""
+  Browser opened! Now:
+
+  1. F12 -> Network tab -> F5 refresh
+  2. Filter: player-history
+  3. Click request -> Response tab
+  4. Ctrl+A -> Ctrl+C -> Save to: {raw_file}
+
+  Waiting for file...""")
+
+        data = watcher.next_drop(timeout=MANUAL_TIMEOUT)
+
+    if data is None:
+        print("\n  Timeout. Run again when ready.")
+        return None
+    print("\n  File detected!")
+    return data
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch TRN MMR history and update data/")
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Process a saved TRN response (\"-\" for stdin) instead of fetching"
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=str(DATA_DIR),
+        help="Directory holding the archive and published files (default: data/)"
+    )
+    parser.add_argument(
+        "--ci",
+        action="store_true",
+        help="Non-interactive: exit 1 instead of falling back to the browser, no git hints"
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        help="Archive backend: mmr-archive.json (default for updates), append-only "
+             "mmr-archive.jsonl, per-month mmr-archive-shards/ or mmr-archive.sqlite "
+             "(default for import/export: jsonl)"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="ROSTER",
+        help="Update every player/playlist listed in a roster JSON file (see mmr.batch)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Concurrent fetches in batch mode (default: roster \"workers\" or 4)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=f"Keep running and process every complete response saved to <data-dir>/{RAW_NAME}"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the fetch cache and reprocess even if TRN reports no changes"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("auto", "python", "numpy"),
+        help="Transform engine: pure Python, NumPy (needs numpy) or auto (NumPy for long "
+             "histories when installed; default, or $MMR_ENGINE)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every stage (with tracemalloc peaks), print the report and append it "
+             "to the run log"
+    )
+    parser.add_argument(
+        "--run-log",
+        metavar="FILE",
+        default=str(RUN_LOG_FILE),
+        help="JSON-lines file --profile appends run reports to (default: tools/.mmr-runs.jsonl)"
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="FILE",
+        help="Also dump cProfile stats of the display transforms to FILE (implies --profile); "
+             "in batch mode each playlist gets its own file, named FILE-<platform>-<username>-<playlist>"
+    )
+    maintenance = parser.add_mutually_exclusive_group()
+    maintenance.add_argument(
+        "--compact-archive",
+        action="store_true",
+        help="Compact mmr-archive.jsonl to one line per date and exit"
+    )
+    maintenance.add_argument(
+        "--import-archive",
+        action="store_true",
+        help="Convert mmr-archive.json into the --archive-format backend and exit"
+    )
+    maintenance.add_argument(
+        "--export-archive",
+        action="store_true",
+        help="Write mmr-archive.json from the --archive-format backend and exit "
+             "(sqlite also regenerates mmr-data.json)"
+    )
+    return parser.parse_args(argv)
+
+
+def run_archive_maintenance(args, data_dir):
+    """Handle the archive maintenance flags. Returns True if one ran."""
+    if not (args.compact_archive or args.import_archive or args.export_archive):
+        return False
+
+    from mmr import jsonl_archive, shards, sqlite_archive
+    from mmr.pipeline import archive_key, load_archive, write_json_archive
+
+    backend = args.archive_format or "jsonl"
+    if (args.import_archive or args.export_archive) and backend == "json":
+        raise SystemExit("  --import-archive/--export-archive need --archive-format jsonl, shards or sqlite")
+    json_file = data_dir / archive_name("json")
+    target = data_dir / archive_name(backend)
+
+    if args.compact_archive:
+        jsonl_file = data_dir / archive_name("jsonl")
+        before, after = jsonl_archive.compact(jsonl_file)
+        print(f"  Compacted {jsonl_file.name}: {before} -> {after} lines")
+    elif args.import_archive and backend == "jsonl":
+        archive = jsonl_archive.import_json(json_file, target)
+        print(f"  Imported {len(archive['dataPoints'])} points into {target.name}")
+    elif args.import_archive and backend == "sqlite":
+        archive = load_archive("json", json_file)
+        changed = sqlite_archive.import_archive(target, archive_key(), archive)
+        print(f"  Imported {len(archive['dataPoints'])} points into {target.name} ({changed} new or changed)")
+    elif args.import_archive:
+        archive = load_archive("json", json_file)
+        shards.write_all(target, archive["dataPoints"], archive["lastUpdated"])
+        print(f"  Imported {len(archive['dataPoints'])} points into {target.name}/")
+    elif backend == "sqlite":
+        from mmr.pipeline import build_display_data
+        from mmr.series import json_default
+        from static_output import format_report, publish_json
+
+        archive = load_archive("sqlite", target)
+        write_json_archive(archive, json_file)
+        print(f"  Exported {len(archive['dataPoints'])} points to {json_file.name}")
+        report = publish_json(data_dir / OUTPUT_NAME, build_display_data(archive["dataPoints"]),
+                              default=json_default)
+        print(f"  {format_report(report)}")
+    elif backend == "jsonl":
+        archive = jsonl_archive.export_json(target, json_file)
+        print(f"  Exported {len(archive['dataPoints'])} points to {json_file.name}")
+    else:
+        archive = shards.load(target)
+        write_json_archive(archive, json_file)
+        print(f"  Exported {len(archive['dataPoints'])} points to {json_file.name}")
+    return True
+
+
+def run_batch_mode(args, data_dir):
+    """Update every profile/playlist in a roster file. Returns the number of failed profiles."""
+    from mmr.batch import DEFAULT_WORKERS, load_roster, profile_dir_name, profile_label, run_batch
+    from mmr.pipeline import PLAYLIST_NAMES, update_playlist
+    from mmr.profiling import stage
+    from mmr.trn import API_URL_TEMPLATE, extract_playlists
+
+    roster = load_roster(args.batch)
+    players = roster["players"]
+    workers = args.workers or roster.get("workers", DEFAULT_WORKERS)
+
+    # One shared session for every fetch
+    fetcher = get_fetcher(args.force)
+
+    def fetch(player):
+        result = fetcher.fetch(API_URL_TEMPLATE.format(player_id=player["id"]))
+        if result.error:
+            raise RuntimeError(result.error)
+        return result.data
+
+    def process(player, data):
+        if data is None:
+            return "unchanged"
+        print(f"\n  [{profile_label(player)}]")
+        if "outputDir" in player:
+            out_dir = PROJECT_ROOT / player["outputDir"]
+        else:
+            out_dir = data_dir / "players" / profile_dir_name(player)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        wanted = set(player.get("playlists") or ())
+        updated = []
+        with stage(f"{profile_label(player)} extract"):
+            by_playlist = extract_playlists(data)
+        for playlist_id, series in sorted(by_playlist.items()):
+            if wanted and playlist_id not in wanted:
+                continue
+            print(f"  Playlist {playlist_id}: {len(series)} points from TRN")
+            profile = {
+                "platform": player["platform"],
+                "platformUsername": player["username"],
+                "playlist": PLAYLIST_NAMES.get(playlist_id, f"Playlist {playlist_id}"),
+                "playlistId": playlist_id,
+            }
+            with stage(f"{profile_label(player)} playlist {playlist_id}"):
+                update_playlist(
+                    series,
+                    args.archive_format,
+                    archive_path=out_dir / archive_name(args.archive_format, playlist_id),
+                    output_path=out_dir / f"mmr-data-{playlist_id}.json",
+                    lod_dir=out_dir / f"mmr-lod-{playlist_id}",
+                    profile=profile,
+                    stats_path=out_dir / f"mmr-stats-{playlist_id}.json",
+                )
+            updated.append(playlist_id)
+        if not updated:
+            raise ValueError("No playlist data found")
+        fetcher.commit(API_URL_TEMPLATE.format(player_id=player["id"]))
+        return f"playlists {updated}"
+
+    print(f"\n  Batch: {len(players)} profiles, {workers} workers")
+    results = run_batch(players, fetch, process, workers)
+
+    print("\n  Batch summary:")
+    for r in results:
+        fetch_s = f"{r['fetchSeconds']:.2f}s" if r["fetchSeconds"] is not None else "-"
+        process_s = f"{r['processSeconds']:.2f}s" if r["processSeconds"] is not None else "-"
+        status = r["summary"] if r["ok"] else f"FAILED ({r['error']})"
+        print(f"    {r['profile']:<32} fetch {fetch_s:>7}  process {process_s:>7}  {status}")
+    return sum(1 for r in results if not r["ok"])
+
+
+def process_response(args, data_dir, data, fetched=False):
+    """
+    Extract playlist 28 from a TRN response (parsed, or a Path to stream)
+    and update data_dir. `fetched` commits the fetch cache afterwards.
+    Returns False if processing failed (the traceback is printed).
+    """
+    from mmr.profiling import stage
+
+    print("  Processing...")
+
+    try:
+        from mmr.pipeline import GC1_THRESHOLD, PLAYLIST_ID, update_playlist
+        from mmr.trn import extract_playlist, extract_playlist_file
+
+        data_dir.mkdir(parents=True, exist_ok=True)
+
+        # Extract raw points from API response
+        with stage("extract"):
+            if isinstance(data, Path):
+                _, new_points = extract_playlist_file(data, PLAYLIST_ID)
+            else:
+                _, new_points = extract_playlist(data, PLAYLIST_ID)
+        print(f"  Got {len(new_points)} points from TRN")
+
+        merged_points, output = update_playlist(
+            new_points,
+            args.archive_format,
+            archive_path=data_dir / archive_name(args.archive_format),
+            output_path=data_dir / OUTPUT_NAME,
+            lod_dir=data_dir / LOD_NAME,
+            stats_path=data_dir / STATS_NAME,
+        )
+        # Only now remember this response, so a failed run is retried in full
+        if fetched:
+            get_fetcher().commit(API_URL)
+
+        current = output["currentRating"]
+        print(f"\n  {current['rank']} {current['division']}")
+        print(f"  MMR: {current['mmr']} ({current['mmr'] - GC1_THRESHOLD:+d} from GC1)")
+        print(f"  Archive: {len(merged_points)} raw points")
+        print(f"  Display: {len(output['dataPoints'])} points (with gap fill)")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n  Error: {e}")
+        return False
+    return True
+
+
+def run_watch_mode(args, data_dir):
+    """Process every new response saved to data_dir/RAW_NAME until Ctrl+C. Returns the exit code."""
+    import time
+
+    from mmr.watch import open_watcher
+
+    raw_file = data_dir / RAW_NAME
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with open_watcher(raw_file) as watcher:
+        print(f"\n  Watching {raw_file} ({watcher.kind}) - Ctrl+C to stop")
+        try:
+            while True:
+                data = watcher.next_drop()
+                saved = raw_file.stat().st_mtime
+                print(f"\n  New response saved ({time.strftime('%H:%M:%S')})")
+                if process_response(args, data_dir, data):
+                    print(f"  Updated {(time.time() - saved) * 1000:.0f} ms after the save")
+                print(f"\n  Watching {raw_file.name}...")
+        except KeyboardInterrupt:
+            print("\n  Stopped watching.")
+    print("=" * 55)
+    return 0
+
+
+def print_git_hints(data_dir, archive_format):
+    """Show whether data/ changed and how to commit it (never commits)."""
+    import subprocess
+    from datetime import datetime
+
+    print("\n  Checking for changes...")
+    diff = subprocess.run(["git", "diff", "--quiet", "--", str(data_dir)],
+                          cwd=PROJECT_ROOT, capture_output=True)
+    if diff.returncode == 0:
+        print("  No changes to commit.")
+    elif diff.returncode == 1:
+        print("  Changes detected in data/")
+        print("  Run these commands to commit:")
+        print(f'    git add data/{OUTPUT_NAME} data/mmr-data.min.json* data/{LOD_NAME}/ '
+              f'data/mmr-stats*.json* data/{archive_name(archive_format)}')
+        print(f'    git commit -m "Update MMR [{datetime.now():%Y-%m-%d %H:%M}]"')
+        print(f'    git push')
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not (args.profile or args.cprofile):
+        return run(args)
+
+    from mmr import profiling
+
+    profiling.enable(args.cprofile)
+    code = 1
+    try:
+        code = run(args)
+        return code
+    finally:
+        run_report = profiling.report(" ".join(sys.argv[1:] if argv is None else argv), ok=code == 0)
+        print("\n  Profile:")
+        print(profiling.format_report(run_report))
+        profiling.append_run_log(args.run_log, run_report)
+        print(f"  Run report appended to {args.run_log}")
+
+
+def run(args):
+    """One updater run for parsed arguments. Returns the exit code."""
+    from mmr.profiling import stage
+
+    data_dir = Path(args.data_dir)
+
+    print()
+    print("=" * 55)
+    print("  MaGnetBear MMR Updater")
+    print("=" * 55)
+
+    if args.engine:
+        from mmr.transforms import set_engine
+        try:
+            set_engine(args.engine)
+        except RuntimeError as e:
+            print(f"  {e}")
+            return 1
+
+    if run_archive_maintenance(args, data_dir):
+        print("=" * 55)
+        return 0
+    args.archive_format = args.archive_format or "json"
+
+    if args.batch:
+        failed = run_batch_mode(args, data_dir)
+        print("=" * 55)
+        return 1 if failed else 0
+
+    if args.watch:
+        return run_watch_mode(args, data_dir)
+
+    if args.input:
+        path = input_path(args.input) if args.input != "-" else None
+        if args.input != "-" and path is None:
+            return 1
+        if path is not None and path.stat().st_size >= STREAM_INPUT_BYTES:
+            # Streamed during extract: only the selected playlist is decoded
+            data = path
+            print(f"  Streaming from: {path}")
+        else:
+            with stage("read_input"):
+                data = read_input(args.input)
+            if data is None:
+                return 1
+    else:
+        print("\n  Trying auto-fetch with cookies...")
+        with stage("fetch"):
+            result = fetch_with_cookies(args.force)
+        data, error = result.data, result.error
+
+        if result.unchanged:
+            print("  No new data since the last run - nothing to do.")
+            print("=" * 55)
+            return 0
+
+        if data:
+            print("  Success! Got data from API.")
+        else:
+            print(f"  Auto-fetch failed: {error}")
+
+            # Send notification if cookies expired
+            if "403" in str(error) or "expired" in str(error).lower():
+                send_notification(
+                    "MMR Updater: Cookies Expired!",
+                    "Re-export cookies from tracker.gg to continue auto-updates.",
+                    is_error=True
+                )
+
+            if not COOKIES_FILE.exists():
+                print("""
+  To enable auto-fetch:
+    1. Install "Get cookies.txt LOCALLY" browser extension
+    2. Visit tracker.gg and export cookies
+    3. Save as: tools/cookies.txt
+""")
+            if args.ci:
+                return 1
+
+            print("  Falling back to manual mode...")
+            data = capture_manually(data_dir / RAW_NAME)
+            if data is None:
+                return 1
+
+    if not process_response(args, data_dir, data, fetched=not args.input):
+        return 1
+
+    if not args.ci:
+        print_git_hints(data_dir, args.archive_format)
+
+    print("\n  Done!")
+    print("=" * 55)
+    return 0
@@ -0,0 +1,143 @@
+"""
+TRN fetch layer.
+
+TrnFetcher keeps ONE keep-alive cloudscraper session per process (cookies.txt
+is parsed once, on first use) and a small on-disk cache of the last
+response for every URL: ETag, Last-Modified and a SHA-256 of the body.
+
+Requests are sent conditionally. A 304, or a 200 whose body hashes the same
+as last time, is reported as unchanged so callers can stop before touching
+any archive or output file. Validators for a URL are only persisted once the
+caller has successfully processed the response (commit()), so a failed run
+is retried in full next time.
+"""
+
+import hashlib
+import http.cookiejar
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from jsoncodec import loads
+from mmr.profiling import stage
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Origin": "https://rocketleague.tracker.network",
+    "Referer": "https://rocketleague.tracker.network/",
+}
+
+
+def _import_cloudscraper():
+    try:
+        import cloudscraper
+    except ImportError:
+        subprocess.run([sys.executable, "-m", "pip", "install", "cloudscraper"], check=True)
+        import cloudscraper
+    return cloudscraper
+
+
+class FetchResult:
+    """Outcome of one fetch: data (parsed JSON), error, or unchanged."""
+
+    __slots__ = ("data", "error", "unchanged", "status")
+
+    def __init__(self, data=None, error=None, unchanged=False, status=None):
+        self.data = data
+        self.error = error
+        self.unchanged = unchanged
+        self.status = status
+
+
+class TrnFetcher:
+    """Pooled session + conditional-request cache for TRN history URLs."""
+
+    def __init__(self, cookies_file, cache_file=None, headers=None, timeout=30, use_cache=True):
+        self.cookies_file = str(cookies_file)
+        self.cache_file = str(cache_file) if cache_file else None
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self._session = None
+        self._lock = threading.Lock()
+        self._cache = self._load_cache()
+        self._pending = {}
+
+    def _load_cache(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  Warning: Ignoring fetch cache: {e}")
+            return {}
+
+    @property
+    def session(self):
+        """The shared cloudscraper session, created with cookies on first use."""
+        with self._lock:
+            if self._session is None:
+                # Load cookies from Netscape format file
+                jar = http.cookiejar.MozillaCookieJar(self.cookies_file)
+                jar.load(ignore_discard=True, ignore_expires=True)
+                print(f"  Loaded {len(list(jar))} cookies")
+
+                scraper = _import_cloudscraper().create_scraper()
+                scraper.cookies = jar
+                self._session = scraper
+            return self._session
+
+    def fetch(self, url):
+        """GET a TRN history URL, conditionally if it has been fetched before."""
+        entry = self._cache.get(url, {}) if self.use_cache else {}
+        headers = dict(self.headers)
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        status = response.status_code
+
+        if status == 304:
+            return FetchResult(unchanged=True, status=status)
+        if status == 403:
+            return FetchResult(error="Cookies expired - re-export from browser (403)", status=status)
+        if status != 200:
+            return FetchResult(error=f"HTTP {status}", status=status)
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        if entry.get("sha256") == digest:
+            return FetchResult(unchanged=True, status=status)
+
+        with stage("parse"):
+            data = loads(body)
+        if "data" not in data:
+            return FetchResult(error="Invalid response format", status=status)
+
+        with self._lock:
+            self._pending[url] = {
+                "etag": response.headers.get("ETag"),
+                "lastModified": response.headers.get("Last-Modified"),
+                "sha256": digest,
+            }
+        return FetchResult(data=data, status=status)
+
+    def commit(self, url):
+        """Persist the validators of a successfully processed response."""
+        if not self.cache_file:
+            return
+        with self._lock:
+            entry = self._pending.pop(url, None)
+            if entry is None:
+                return
+            self._cache[url] = entry
+            tmp = f"{self.cache_file}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, indent=2)
+            os.replace(tmp, self.cache_file)
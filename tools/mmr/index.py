@@ -0,0 +1,343 @@
+"""
+On-disk query index over the JSON archive (mmr-archive.json).
+
+mmr-archive-index.json sits next to the archive and holds:
+
+    days     - epoch day of every archived point (date -> position, by bisect)
+    offsets  - byte offset of every point's "{" in the archive file, plus
+               "end" (just past the last point), so a date range is read
+               with one seek and parsed on its own
+    size, mtime - st_size and st_mtime_ns of the archive the offsets
+               describe; if either differs the index is rebuilt
+    runs     - [rank index, first position, last position] for every run of
+               consecutive points in the same rank + division
+    records  - [rank index, position] each time a new highest rank was
+               reached (increasing), for first-time-reached lookups
+
+Lookups are bisects over those lists; only the points actually asked for
+are read from the archive. update_mmr.py keeps the index current: after a
+merge only the rewritten tail of the archive is rescanned and the runs and
+records from the first changed point onwards are rebuilt.
+
+The index is derived and gitignored: if an incremental update does not
+line up with the archive, it is rebuilt from scratch, and if even that
+fails it is dropped (queries rebuild it) rather than failing the run.
+
+Query from the command line (tools/ on PYTHONPATH):
+
+    python -m mmr.index range 2025-03-01 2025-03-31
+    python -m mmr.index residency "Champion II" [--division 3]
+    python -m mmr.index first "Grand Champion I"
+    python -m mmr.index at 2025-06-01
+
+tools/benchmarks/bench_index.py checks every query against a plain scan.
+"""
+
+import json
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from jsoncodec import COMPACT_SEPARATORS, PRETTY_INDENT, loads
+from mmr.ranks import RANK_LABEL_INDEX, RANK_LABELS
+from mmr.series import MmrSeries, format_day, parse_day
+from static_output import write_if_changed
+
+INDEX_VERSION = 2
+# dumps_pretty() puts every point of {"dataPoints": [...]} on its own line, two indents deep
+_INDENT = b" " * PRETTY_INDENT
+POINT_START = b"\n" + _INDENT * 2 + b"{"
+POINT_FIRST_KEY = b"{\n" + _INDENT * 3 + b'"date": "'
+ARRAY_END = b"\n" + _INDENT + b"]"
+
+
+def index_path_for(archive_path):
+    """data/mmr-archive.json -> data/mmr-archive-index.json"""
+    archive_path = Path(archive_path)
+    return archive_path.with_name(archive_path.stem + "-index.json")
+
+
+def _scan_offsets(body, base):
+    """Offsets of every point start in `body` (read from byte `base`), and the array end."""
+    offsets = []
+    end = body.find(ARRAY_END)
+    if end == -1:
+        raise ValueError(f"no dataPoints array indented by {PRETTY_INDENT} spaces in the archive")
+    pos = body.find(POINT_START)
+    while pos != -1 and pos < end:
+        offsets.append(base + pos + len(POINT_START) - 1)
+        pos = body.find(POINT_START, pos + 1)
+    return offsets, base + end
+
+
+class ArchiveIndex:
+    """Date, rank-run and first-reached lookups over one JSON archive."""
+
+    def __init__(self, archive_path, days=(), offsets=(), end=0, size=0, mtime=0, runs=(), records=()):
+        self.archive_path = Path(archive_path)
+        self.days = list(days)
+        self.offsets = list(offsets)
+        self.end = end
+        self.size = size
+        self.mtime = mtime
+        self.runs = [list(r) for r in runs]
+        self.records = [list(r) for r in records]
+        self._lookups = None
+
+    @classmethod
+    def load(cls, archive_path):
+        """The saved index for `archive_path`, or None if missing/unreadable."""
+        try:
+            with open(index_path_for(archive_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"  Warning: Ignoring archive index: {e}")
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return cls(archive_path, data["days"], data["offsets"], data["end"], data["size"],
+                   data["mtime"], data["runs"], data["records"])
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "archive": self.archive_path.name,
+            "size": self.size,
+            "mtime": self.mtime,
+            "end": self.end,
+            "days": self.days,
+            "offsets": self.offsets,
+            "runs": self.runs,
+            "records": self.records,
+        }
+        write_if_changed(index_path_for(self.archive_path),
+                         json.dumps(data, separators=COMPACT_SEPARATORS).encode("utf-8"))
+
+    def is_current(self):
+        """
+        True if the archive file is still the one this index was built from.
+        Same-size edits (same-width MMRs) are caught by the modification time.
+        """
+        try:
+            stat = self.archive_path.stat()
+        except FileNotFoundError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime
+
+    def _truncate(self, start):
+        """Forget everything from position `start` onwards."""
+        del self.days[start:]
+        del self.offsets[start:]
+        while self.runs and self.runs[-1][1] >= start:
+            self.runs.pop()
+        if self.runs and self.runs[-1][2] >= start:
+            self.runs[-1][2] = start - 1
+        while self.records and self.records[-1][1] >= start:
+            self.records.pop()
+        self._lookups = None
+
+    def _extend(self, series, start):
+        runs, records = self.runs, self.records
+        best = records[-1][0] if records else -1
+        for pos in range(start, len(series)):
+            rank = series.ranks[pos]
+            if runs and runs[-1][0] == rank and runs[-1][2] == pos - 1:
+                runs[-1][2] = pos
+            else:
+                runs.append([rank, pos, pos])
+            if rank > best:
+                records.append([rank, pos])
+                best = rank
+        self.days.extend(series.days[start:])
+
+    def _prefix_intact(self, f, start, series):
+        """Spot-check that positions before `start` still describe the archive."""
+        if start == 0:
+            return True
+        if start > len(self.days) or self.days[start - 1] != series.days[start - 1]:
+            return False
+        f.seek(self.offsets[start - 1])
+        head = f.read(64)
+        return head.startswith(POINT_FIRST_KEY + format_day(series.days[start - 1]).encode())
+
+    def update(self, series, changed_from=0):
+        """
+        Bring the index in line with the freshly written archive, whose
+        points before position `changed_from` are unchanged.
+        Returns the number of points (re)indexed.
+        """
+        with open(self.archive_path, "rb") as f:
+            start = min(changed_from, len(self.days), len(series))
+            if not self._prefix_intact(f, start, series):
+                start = 0
+            base = self.offsets[start - 1] + 1 if start else 0
+            f.seek(base)
+            offsets, end = _scan_offsets(f.read(), base)
+        if len(offsets) != len(series) - start:
+            raise ValueError(f"{self.archive_path.name}: found {len(offsets)} points after "
+                             f"position {start}, expected {len(series) - start}")
+        self._truncate(start)
+        self.offsets.extend(offsets)
+        self.end = end
+        stat = self.archive_path.stat()
+        self.size, self.mtime = stat.st_size, stat.st_mtime_ns
+        self._extend(series, start)
+        return len(series) - start
+
+    def _lookup(self):
+        """(rank name -> runs, run start positions, record ranks), built once per load."""
+        if self._lookups is None:
+            by_rank = {}
+            for run in self.runs:
+                by_rank.setdefault(RANK_LABELS[run[0]][0], []).append(run)
+            self._lookups = by_rank, [r[1] for r in self.runs], [r[0] for r in self.records]
+        return self._lookups
+
+    def read_points(self, first, last):
+        """Point dicts at positions first..last (inclusive), read straight from the archive."""
+        if first > last:
+            return []
+        stop = self.offsets[last + 1] if last + 1 < len(self.offsets) else self.end
+        with open(self.archive_path, "rb") as f:
+            f.seek(self.offsets[first])
+            chunk = f.read(stop - self.offsets[first]).rstrip().rstrip(b",")
+        return loads(b"[" + chunk + b"]")
+
+    def positions(self, start=None, end=None):
+        """Position range (first, last) of points with start <= date <= end (YYYY-MM-DD)."""
+        first = bisect_left(self.days, parse_day(start)) if start else 0
+        last = bisect_right(self.days, parse_day(end)) - 1 if end else len(self.days) - 1
+        return first, last
+
+    def range(self, start=None, end=None):
+        """Points with start <= date <= end (inclusive YYYY-MM-DD strings)."""
+        return self.read_points(*self.positions(start, end))
+
+    def _period(self, name, division, first, last):
+        next_day = self.days[last + 1] if last + 1 < len(self.days) else self.days[last] + 1
+        return {"rank": name, "division": division, "start": format_day(self.days[first]),
+                "end": format_day(self.days[last]), "points": last - first + 1,
+                "days": next_day - self.days[first]}
+
+    def _run_dict(self, run):
+        return self._period(*RANK_LABELS[run[0]], run[1], run[2])
+
+    def residency(self, rank, division=None):
+        """
+        Every period spent in `rank`, in date order. With a division, each
+        run in that division; without one, back-to-back runs in different
+        divisions of the rank are one period ("division" is None if it
+        changed within the period).
+        """
+        runs = self._lookup()[0].get(rank, [])
+        if division is not None:
+            return [self._run_dict(r) for r in runs if RANK_LABELS[r[0]][1] == division]
+        periods = []
+        for label, first, last in runs:
+            if periods and periods[-1][2] == first - 1:
+                period = periods[-1]
+                period[2] = last
+                if period[0] != label:
+                    period[0] = None
+            else:
+                periods.append([label, first, last])
+        return [self._period(rank, RANK_LABELS[label][1] if label is not None else None, first, last)
+                for label, first, last in periods]
+
+    def first_reached(self, rank, division=None):
+        """The first point at or above `rank` (division 1 if not given), or None."""
+        target = RANK_LABEL_INDEX.get((rank, division or 1))
+        if target is None:
+            raise ValueError(f"Unknown rank: {rank} {division or ''}".strip())
+        i = bisect_left(self._lookup()[2], target)
+        if i == len(self.records):
+            return None
+        pos = self.records[i][1]
+        return self.read_points(pos, pos)[0]
+
+    def at(self, date):
+        """The run the archive was in on `date` (YYYY-MM-DD), or None before the first point."""
+        pos = bisect_right(self.days, parse_day(date)) - 1
+        if pos < 0:
+            return None
+        i = bisect_right(self._lookup()[1], pos) - 1
+        return self._run_dict(self.runs[i])
+
+
+def update_index(archive_path, series, changed_from=0):
+    """
+    Update (or build) the index of a just-written JSON archive.
+    `changed_from` is the first archive position the merge rewrote.
+    """
+    if not series:
+        return None
+    index = ArchiveIndex.load(archive_path)
+    if index is None:
+        index, changed_from = ArchiveIndex(archive_path), 0
+    try:
+        count = index.update(series, changed_from)
+    except (OSError, ValueError) as e:
+        print(f"  Warning: Archive index out of step ({e}), rebuilding it")
+        index = ArchiveIndex(archive_path)
+        try:
+            count = index.update(series)
+        except (OSError, ValueError) as e:
+            print(f"  Warning: Could not index the archive ({e}), dropping the index")
+            index_path_for(archive_path).unlink(missing_ok=True)
+            return None
+    index.save()
+    print(f"  Index: {count} of {len(series)} points (re)indexed")
+    return index
+
+
+def open_index(archive_path):
+    """The index for an archive, rebuilt first if it is missing or stale."""
+    index = ArchiveIndex.load(archive_path)
+    if index is None or not index.is_current():
+        with open(archive_path, "r", encoding="utf-8") as f:
+            series = MmrSeries.from_points(json.load(f)["dataPoints"])
+        index = ArchiveIndex(archive_path)
+        index.update(series)
+        index.save()
+    return index
+
+
+def main(argv=None):
+    import argparse
+
+    from mmr.cli import DATA_DIR, archive_name
+
+    parser = argparse.ArgumentParser(prog="python -m mmr.index", description="Query the MMR archive index")
+    parser.add_argument("--archive", default=str(DATA_DIR / archive_name("json")), help="JSON archive (default: data/mmr-archive.json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    q = commands.add_parser("range", help="Points between two dates (inclusive)")
+    q.add_argument("start")
+    q.add_argument("end")
+    q = commands.add_parser("residency", help="Periods spent in a rank")
+    q.add_argument("rank")
+    q.add_argument("--division", type=int)
+    q = commands.add_parser("first", help="First time a rank was reached")
+    q.add_argument("rank")
+    q.add_argument("--division", type=int)
+    q = commands.add_parser("at", help="Rank run on a date")
+    q.add_argument("date")
+    args = parser.parse_args(argv)
+
+    index = open_index(args.archive)
+    if args.command == "range":
+        result = index.range(args.start, args.end)
+    elif args.command == "residency":
+        result = index.residency(args.rank, args.division)
+    elif args.command == "first":
+        result = index.first_reached(args.rank, args.division)
+    else:
+        result = index.at(args.date)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
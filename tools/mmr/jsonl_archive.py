@@ -0,0 +1,92 @@
+"""
+Append-only JSON Lines archive backend.
+
+One record per line. Point records are the usual archive points; a
+metadata record ({"meta": {"lastUpdated": ...}}) is appended after each
+batch. Reading applies the archive rule "latest value per date wins", so
+appends only ever need the points that were added or changed, and
+compaction rewrites the file down to one line per date.
+
+The loaded/exported shape is the same as mmr-archive.json:
+    {"dataPoints": [...], "lastUpdated": ...}
+"""
+
+import json
+import os
+
+from jsoncodec import loads
+from mmr.archive import day_key
+
+SEPARATORS = (",", ":")
+
+
+def _dumps(record):
+    return json.dumps(record, separators=SEPARATORS)
+
+
+def load(path):
+    """Load a JSONL archive into the mmr-archive.json shape."""
+    by_day = {}
+    last_updated = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: {e}") from e
+                if "meta" in record:
+                    last_updated = record["meta"].get("lastUpdated", last_updated)
+                else:
+                    by_day[day_key(record)] = record
+    points = sorted(by_day.values(), key=lambda x: x["date"])
+    return {"dataPoints": points, "lastUpdated": last_updated}
+
+
+def append(path, points, last_updated):
+    """Append points plus a metadata record. Cost is O(len(points))."""
+    with open(path, "a", encoding="utf-8") as f:
+        for point in points:
+            f.write(_dumps(point) + "\n")
+        f.write(_dumps({"meta": {"lastUpdated": last_updated}}) + "\n")
+
+
+def write(path, archive):
+    """Atomically write an archive as one line per point plus one metadata line."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for point in archive["dataPoints"]:
+            f.write(_dumps(point) + "\n")
+        f.write(_dumps({"meta": {"lastUpdated": archive.get("lastUpdated")}}) + "\n")
+    os.replace(tmp, path)
+
+
+def compact(path):
+    """
+    Rewrite a JSONL archive keeping only the latest value per date.
+    Returns (lines before, lines after).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        before = sum(1 for line in f if line.strip())
+    archive = load(path)
+    write(path, archive)
+    return before, len(archive["dataPoints"]) + 1
+
+
+def import_json(json_path, jsonl_path):
+    """Convert an mmr-archive.json document into a compacted JSONL archive."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        archive = json.load(f)
+    write(jsonl_path, archive)
+    return archive
+
+
+def export_json(jsonl_path, json_path):
+    """Write a JSONL archive back out in the mmr-archive.json format."""
+    archive = load(jsonl_path)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(archive, f, indent=2)
+    return archive
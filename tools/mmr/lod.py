@@ -0,0 +1,128 @@
+"""
+Level-of-detail tiers for the MMR chart.
+
+From one playlist's archive and display series this builds:
+    monthly  - OHLC-style buckets (open/close/min/max) per calendar month
+    weekly   - the same per ISO week (Monday start)
+    lttb     - Largest-Triangle-Three-Buckets downsample of the display
+               points to a target count (shape preserving)
+    daily    - every display point, split into one file per year so a
+               zoomed chart only fetches the years it shows
+
+Each tier is written with static_output.publish_json and described in an
+index.json manifest (file names point at the .min.json variants).
+"""
+
+from pathlib import Path
+
+from mmr.series import MmrSeries, format_day, month_start, row_to_point, week_start
+from static_output import min_path, publish_json
+
+LTTB_TARGET = 200
+
+
+def iter_ohlc(rows, bucket_of):
+    """
+    Yield one OHLC dict per bucket of date-sorted rows:
+        {"date": bucket start, "open", "close", "min", "max", "points"}
+    """
+    bucket = None
+    for row in rows:
+        day, mmr = row[0], row[1]
+        key = bucket_of(day)
+        if bucket is None or key != bucket["_key"]:
+            if bucket is not None:
+                del bucket["_key"]
+                yield bucket
+            bucket = {"_key": key, "date": format_day(key), "open": mmr, "close": mmr,
+                      "min": mmr, "max": mmr, "points": 0}
+        bucket["close"] = mmr
+        if mmr < bucket["min"]:
+            bucket["min"] = mmr
+        elif mmr > bucket["max"]:
+            bucket["max"] = mmr
+        bucket["points"] += 1
+    if bucket is not None:
+        del bucket["_key"]
+        yield bucket
+
+
+def lttb_indices(xs, ys, target):
+    """
+    Indices kept by Largest-Triangle-Three-Buckets downsampling to `target`
+    points. Always keeps the first and last point.
+    """
+    n = len(xs)
+    if target >= n or target < 3:
+        return list(range(n))
+
+    kept = [0]
+    bucket_size = (n - 2) / (target - 2)
+    a = 0
+    for i in range(target - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third triangle vertex
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def lttb(series, target=LTTB_TARGET):
+    """Downsample an MmrSeries to about `target` points."""
+    return MmrSeries(series.row(i) for i in lttb_indices(series.days, series.mmrs, target))
+
+
+def _tier_file(out_dir, name, items):
+    report = publish_json(out_dir / f"{name}.json", items)
+    return min_path(Path(report["path"])).name, report
+
+
+def write_lod_tiers(archive, display, out_dir, target=LTTB_TARGET, generated=None, ranked=True):
+    """
+    Write every tier for one playlist into `out_dir` plus index.json.
+    `archive` is the one-per-day archive series, `display` the display series.
+    ranked=False (no rank table for the playlist) leaves rank/division out
+    of the points. Returns the manifest.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tiers = []
+
+    for name, bucket_of in (("monthly", month_start), ("weekly", week_start)):
+        buckets = list(iter_ohlc(archive.rows(), bucket_of))
+        file_name, _ = _tier_file(out_dir, name, buckets)
+        tiers.append({"name": name, "kind": "ohlc", "file": file_name, "points": len(buckets)})
+
+    sampled = lttb(display, target)
+    file_name, _ = _tier_file(out_dir, "lttb", sampled.to_points(ranked))
+    tiers.append({"name": "lttb", "kind": "points", "target": target, "file": file_name,
+                  "points": len(sampled)})
+
+    chunks = []
+    by_year = {}
+    for row in display.rows():
+        by_year.setdefault(format_day(row[0])[:4], []).append(row)
+    for year, rows in sorted(by_year.items()):
+        file_name, _ = _tier_file(out_dir, f"daily-{year}", [row_to_point(r, ranked) for r in rows])
+        chunks.append({"file": file_name, "start": format_day(rows[0][0]),
+                       "end": format_day(rows[-1][0]), "points": len(rows)})
+    tiers.append({"name": "daily", "kind": "points", "points": len(display), "chunks": chunks})
+
+    manifest = {"generated": generated, "tiers": tiers}
+    publish_json(out_dir / "index.json", manifest)
+    return manifest
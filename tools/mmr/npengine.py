@@ -0,0 +1,93 @@
+"""
+NumPy engine for the display transforms (optional: needs numpy).
+
+Same results as the row generators in mmr.transforms, computed with array
+ops over the MmrSeries columns (wrapped zero-copy with np.frombuffer):
+
+    daily        - keep row i if the next row is on another day
+                   (last value per day; np.diff over days)
+    gap fill     - np.diff(days) > 1 marks each gap; the end-of-gap rows are
+                   scattered into a preallocated output next to the real ones
+    consolidate  - run-length boundaries: drop row i only if its MMR equals
+                   both neighbours (the middle of a flat run)
+    ranks        - np.searchsorted over the division start MMRs
+
+Only worth it for long series; mmr.transforms decides when to use it.
+"""
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from mmr.ranks import _DIVISION_BOUNDS
+from mmr.series import GAP_TIME, MmrSeries
+
+
+def columns(series):
+    """(days, mmrs, ranks, times) as NumPy views of the series' arrays."""
+    return tuple(np.frombuffer(col, dtype=col.typecode)
+                 for col in (series.days, series.mmrs, series.ranks, series.times))
+
+
+def _daily(cols):
+    days = cols[0]
+    keep = np.empty(len(days), dtype=bool)
+    np.not_equal(days[1:], days[:-1], out=keep[:-1])
+    keep[-1:] = True
+    return tuple(col[keep] for col in cols)
+
+
+def _gap_filled(cols):
+    days, mmrs, ranks, times = cols
+    gaps = np.flatnonzero(np.diff(days) > 1)  # a gap between row i and row i + 1
+    if not len(gaps):
+        return cols
+    # Row i moves down by the number of gaps before it
+    shift = np.zeros(len(days), dtype=np.intp)
+    shift[gaps + 1] = 1
+    positions = np.arange(len(days)) + np.cumsum(shift)
+    gap_positions = positions[gaps + 1] - 1
+
+    out = []
+    for col, gap_values in ((days, days[gaps + 1] - 1), (mmrs, mmrs[gaps]),
+                            (ranks, ranks[gaps]), (times, GAP_TIME)):
+        filled = np.empty(len(days) + len(gaps), dtype=col.dtype)
+        filled[positions] = col
+        filled[gap_positions] = gap_values
+        out.append(filled)
+    return tuple(out)
+
+
+def _consolidated(cols):
+    mmrs = cols[1]
+    keep = np.ones(len(mmrs), dtype=bool)
+    if len(mmrs) > 2:
+        middle = (mmrs[1:-1] == mmrs[:-2]) & (mmrs[1:-1] == mmrs[2:])
+        np.logical_not(middle, out=keep[1:-1])
+    return tuple(col[keep] for col in cols)
+
+
+def dedupe_to_daily(series):
+    return MmrSeries.from_columns(*_daily(columns(series)))
+
+
+def fill_daily_gaps(series):
+    return MmrSeries.from_columns(*_gap_filled(columns(series)))
+
+
+def consolidate_flat_periods(series):
+    return MmrSeries.from_columns(*_consolidated(columns(series)))
+
+
+def display_series(series):
+    """Daily dedupe -> gap fill -> flat consolidation (transforms.iter_display)."""
+    return MmrSeries.from_columns(*_consolidated(_gap_filled(_daily(columns(series)))))
+
+
+def rank_indices(mmrs):
+    """ranks.rank_indices() for an iterable of MMR values, as a uint8 array."""
+    bounds = np.asarray(_DIVISION_BOUNDS)
+    values = mmrs if isinstance(mmrs, np.ndarray) else np.fromiter(mmrs, dtype=np.float64)
+    return np.searchsorted(bounds, values, side="right").astype(np.uint8)
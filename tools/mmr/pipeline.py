@@ -0,0 +1,225 @@
+"""
+Archive merge and display build for one playlist.
+
+update_playlist() is the whole per-playlist pipeline: load the archive
+(json, jsonl, shards or sqlite backend), merge the new TRN points into it, save it
+if anything changed, then publish the gap-filled/consolidated display file,
+the chart LOD tiers and the rolling stats.
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+
+from jsoncodec import dumps_pretty, load_path
+from mmr.archive import changed_points, diff_changed, merge_tail
+from mmr.index import update_index
+from mmr.lod import write_lod_tiers
+from mmr.profiling import cprofile, stage
+from mmr.ranks import RANK_COLORS, RANK_THRESHOLDS, get_rank, has_rank_table, next_threshold
+from mmr.series import MmrSeries, json_default, json_default_unranked, parse_day
+from mmr.stats import update_stats
+from mmr.transforms import display_series
+from static_output import format_report, publish_json
+
+PLAYLIST_ID = 28
+GC1_THRESHOLD = 1435
+DEFAULT_PROFILE = {"platform": "epic", "platformUsername": "MaGnetBear", "playlist": "Rumble", "playlistId": PLAYLIST_ID}
+
+# Only Rumble has a rank table (mmr.ranks.has_rank_table); the display,
+# LOD and stats files of the others carry MMR without ranks, and their
+# archives are not indexed.
+PLAYLIST_NAMES = {
+    10: "Ranked Duel 1v1", 11: "Ranked Doubles 2v2", 13: "Ranked Standard 3v3",
+    27: "Hoops", 28: "Rumble", 29: "Dropshot", 30: "Snowday",
+}
+
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def archive_key(profile=None):
+    """(player, playlist) key of a profile in the sqlite backend."""
+    profile = profile or DEFAULT_PROFILE
+    return f"{profile['platform']}/{profile['platformUsername']}", profile["playlistId"]
+
+
+def load_archive(archive_format, path, key=None):
+    """
+    Load existing archive data, or return empty structure if none exists.
+    dataPoints is returned as an MmrSeries. `key` is the (player, playlist)
+    of the sqlite backend (default: DEFAULT_PROFILE).
+    """
+    if archive_format == "jsonl":
+        from mmr import jsonl_archive
+        archive = jsonl_archive.load(path)
+        archive["dataPoints"] = MmrSeries.from_points(archive["dataPoints"])
+        print(f"  Loaded JSONL archive with {len(archive['dataPoints'])} points")
+        return archive
+    if archive_format == "shards":
+        from mmr import shards
+        archive = shards.load(path)
+        print(f"  Loaded sharded archive with {len(archive['dataPoints'])} points")
+        return archive
+    if archive_format == "sqlite":
+        from mmr import sqlite_archive
+        archive = sqlite_archive.load(path, key or archive_key())
+        print(f"  Loaded SQLite archive with {len(archive['dataPoints'])} points")
+        return archive
+    path = Path(path)
+    if path.exists():
+        try:
+            archive = load_path(path)
+        except Exception as e:
+            print(f"  Warning: Could not load archive: {e}")
+        else:
+            archive["dataPoints"] = MmrSeries.from_points(archive.get("dataPoints", []))
+            print(f"  Loaded archive with {len(archive['dataPoints'])} points")
+            return archive
+    return {"dataPoints": MmrSeries(), "lastUpdated": None}
+
+
+def write_json_archive(archive, path):
+    Path(path).write_bytes(dumps_pretty(archive, default=json_default))
+
+
+def save_archive(archive, archive_format, path, appended=(), key=None):
+    """
+    Save archive to disk.
+    The JSON archive is rewritten in full; the JSONL archive only gets the
+    changed points (`appended`) added to the end; the sharded archive only
+    rewrites the months those points fall in; the SQLite archive upserts
+    just those points.
+    """
+    archive["lastUpdated"] = utc_now_iso()
+    if archive_format == "jsonl":
+        from mmr import jsonl_archive
+        jsonl_archive.append(path, appended, archive["lastUpdated"])
+        print(f"  Appended {len(appended)} points to JSONL archive")
+        return
+    if archive_format == "shards":
+        from mmr import shards
+        written = shards.write_months(path, archive["dataPoints"],
+                                      shards.months_of(appended), archive["lastUpdated"])
+        print(f"  Rewrote {len(written)} archive shard(s): {', '.join(written)}")
+        return
+    if archive_format == "sqlite":
+        from mmr import sqlite_archive
+        changed = sqlite_archive.upsert(path, key or archive_key(), appended, archive["lastUpdated"])
+        print(f"  Upserted {changed} points into SQLite archive")
+        return
+    write_json_archive(archive, path)
+    print(f"  Archive saved with {len(archive['dataPoints'])} points")
+
+
+def merge_with_archive(archive, new_points):
+    """
+    Merge a new MmrSeries into the archive's series (incremental).
+    - Keeps all historical data from archive
+    - Adds new data points
+    - Dedupes by date (latest value wins for same date)
+    - Only the tail from the first new date onwards is rebuilt
+    Returns (merged series sorted by date, added/updated/unchanged diff)
+    """
+    merged = archive.setdefault("dataPoints", MmrSeries())
+    diff = merge_tail(merged, new_points)
+    print(f"  Merge: {len(diff['added'])} added, {len(diff['updated'])} updated, "
+          f"{len(diff['unchanged'])} unchanged")
+    return merged, diff
+
+
+def build_display_data(points, profile=None):
+    """
+    Build the display-ready data structure from an MmrSeries.
+    Applies deduplication, gap filling, and flat period consolidation
+    in a single streaming pass over the (date-sorted) points.
+    dataPoints stays an MmrSeries; dump with display_json_default(profile).
+    For a playlist without a rank table the rank/division fields, rank
+    thresholds and bands are left out.
+    """
+    if not points:
+        raise ValueError("No data points")
+    profile = profile or DEFAULT_PROFILE
+
+    display_points = display_series(points)
+    latest_mmr = display_points.mmrs[-1]
+    if not has_rank_table(profile["playlistId"]):
+        return {
+            "profile": profile,
+            "currentRating": {"mmr": latest_mmr, "matches": len(display_points)},
+            "dataPoints": display_points,
+            "lastUpdated": utc_now_iso()
+        }
+
+    lo, hi = min(display_points.mmrs), max(display_points.mmrs)
+    r, d = get_rank(latest_mmr)
+
+    bands = []
+    for i, (t, rank) in enumerate(RANK_THRESHOLDS):
+        nt = next_threshold(i)
+        if nt >= lo - 50 and t <= hi + 50:
+            color = next((c for k, c in RANK_COLORS.items() if rank.startswith(k)), "rgba(100,100,100,0.25)")
+            if not any(b["name"] == rank for b in bands):
+                bands.append({"name": rank, "minMmr": t, "maxMmr": nt, "color": color})
+    bands.reverse()
+
+    return {
+        "profile": profile,
+        "currentRating": {"mmr": latest_mmr, "rank": r, "division": f"Division {d}", "matches": len(display_points)},
+        "rankThresholds": {"gc1": 1435, "gc2": 1535, "gc3": 1635, "ssl": 1862},
+        "rankBands": bands,
+        "dataPoints": display_points,
+        "lastUpdated": utc_now_iso()
+    }
+
+
+def display_json_default(profile=None):
+    """The json default= hook for a playlist's display data (points with or without ranks)."""
+    return json_default if has_rank_table((profile or DEFAULT_PROFILE)["playlistId"]) else json_default_unranked
+
+
+def update_playlist(new_points, archive_format, archive_path, output_path, lod_dir, profile=None,
+                    stats_path=None):
+    """
+    Merge one playlist's new points into its archive and rewrite its display
+    file, chart LOD tiers and (if `stats_path` is given) rolling stats.
+    Returns (merged archive series, display data).
+    """
+    key = archive_key(profile)
+    ranked = has_rank_table((profile or DEFAULT_PROFILE)["playlistId"])
+    with stage("load_archive"):
+        archive = load_archive(archive_format, archive_path, key)
+    with stage("merge"):
+        merged_points, diff = merge_with_archive(archive, new_points)
+
+    # Save updated archive (raw points, no gap filling)
+    if diff_changed(diff):
+        with stage("save_archive"):
+            save_archive(archive, archive_format, archive_path, changed_points(diff, new_points), key)
+        if archive_format == "json" and ranked:
+            with stage("index"):
+                changed_from = bisect_left(merged_points.days, parse_day(min(diff["added"] + diff["updated"])))
+                update_index(archive_path, merged_points, changed_from)
+    else:
+        print("  Archive unchanged, not rewriting")
+
+    # Build display data (with gap filling) from merged archive
+    # Batch runs profile every playlist: one stats file each
+    tag = None if profile is None else f"{profile['platform']}-{profile['platformUsername']}-{profile['playlistId']}"
+    with cprofile("transforms", tag):
+        output = build_display_data(merged_points, profile)
+    with stage("write_display"):
+        report = publish_json(output_path, output, default=display_json_default(profile))
+    print(f"  {format_report(report)}")
+
+    with stage("lod"):
+        manifest = write_lod_tiers(merged_points, output["dataPoints"], lod_dir,
+                                   generated=output["lastUpdated"], ranked=ranked)
+    print("  LOD tiers: " + ", ".join(f"{t['name']} {t['points']}" for t in manifest["tiers"]))
+
+    if stats_path:
+        with stage("stats"):
+            update_stats(merged_points, diff, stats_path, GC1_THRESHOLD if ranked else None,
+                         output["lastUpdated"])
+    return merged_points, output
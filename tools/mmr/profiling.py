@@ -0,0 +1,150 @@
+"""
+Opt-in run instrumentation (`python -m mmr --profile`).
+
+Code marks its phases with the stage() context manager. It is a no-op
+until enable() is called, so the normal run pays only a function call per
+phase. Once enabled, every stage records its wall
+time and its tracemalloc peak above the memory in use when it started.
+Stages nest (an outer stage's peak includes its children's). Only the main
+thread is recorded: batch-mode fetch threads already report their own times.
+
+report() returns the structured run report:
+
+    {"started", "command", "ok", "totalSeconds", "peakBytes",
+     "stages": [{"name", "depth", "seconds", "peakBytes"}, ...]}
+
+(a stage's peakBytes is above the memory in use when it started, the run's
+is the highest traced since enable()) and append_run_log() adds it as one
+JSON line to a run log.
+
+cprofile(name) additionally runs its block under cProfile when a dump path
+was passed to enable(); the stats are written there for pstats/snakeviz.
+cprofile(name, tag) writes them next to it as <stem>-<tag><suffix>
+instead, so the blocks of a batch run (one per player and playlist) don't
+overwrite each other.
+"""
+
+import json
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+_enabled = False
+_started = None
+_start_time = None
+_stages = []
+_stack = []  # highest child peak, per open stage
+_run_peak = 0
+_cprofile_path = None
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.-]")
+
+
+def enable(cprofile_path=None):
+    """Start recording stages (and tracemalloc). `cprofile_path`: where cprofile() blocks dump stats."""
+    global _enabled, _started, _start_time, _cprofile_path, _run_peak
+    _enabled = True
+    _started = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    _start_time = time.perf_counter()
+    _cprofile_path = cprofile_path
+    _stages.clear()
+    _stack.clear()
+    _run_peak = 0
+    tracemalloc.start()
+
+
+def enabled():
+    return _enabled
+
+
+def _recording():
+    return _enabled and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def stage(name):
+    """Time a block and record its peak memory (no-op unless profiling is enabled)."""
+    global _run_peak
+    if not _recording():
+        yield
+        return
+
+    record = {"name": name, "depth": len(_stack), "seconds": None, "peakBytes": None}
+    _stages.append(record)
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    _stack.append(0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        # reset_peak() in a child stage lost our peak so far; the children report theirs
+        peak = max(tracemalloc.get_traced_memory()[1], _stack.pop())
+        record["peakBytes"] = max(0, peak - base)
+        if _stack:
+            _stack[-1] = max(_stack[-1], peak)
+        _run_peak = max(_run_peak, peak)
+
+
+@contextmanager
+def cprofile(name, tag=None):
+    """
+    stage(name), also run under cProfile when enable() was given a dump path.
+    With a `tag` the stats go to that path with "-<tag>" added to its stem.
+    """
+    if not _cprofile_path or not _recording():
+        with stage(name):
+            yield
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    with stage(name):
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+    path = Path(_cprofile_path)
+    if tag is not None:
+        path = path.with_name(f"{path.stem}-{_UNSAFE_NAME_CHARS.sub('_', str(tag))}{path.suffix}")
+    profiler.dump_stats(path)
+    print(f"  cProfile stats for {name} written to {path}")
+
+
+def report(command=None, ok=True):
+    """The run report so far (stops tracemalloc)."""
+    peak = _run_peak
+    if tracemalloc.is_tracing():
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "started": _started,
+        "command": command,
+        "ok": ok,
+        "totalSeconds": round(time.perf_counter() - _start_time, 6) if _start_time else None,
+        "peakBytes": peak,
+        "stages": list(_stages),
+    }
+
+
+def format_report(run):
+    """Human-readable table of a run report."""
+    lines = [f"  {'stage':<28} {'time':>10} {'peak':>11}"]
+    for s in run["stages"]:
+        label = "  " * s["depth"] + s["name"]
+        seconds = f"{s['seconds'] * 1000:.1f} ms" if s["seconds"] is not None else "-"
+        lines.append(f"  {label:<28} {seconds:>10} {s['peakBytes'] / 2**20:>7.2f} MiB")
+    lines.append(f"  {'total':<28} {run['totalSeconds'] * 1000:>7.1f} ms {run['peakBytes'] / 2**20:>7.2f} MiB")
+    return "\n".join(lines)
+
+
+def append_run_log(path, run):
+    """Append one run report to a JSON-lines run log."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, separators=(",", ":")) + "\n")
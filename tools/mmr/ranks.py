@@ -0,0 +1,87 @@
+"""
+Rumble rank thresholds and rank/division classification.
+
+The classifier precomputes the MMR at which every division of every rank
+starts, so a lookup is a single bisect over 88 sorted boundaries instead of
+a walk over all 22 thresholds. The bisect position doubles as a compact
+rank index: RANK_LABELS[index] is the (rank, division) pair.
+"""
+
+from bisect import bisect_right
+
+RANK_THRESHOLDS = [
+    (1862, "Supersonic Legend"), (1635, "Grand Champion III"), (1535, "Grand Champion II"),
+    (1435, "Grand Champion I"), (1176, "Champion III"), (1096, "Champion II"),
+    (1016, "Champion I"), (936, "Diamond III"), (856, "Diamond II"), (776, "Diamond I"),
+    (696, "Platinum III"), (616, "Platinum II"), (556, "Platinum I"),
+    (496, "Gold III"), (436, "Gold II"), (376, "Gold I"),
+    (316, "Silver III"), (256, "Silver II"), (196, "Silver I"),
+    (136, "Bronze III"), (76, "Bronze II"), (0, "Bronze I"),
+]
+
+RANK_COLORS = {
+    "Bronze": "rgba(139, 90, 43, 0.25)", "Silver": "rgba(169, 169, 169, 0.25)",
+    "Gold": "rgba(212, 175, 55, 0.25)", "Platinum": "rgba(0, 182, 182, 0.25)",
+    "Diamond": "rgba(37, 161, 213, 0.25)", "Champion": "rgba(142, 89, 225, 0.25)",
+    "Grand Champion": "rgba(227, 150, 68, 0.25)", "Supersonic Legend": "rgba(251, 163, 177, 0.25)",
+}
+
+UNRANKED = ("Unranked", 0)
+
+# RANK_THRESHOLDS is the Rumble table. The other playlists have tables of
+# their own that are not kept here, so their outputs carry MMR only (no
+# rank, division, bands or GC1 projection).
+RANK_TABLE_PLAYLISTS = frozenset({28})
+
+
+def has_rank_table(playlist_id):
+    """Whether RANK_THRESHOLDS applies to `playlist_id`."""
+    return playlist_id in RANK_TABLE_PLAYLISTS
+
+
+def next_threshold(i):
+    """Upper bound of RANK_THRESHOLDS[i] (SSL is treated as 200 wide)."""
+    threshold = RANK_THRESHOLDS[i][0]
+    return RANK_THRESHOLDS[i - 1][0] if i > 0 else threshold + 200
+
+
+def _build_division_index():
+    """
+    Build parallel lists of division start MMRs (ascending) and the
+    (rank, division) each one starts. Index 0 is the "below everything" slot.
+    """
+    bounds = []
+    labels = [UNRANKED]
+    for i in reversed(range(len(RANK_THRESHOLDS))):
+        threshold, rank = RANK_THRESHOLDS[i]
+        div_spread = (next_threshold(i) - threshold) / 4
+        for div in range(1, 5):
+            bounds.append(threshold + (div - 1) * div_spread)
+            labels.append((rank, div))
+    return bounds, labels
+
+
+_DIVISION_BOUNDS, RANK_LABELS = _build_division_index()
+RANK_LABEL_INDEX = {label: i for i, label in enumerate(RANK_LABELS)}
+
+
+def rank_index(mmr):
+    """Index into RANK_LABELS for an MMR value (0 is Unranked)."""
+    return bisect_right(_DIVISION_BOUNDS, mmr)
+
+
+def rank_indices(mmrs):
+    """rank_index() for an iterable of MMR values."""
+    bounds = _DIVISION_BOUNDS
+    return [bisect_right(bounds, m) for m in mmrs]
+
+
+def get_rank(mmr):
+    """Get (rank name, division) for an MMR value."""
+    return RANK_LABELS[bisect_right(_DIVISION_BOUNDS, mmr)]
+
+
+def classify_many(mmrs):
+    """Classify an iterable of MMR values, returning a list of (rank, division)."""
+    bounds, labels = _DIVISION_BOUNDS, RANK_LABELS
+    return [labels[bisect_right(bounds, m)] for m in mmrs]
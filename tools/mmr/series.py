@@ -0,0 +1,240 @@
+"""
+Compact columnar container for MMR data points.
+
+A point dict ({"date", "mmr", "rank", "division"}) costs a few hundred bytes
+once its date string and int objects are counted. MmrSeries keeps the same
+information in parallel typed arrays:
+
+    days   - epoch day (days since 1970-01-01), int32
+    mmrs   - MMR, int16
+    ranks  - index into ranks.RANK_LABELS (rank + division), uint8
+    times  - index into TIME_SUFFIXES (the "T..." part of the date), uint16
+
+Rows are plain (day, mmr, rank, time) tuples. Point dicts are only rebuilt
+when the data is written out (to_points / json_default).
+
+Date strings are converted at the edges only: parse_day() when points come
+in, format_day() when they go out. The bulk conversions (from_entries,
+from_points, iter_points) memoize the last day they converted for the
+length of that one pass, so a run of same-day samples in date-sorted data
+is parsed/formatted once and nothing is kept once the pass is done.
+"""
+
+from array import array
+from datetime import date
+
+from mmr.ranks import RANK_LABELS, RANK_LABEL_INDEX, rank_index
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MMR_MIN, MMR_MAX = -(1 << 15), (1 << 15) - 1  # range of the int16 mmrs column
+
+# Interned time-of-day suffixes, shared by every series so rows can move
+# between series. Index 0 is the suffix used for generated gap points.
+GAP_TIME_SUFFIX = "T00:00:00+00:00"
+GAP_TIME = 0
+TIME_SUFFIXES = [GAP_TIME_SUFFIX]
+_TIME_INDEX = {GAP_TIME_SUFFIX: GAP_TIME}
+
+
+def time_id(suffix):
+    """Intern a date suffix (everything after YYYY-MM-DD)."""
+    tid = _TIME_INDEX.get(suffix)
+    if tid is None:
+        tid = _TIME_INDEX[suffix] = len(TIME_SUFFIXES)
+        TIME_SUFFIXES.append(suffix)
+    return tid
+
+
+def parse_day(date_str):
+    """Epoch day for an ISO date string (only the YYYY-MM-DD part is read)."""
+    return date.fromisoformat(date_str[:10]).toordinal() - EPOCH_ORDINAL
+
+
+def format_day(day):
+    """YYYY-MM-DD for an epoch day."""
+    return date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+
+def format_date(day, tid):
+    """Full date string for an epoch day and time suffix id."""
+    return format_day(day) + TIME_SUFFIXES[tid]
+
+
+def week_start(day):
+    """Epoch day of the Monday starting `day`'s ISO week (1970-01-01 was a Thursday)."""
+    return day - (day + 3) % 7
+
+
+def month_start(day):
+    """Epoch day of the first of `day`'s month."""
+    return day - date.fromordinal(day + EPOCH_ORDINAL).day + 1
+
+
+def entry_date(entry):
+    """Sort key for a (date string, mmr) entry."""
+    return entry[0]
+
+
+def row_sort_key(row):
+    """Sort key equivalent to sorting points by their full date string."""
+    return row[0], TIME_SUFFIXES[row[3]]
+
+
+class MmrSeries:
+    """Date-ordered MMR points stored column-wise."""
+
+    __slots__ = ("days", "mmrs", "ranks", "times")
+
+    def __init__(self, rows=()):
+        self.days = array("i")
+        self.mmrs = array("h")
+        self.ranks = array("B")
+        self.times = array("H")
+        self.extend(rows)
+
+    @classmethod
+    def from_points(cls, points):
+        """Build from point dicts (archive / display shape)."""
+        return cls(_point_rows(points))
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build from (date string, mmr) pairs, classifying ranks and sorting by date."""
+        return cls.from_sorted_entries(sorted(entries, key=entry_date))
+
+    @classmethod
+    def from_sorted_entries(cls, entries, ranks=None):
+        """
+        Build from date-sorted (date string, mmr) pairs in one pass. Ranks are
+        classified row by row unless `ranks` (one RANK_LABELS index per entry)
+        is given.
+        """
+        if ranks is None:
+            ranks = (rank_index(mmr) for _, mmr in entries)
+        return cls(_entry_rows(entries, ranks))
+
+    @classmethod
+    def from_columns(cls, days, mmrs, ranks, times):
+        """Build from column buffers (e.g. NumPy arrays) with the same item types."""
+        series = cls()
+        for col, values in zip((series.days, series.mmrs, series.ranks, series.times),
+                               (days, mmrs, ranks, times)):
+            col.frombytes(memoryview(values).cast("B"))
+        return series
+
+    def __len__(self):
+        return len(self.days)
+
+    def __bool__(self):
+        return len(self.days) > 0
+
+    def __eq__(self, other):
+        if not isinstance(other, MmrSeries):
+            return NotImplemented
+        return (self.days == other.days and self.mmrs == other.mmrs
+                and self.ranks == other.ranks and self.times == other.times)
+
+    def row(self, i):
+        return self.days[i], self.mmrs[i], self.ranks[i], self.times[i]
+
+    def rows(self, start=0):
+        """Iterate (day, mmr, rank, time) rows from index `start`."""
+        if start:
+            return zip(self.days[start:], self.mmrs[start:], self.ranks[start:], self.times[start:])
+        return zip(self.days, self.mmrs, self.ranks, self.times)
+
+    def append(self, row):
+        """Append a row; a non-integer MMR is rounded to the nearest whole one."""
+        day, mmr, rank, tid = row
+        self.days.append(day)
+        try:
+            self.mmrs.append(mmr)
+        except TypeError:
+            self.mmrs.append(int(round(mmr)))
+        self.ranks.append(rank)
+        self.times.append(tid)
+
+    def extend(self, rows):
+        append = self.append
+        for row in rows:
+            append(row)
+
+    def truncate(self, start):
+        """Drop every row from index `start` onwards."""
+        del self.days[start:]
+        del self.mmrs[start:]
+        del self.ranks[start:]
+        del self.times[start:]
+
+    def date(self, i):
+        return format_date(self.days[i], self.times[i])
+
+    def point(self, i):
+        return row_to_point(self.row(i))
+
+    def iter_points(self, ranked=True):
+        return _iter_points(self.rows(), ranked)
+
+    def to_points(self, ranked=True):
+        """Materialize as a list of point dicts (write time only); ranked=False leaves out rank/division."""
+        return list(self.iter_points(ranked))
+
+    def nbytes(self):
+        """Bytes held by the column buffers."""
+        return sum(col.itemsize * len(col) for col in (self.days, self.mmrs, self.ranks, self.times))
+
+
+def _entry_rows(entries, ranks):
+    """Rows for date-sorted (date string, mmr) entries; each run of same-day dates is parsed once."""
+    last_ymd = day = None
+    for (date_str, mmr), rank in zip(entries, ranks):
+        ymd = date_str[:10]
+        if ymd != last_ymd:
+            last_ymd, day = ymd, parse_day(ymd)
+        yield day, mmr, rank, time_id(date_str[10:])
+
+
+def _point_rows(points):
+    """Rows for point dicts; each run of same-day dates is parsed once."""
+    last_ymd = day = None
+    for p in points:
+        date_str = p["date"]
+        ymd = date_str[:10]
+        if ymd != last_ymd:
+            last_ymd, day = ymd, parse_day(ymd)
+        yield day, p["mmr"], RANK_LABEL_INDEX[(p["rank"], p["division"])], time_id(date_str[10:])
+
+
+def _iter_points(rows, ranked=True):
+    """row_to_point() over rows; each run of same-day rows is formatted once."""
+    last_day = ymd = None
+    for day, mmr, rank, tid in rows:
+        if day != last_day:
+            last_day, ymd = day, format_day(day)
+        if not ranked:
+            yield {"date": ymd + TIME_SUFFIXES[tid], "mmr": mmr}
+            continue
+        rank_name, division = RANK_LABELS[rank]
+        yield {"date": ymd + TIME_SUFFIXES[tid], "mmr": mmr, "rank": rank_name, "division": division}
+
+
+def row_to_point(row, ranked=True):
+    day, mmr, rank, tid = row
+    if not ranked:
+        return {"date": format_date(day, tid), "mmr": mmr}
+    rank_name, division = RANK_LABELS[rank]
+    return {"date": format_date(day, tid), "mmr": mmr, "rank": rank_name, "division": division}
+
+
+def json_default(obj):
+    """json.dump default= hook that writes an MmrSeries as its point list."""
+    if isinstance(obj, MmrSeries):
+        return obj.to_points()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_default_unranked(obj):
+    """json_default for playlists without a rank table: points without rank/division."""
+    if isinstance(obj, MmrSeries):
+        return obj.to_points(ranked=False)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
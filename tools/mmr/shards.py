@@ -0,0 +1,125 @@
+"""
+Month-sharded archive backend.
+
+The archive lives in a directory of one file per calendar month
+(YYYY-MM.json, same point shape as mmr-archive.json) plus manifest.json:
+
+    {
+      "lastUpdated": ...,
+      "shards": [
+        {"month": "2025-02", "file": "2025-02.json", "start": "2025-02-03",
+         "end": "2025-02-28", "points": 26, "minMmr": 781, "maxMmr": 912,
+         "sha256": "..."},
+        ...
+      ]
+    }
+
+A merge only rewrites the months it touched, and range reads only open the
+shards whose [start, end] overlaps the requested range.
+"""
+
+import hashlib
+import json
+from bisect import bisect_left
+from pathlib import Path
+
+from jsoncodec import dumps_pretty, loads
+from mmr.series import MmrSeries, format_day, month_start, parse_day, row_to_point
+from static_output import atomic_write
+
+MANIFEST_NAME = "manifest.json"
+
+
+def load_manifest(shard_dir):
+    path = Path(shard_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {"lastUpdated": None, "shards": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_shard(shard_dir, entry):
+    path = Path(shard_dir) / entry["file"]
+    body = path.read_bytes()
+    if hashlib.sha256(body).hexdigest() != entry.get("sha256"):
+        print(f"  Warning: {path.name} does not match its manifest hash")
+    return MmrSeries.from_points(loads(body)["dataPoints"])
+
+
+def load(shard_dir):
+    """Load every shard into the archive shape ({"dataPoints": MmrSeries, "lastUpdated"})."""
+    manifest = load_manifest(shard_dir)
+    series = MmrSeries()
+    for entry in manifest["shards"]:
+        series.extend(_read_shard(shard_dir, entry).rows())
+    return {"dataPoints": series, "lastUpdated": manifest.get("lastUpdated")}
+
+
+def load_range(shard_dir, start, end):
+    """
+    Points with start <= date <= end (YYYY-MM-DD strings, inclusive) as an
+    MmrSeries, opening only the shards that overlap the range.
+    """
+    manifest = load_manifest(shard_dir)
+    lo, hi = parse_day(start), parse_day(end)
+    series = MmrSeries()
+    for entry in manifest["shards"]:
+        if entry["end"] < start or entry["start"] > end:
+            continue
+        series.extend(row for row in _read_shard(shard_dir, entry).rows() if lo <= row[0] <= hi)
+    return series
+
+
+def _month_bounds(series, month_day):
+    """Index range [i, j) of a sorted series covering the month starting at `month_day`."""
+    next_month = month_start(month_day + 31)
+    return bisect_left(series.days, month_day), bisect_left(series.days, next_month)
+
+
+def write_months(shard_dir, series, months, last_updated):
+    """
+    Rewrite the shards for `months` (epoch days of month starts) from a
+    sorted series and update the manifest. Returns the shard files written.
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(shard_dir)
+    entries = {e["month"]: e for e in manifest["shards"]}
+    written = []
+
+    for month_day in sorted(set(months)):
+        month = format_day(month_day)[:7]
+        i, j = _month_bounds(series, month_day)
+        if i == j:
+            entries.pop(month, None)
+            continue
+        body = dumps_pretty({"dataPoints": [row_to_point(series.row(k)) for k in range(i, j)]})
+        file_name = f"{month}.json"
+        atomic_write(shard_dir / file_name, body)
+        mmrs = series.mmrs[i:j]
+        entries[month] = {
+            "month": month,
+            "file": file_name,
+            "start": format_day(series.days[i]),
+            "end": format_day(series.days[j - 1]),
+            "points": j - i,
+            "minMmr": min(mmrs),
+            "maxMmr": max(mmrs),
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+        written.append(file_name)
+
+    manifest = {"lastUpdated": last_updated, "shards": [entries[m] for m in sorted(entries)]}
+    atomic_write(shard_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+    return written
+
+
+def write_all(shard_dir, series, last_updated):
+    """Write a whole series as shards (used for import)."""
+    months = {month_start(day) for day in series.days}
+    return write_months(shard_dir, series, months, last_updated)
+
+
+def months_of(points):
+    """Month-start epoch days touched by a list of point dicts."""
+    return {month_start(parse_day(p["date"])) for p in points}
@@ -0,0 +1,114 @@
+"""
+SQLite archive backend (stdlib sqlite3).
+
+One database can hold every tracked profile: points are keyed by
+(player, playlist, day), where player is "<platform>/<username>" and day
+is the epoch day, so the archive rule "one point per date" is the primary
+key. Saving is an executemany() upsert of just the added/changed points;
+on a conflict the incoming row replaces the stored one, which is the same
+"latest value per date wins" rule as mmr.archive.merge_tail.
+
+The database runs in WAL mode, so readers (exports, ad-hoc queries) never
+block the updater and vice versa.
+
+    points(player, playlist, day, date, mmr, rank, division)
+    archives(player, playlist, last_updated)
+
+The loaded/exported shape is the same as mmr-archive.json:
+    {"dataPoints": MmrSeries, "lastUpdated": ...}
+"""
+
+import sqlite3
+
+from mmr.ranks import RANK_LABEL_INDEX
+from mmr.series import MmrSeries, parse_day, time_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    player   TEXT    NOT NULL,
+    playlist INTEGER NOT NULL,
+    day      INTEGER NOT NULL,
+    date     TEXT    NOT NULL,
+    mmr      INTEGER NOT NULL,
+    rank     TEXT    NOT NULL,
+    division INTEGER NOT NULL,
+    PRIMARY KEY (player, playlist, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS archives (
+    player       TEXT    NOT NULL,
+    playlist     INTEGER NOT NULL,
+    last_updated TEXT,
+    PRIMARY KEY (player, playlist)
+);
+"""
+
+UPSERT = """
+INSERT INTO points (player, playlist, day, date, mmr, rank, division)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (player, playlist, day) DO UPDATE SET
+    date = excluded.date, mmr = excluded.mmr, rank = excluded.rank, division = excluded.division
+WHERE points.date <> excluded.date OR points.mmr <> excluded.mmr
+   OR points.rank <> excluded.rank OR points.division <> excluded.division
+"""
+
+
+def connect(path):
+    """Open (creating if needed) an archive database in WAL mode."""
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; safe with WAL
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load(path, key):
+    """Load one (player, playlist) archive as {"dataPoints": MmrSeries, "lastUpdated"}."""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT day, date, mmr, rank, division FROM points WHERE player = ? AND playlist = ? ORDER BY day",
+            key,
+        )
+        series = MmrSeries(
+            (day, mmr, RANK_LABEL_INDEX[(rank, division)], time_id(date[10:]))
+            for day, date, mmr, rank, division in rows
+        )
+        meta = conn.execute(
+            "SELECT last_updated FROM archives WHERE player = ? AND playlist = ?", key
+        ).fetchone()
+    finally:
+        conn.close()
+    return {"dataPoints": series, "lastUpdated": meta[0] if meta else None}
+
+
+def upsert(path, key, points, last_updated):
+    """
+    Bulk upsert point dicts (date order; a later point for the same day
+    wins) in one transaction. Returns the number of rows inserted or changed.
+    """
+    player, playlist = key
+    conn = connect(path)
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(UPSERT, (
+                (player, playlist, parse_day(p["date"]), p["date"], p["mmr"], p["rank"], p["division"])
+                for p in points
+            ))
+            changed = conn.total_changes - before
+            conn.execute(
+                "INSERT INTO archives (player, playlist, last_updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (player, playlist) DO UPDATE SET last_updated = excluded.last_updated",
+                (player, playlist, last_updated),
+            )
+    finally:
+        conn.close()
+    return changed
+
+
+def import_archive(path, key, archive):
+    """Load an archive dict (point dicts or an MmrSeries) into the database."""
+    points = archive["dataPoints"]
+    if isinstance(points, MmrSeries):
+        points = points.iter_points()
+    return upsert(path, key, points, archive.get("lastUpdated"))
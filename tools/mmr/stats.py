@@ -0,0 +1,277 @@
+"""
+Incremental rolling statistics for one playlist.
+
+RollingStats folds the archive one calendar day at a time (days without a
+recorded point carry the previous MMR forward, like the display gap fill)
+and keeps everything it needs in bounded windows and running integer sums,
+so each day costs O(1):
+
+    avg7 / avg30     - mean MMR over the last 7 / 30 days
+    delta1d/7d/30d   - MMR change over the last 1 / 7 / 30 days
+    volatility30     - standard deviation of the last 30 daily changes
+    trend30          - least-squares slope over the last 30 days (MMR/day)
+    peak / trough    - all-time high / low of the recorded points
+    streak           - consecutive recorded days moving the same way
+                       (an unchanged day ends it), plus the longest ones
+    gc1              - distance to GC1 and the days-to-GC1 projection from
+                       trend30 (only for playlists with a rank table)
+
+The accumulator state is saved next to the output (mmr-stats-state.json)
+as of the day BEFORE the last archived day, because TRN keeps updating
+today's value. Each run resumes from that checkpoint and folds only the
+days after it; the stats are only rebuilt from scratch when a merge
+touched an older day or the state no longer matches the archive.
+"""
+
+import json
+import math
+from bisect import bisect_left
+from collections import deque
+from itertools import islice
+from pathlib import Path
+
+from jsoncodec import COMPACT_SEPARATORS
+from mmr.series import format_day, parse_day
+from static_output import format_report, publish_json, write_if_changed
+
+STATE_VERSION = 1
+SHORT_WINDOW = 7
+LONG_WINDOW = 30
+
+
+def state_path_for(stats_path):
+    """data/mmr-stats.json -> data/mmr-stats-state.json"""
+    stats_path = Path(stats_path)
+    return stats_path.with_name(stats_path.stem + "-state.json")
+
+
+class RollingStats:
+    """O(1)-per-day accumulator over a gap-filled daily MMR series."""
+
+    __slots__ = ("day", "mmr", "values", "deltas", "sum7", "sum30", "delta_sum", "delta_sumsq",
+                 "sx", "sxx", "sxy", "peak", "trough", "streak",
+                 "longest_up", "longest_down", "recorded_mmr")
+
+    def __init__(self):
+        self.day = None              # last folded epoch day
+        self.mmr = None              # MMR on that day
+        self.values = deque(maxlen=LONG_WINDOW + 1)  # MMR of the last 31 days
+        self.deltas = deque(maxlen=LONG_WINDOW)      # daily changes of the last 30 days
+        self.sum7 = 0
+        self.sum30 = 0
+        self.delta_sum = 0
+        self.delta_sumsq = 0
+        self.sx = 0                  # sums for the least-squares trend
+        self.sxx = 0                 # (x = epoch day, y = MMR) over
+        self.sxy = 0                 # the last 30 days
+        self.peak = None             # [mmr, day]
+        self.trough = None
+        self.streak = 0              # >0 rising, <0 falling, recorded days
+        self.longest_up = [0, None]  # [days, end day]
+        self.longest_down = [0, None]
+        self.recorded_mmr = None     # MMR of the last recorded (non-filled) day
+
+    def _push_day(self, day, mmr):
+        values = self.values
+        if values:
+            delta = mmr - values[-1]
+            if len(self.deltas) == LONG_WINDOW:
+                old = self.deltas[0]
+                self.delta_sum -= old
+                self.delta_sumsq -= old * old
+            self.deltas.append(delta)
+            self.delta_sum += delta
+            self.delta_sumsq += delta * delta
+        if len(values) >= SHORT_WINDOW:
+            self.sum7 -= values[-SHORT_WINDOW]
+        if len(values) >= LONG_WINDOW:
+            old_y = values[-LONG_WINDOW]
+            old_x = day - LONG_WINDOW
+            self.sum30 -= old_y
+            self.sx -= old_x
+            self.sxx -= old_x * old_x
+            self.sxy -= old_x * old_y
+        values.append(mmr)
+        self.sum7 += mmr
+        self.sum30 += mmr
+        self.sx += day
+        self.sxx += day * day
+        self.sxy += day * mmr
+        self.day, self.mmr = day, mmr
+
+    def _record(self, day, mmr):
+        if self.peak is None or mmr > self.peak[0]:
+            self.peak = [mmr, day]
+        if self.trough is None or mmr < self.trough[0]:
+            self.trough = [mmr, day]
+
+        if self.recorded_mmr is not None:
+            change = mmr - self.recorded_mmr
+            if change > 0:
+                self.streak = self.streak + 1 if self.streak > 0 else 1
+            elif change < 0:
+                self.streak = self.streak - 1 if self.streak < 0 else -1
+            else:
+                self.streak = 0
+            if self.streak > self.longest_up[0]:
+                self.longest_up = [self.streak, day]
+            elif -self.streak > self.longest_down[0]:
+                self.longest_down = [-self.streak, day]
+        self.recorded_mmr = mmr
+
+    def add(self, day, mmr):
+        """Fold one recorded point (days must increase)."""
+        if self.day is not None:
+            if day <= self.day:
+                raise ValueError(f"{format_day(day)} is not after {format_day(self.day)}")
+            for filled in range(self.day + 1, day):
+                self._push_day(filled, self.mmr)
+        self._push_day(day, mmr)
+        self._record(day, mmr)
+
+    def fold(self, rows):
+        for row in rows:
+            self.add(row[0], row[1])
+        return self
+
+    def to_state(self):
+        state = {"version": STATE_VERSION}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            state[name] = list(value) if isinstance(value, deque) else value
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        stats = cls()
+        for name in cls.__slots__:
+            value = state[name]
+            if isinstance(getattr(stats, name), deque):
+                getattr(stats, name).extend(value)
+            else:
+                setattr(stats, name, value)
+        return stats
+
+    def summary(self, gc1_threshold):
+        """The mmr-stats.json numbers for the current day (no "gc1" block if gc1_threshold is None)."""
+        if self.day is None:
+            raise ValueError("No data points")
+        values, n = self.values, min(len(self.values), LONG_WINDOW)
+        n7 = min(len(values), SHORT_WINDOW)
+
+        def change(days):
+            return self.mmr - values[-1 - days] if len(values) > days else None
+
+        volatility = None
+        if self.deltas:
+            k = len(self.deltas)
+            mean = self.delta_sum / k
+            volatility = round(math.sqrt(max(0.0, self.delta_sumsq / k - mean * mean)), 1)
+
+        trend = None
+        denominator = n * self.sxx - self.sx * self.sx
+        if n > 1 and denominator:
+            trend = (n * self.sxy - self.sx * self.sum30) / denominator
+
+        if self.streak > 0:
+            streak = {"direction": "up", "days": self.streak}
+        elif self.streak < 0:
+            streak = {"direction": "down", "days": -self.streak}
+        else:
+            streak = {"direction": "flat", "days": 0}
+
+        def dated(pair, key):
+            return {key: pair[0], "date": format_day(pair[1])} if pair and pair[1] is not None else None
+
+        summary = {
+            "date": format_day(self.day),
+            "mmr": self.mmr,
+            "avg7": round(self.sum7 / n7, 1),
+            "avg30": round(self.sum30 / n, 1),
+            "delta1d": change(1),
+            "delta7d": change(SHORT_WINDOW),
+            "delta30d": change(LONG_WINDOW),
+            "volatility30": volatility,
+            "trend30": round(trend, 2) if trend is not None else None,
+            "peak": dated(self.peak, "mmr"),
+            "trough": dated(self.trough, "mmr"),
+            "streak": streak,
+            "longestUp": dated(self.longest_up, "days"),
+            "longestDown": dated(self.longest_down, "days"),
+        }
+        if gc1_threshold is None:
+            return summary
+
+        gap = gc1_threshold - self.mmr
+        if gap <= 0:
+            days_to_gc1 = 0
+        elif trend and trend > 0:
+            days_to_gc1 = math.ceil(gap / trend)
+        else:
+            days_to_gc1 = None
+        summary["gc1"] = {
+            "threshold": gc1_threshold,
+            "gap": max(gap, 0),
+            "daysToGc1": days_to_gc1,
+            "projectedDate": format_day(self.day + days_to_gc1) if days_to_gc1 is not None else None,
+        }
+        return summary
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"  Warning: Ignoring stats state: {e}")
+        return None
+    return state if isinstance(state, dict) and state.get("version") == STATE_VERSION else None
+
+
+def _resume(state, series, diff):
+    """
+    (stats, archive index to fold from) continuing a saved checkpoint, or
+    None if the checkpoint cannot be trusted for this archive and diff.
+    """
+    if state is None:
+        return None
+    stats = RollingStats.from_state(state)
+    if stats.day is None:
+        return None
+    i = bisect_left(series.days, stats.day)
+    if i >= len(series) - 1 or series.days[i] != stats.day or series.mmrs[i] != stats.recorded_mmr:
+        return None
+    touched = diff["added"] + diff["updated"]
+    if touched and parse_day(min(touched)) <= stats.day:
+        return None
+    return stats, i + 1
+
+
+def update_stats(series, diff, stats_path, gc1_threshold, generated=None):
+    """
+    Bring the rolling stats up to date with the (merged) archive series and
+    publish them to `stats_path`. `diff` is the merge diff (mmr.archive).
+    Returns the published dict.
+    """
+    if not series:
+        raise ValueError("No data points")
+    stats_path = Path(stats_path)
+    state_file = state_path_for(stats_path)
+
+    resumed = _resume(load_state(state_file), series, diff)
+    stats, start = resumed if resumed else (RollingStats(), 0)
+
+    # Checkpoint just before the last archived day, which may still change
+    last = len(series) - 1
+    stats.fold(islice(series.rows(start), last - start))
+    write_if_changed(state_file, json.dumps(stats.to_state(), separators=COMPACT_SEPARATORS).encode("utf-8"))
+    stats.add(series.days[last], series.mmrs[last])
+
+    output = stats.summary(gc1_threshold)
+    output["lastUpdated"] = generated
+    report = publish_json(stats_path, output)
+    print(f"  Stats {'resumed' if resumed else 'rebuilt'} ({len(series) - start} point(s) folded): "
+          f"{format_report(report)}")
+    return output
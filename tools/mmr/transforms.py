@@ -0,0 +1,145 @@
+"""
+Display transforms for MMR data.
+
+Each stage is a generator over (day, mmr, rank, time) rows (see
+mmr.series) sorted by date. Stages keep only constant state between rows,
+so they fuse into a single O(n) pass:
+
+    iter_consolidated(iter_gap_filled(iter_daily(rows)))
+
+The series-level functions at the bottom, including series_from_entries()
+(TRN entries -> MmrSeries, where the engine classifies the ranks), can
+instead run on the NumPy engine (mmr.npengine) for long series. The engine
+is "auto", "python" or "numpy"; set it with set_engine() or the MMR_ENGINE
+environment variable. "auto" uses NumPy (if installed) from NUMPY_MIN_ROWS
+rows, where the array ops win back numpy's ~0.1 s import, or from
+NUMPY_LOADED_MIN_ROWS once something has imported it anyway (batch runs,
+a previous long series).
+"""
+
+import os
+import sys
+
+from mmr.series import GAP_TIME, MmrSeries, entry_date
+
+ENGINES = ("auto", "python", "numpy")
+NUMPY_MIN_ROWS = 150_000
+NUMPY_LOADED_MIN_ROWS = 1_000
+
+_engine = None
+
+
+def set_engine(name):
+    """Select the transform engine; "numpy" raises if numpy is not installed."""
+    global _engine
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name!r} (expected one of {', '.join(ENGINES)})")
+    if name == "numpy":
+        from mmr.npengine import HAS_NUMPY
+        if not HAS_NUMPY:
+            raise RuntimeError("The numpy engine needs numpy (pip install numpy)")
+    _engine = name
+
+
+def use_numpy(rows):
+    """Whether a series of `rows` rows goes through the NumPy engine."""
+    if _engine is None:
+        set_engine(os.environ.get("MMR_ENGINE", "auto"))
+    if _engine == "python":
+        return False
+    if _engine == "auto" and rows < (NUMPY_LOADED_MIN_ROWS if "numpy" in sys.modules else NUMPY_MIN_ROWS):
+        return False
+    from mmr.npengine import HAS_NUMPY
+    return HAS_NUMPY
+
+
+def iter_daily(rows):
+    """
+    Yield ONE row per day: the last (most recent) value for each day.
+    Rows must be sorted by date.
+    """
+    held = None
+    for row in rows:
+        if held is not None and row[0] != held[0]:
+            yield held
+        held = row
+    if held is not None:
+        yield held
+
+
+def iter_gap_filled(rows):
+    """
+    Yield rows with ONE extra row at the end of each gap of 2+ days
+    (the day before the next real data point, at the previous MMR).
+    """
+    prev = None
+    for row in rows:
+        if prev is not None and row[0] - prev[0] > 1:
+            yield (row[0] - 1, prev[1], prev[2], GAP_TIME)
+        yield row
+        prev = row
+
+
+def iter_consolidated(rows):
+    """
+    Yield only the START and END of each run of consecutive same-MMR rows.
+    """
+    run_end = None
+    run_mmr = None
+    for row in rows:
+        if run_mmr is not None and row[1] == run_mmr:
+            run_end = row
+            continue
+        if run_end is not None:
+            yield run_end
+            run_end = None
+        run_mmr = row[1]
+        yield row
+    if run_end is not None:
+        yield run_end
+
+
+def iter_display(rows):
+    """Fused display pipeline: daily dedupe -> gap fill -> flat consolidation."""
+    return iter_consolidated(iter_gap_filled(iter_daily(rows)))
+
+
+def series_from_entries(entries):
+    """MmrSeries.from_entries(), with ranks classified by the selected engine."""
+    entries = sorted(entries, key=entry_date)
+    if use_numpy(len(entries)):
+        from mmr import npengine
+        return MmrSeries.from_sorted_entries(entries, npengine.rank_indices(mmr for _, mmr in entries).tobytes())
+    return MmrSeries.from_sorted_entries(entries)
+
+
+def display_series(series):
+    """The display pipeline (iter_display) over a whole series."""
+    if use_numpy(len(series)):
+        from mmr import npengine
+        return npengine.display_series(series)
+    return MmrSeries(iter_display(series.rows()))
+
+
+def dedupe_to_daily(series):
+    """Consolidate multiple points per day to ONE per day."""
+    if use_numpy(len(series)):
+        from mmr import npengine
+        return npengine.dedupe_to_daily(series)
+    return MmrSeries(iter_daily(series.rows()))
+
+
+def fill_daily_gaps(series):
+    """Fill gaps between points with one end-of-gap point each."""
+    if use_numpy(len(series)):
+        from mmr import npengine
+        return npengine.fill_daily_gaps(series)
+    return MmrSeries(iter_gap_filled(series.rows()))
+
+
+def consolidate_flat_periods(series):
+    """Remove intermediate points in flat (same MMR) periods."""
+    if use_numpy(len(series)):
+        from mmr import npengine
+        return npengine.consolidate_flat_periods(series)
+    return MmrSeries(iter_consolidated(series.rows()))
@@ -0,0 +1,173 @@
+"""
+TRN player-history responses.
+
+api.tracker.gg has returned two shapes for the same endpoint:
+
+    keyed:  {"data": {"28": [{"collectDate", "rating", ...}, ...], ...}}
+    listed: {"data": [{"attributes": {"playlistId": 28}, "data": [...]}, ...]}
+
+iter_playlists() detects which one it was given and yields the same
+(playlist id, entries) pairs for both, so nothing downstream cares.
+stream_playlist_entries() does the same for one playlist of a saved
+response without loading the rest of it.
+"""
+
+from jsoncodec import JsonStream, load_path
+from mmr.series import MMR_MAX, MMR_MIN
+from mmr.transforms import series_from_entries
+
+API_URL_TEMPLATE = "https://api.tracker.gg/api/v1/rocket-league/player-history/mmr/{player_id}"
+
+
+def _playlist_key(key):
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        return key
+
+
+def iter_playlists(api_data):
+    """Yield (playlist id, entries) for every playlist in either response shape."""
+    data = api_data.get("data")
+    if isinstance(data, dict):
+        for key, entries in data.items():
+            if isinstance(entries, list):
+                yield _playlist_key(key), entries
+    elif isinstance(data, list):
+        for playlist in data:
+            if not isinstance(playlist, dict):
+                continue
+            entries = playlist.get("data")
+            if isinstance(entries, list):
+                yield _playlist_key(playlist.get("attributes", {}).get("playlistId")), entries
+
+
+def stream_playlist_entries(fp, playlist_id):
+    """
+    Yield the entries of `playlist_id` from a TRN response text stream,
+    decoding one entry at a time; every other playlist is skipped entry by
+    entry. Like extract_playlist(), the first non-empty match wins. In the
+    listed shape a playlist whose "data" comes before its "attributes" is
+    held until its id is known.
+    """
+    stream = JsonStream(fp)
+    for key in stream.members():
+        if key != "data":
+            stream.skip()
+        elif stream.peek() == "{":
+            for playlist_key in stream.members():
+                if _playlist_key(playlist_key) != playlist_id or stream.peek() != "[":
+                    stream.skip()
+                    continue
+                count = 0
+                for entry in stream.values():
+                    count += 1
+                    yield entry
+                if count:
+                    return
+        elif stream.peek() == "[":
+            for _ in stream.items():
+                if stream.peek() != "{":
+                    stream.skip()
+                    continue
+                found, held, count = None, None, 0
+                for member in stream.members():
+                    if member == "attributes":
+                        attributes = stream.value()
+                        found = isinstance(attributes, dict) and \
+                            _playlist_key(attributes.get("playlistId")) == playlist_id
+                    elif member == "data" and found is None:
+                        held = stream.value()
+                    elif member == "data" and found and stream.peek() == "[":
+                        for entry in stream.values():
+                            count += 1
+                            yield entry
+                    else:
+                        stream.skip()
+                if found and isinstance(held, list):
+                    count += len(held)
+                    yield from held
+                if count:
+                    return
+        else:
+            stream.skip()
+
+
+def rated_entries(entries):
+    """
+    Yield (date string, mmr) for TRN entries with a rating and a date.
+    Ratings are rounded to whole MMR; one that is not a number or falls
+    outside MMR_MIN..MMR_MAX is skipped, with a warning at the end.
+    """
+    skipped, first = 0, None
+    for e in entries:
+        rating, collected = e.get("rating"), e.get("collectDate")
+        if not rating or not collected:
+            continue
+        try:
+            mmr = int(round(rating))
+        except (TypeError, ValueError, OverflowError):
+            mmr = None
+        if mmr is None or isinstance(rating, bool) or not MMR_MIN <= mmr <= MMR_MAX:
+            skipped += 1
+            first = first or (collected, rating)
+            continue
+        yield collected, mmr
+    if skipped:
+        print(f"  Warning: Skipped {skipped} entries with an unusable rating "
+              f"(first: {first[1]!r} on {first[0]})")
+
+
+def playlist_series(entries):
+    """MmrSeries for one playlist's list of TRN entries."""
+    return series_from_entries(rated_entries(entries))
+
+
+def extract_playlist(api_data, playlist_id):
+    """
+    (playlist id, MmrSeries) for `playlist_id`, or for the first playlist
+    with any entries if that one is missing or empty.
+    Raises ValueError if the response has no playlist data at all.
+    """
+    fallback = None
+    for key, entries in iter_playlists(api_data):
+        if key == playlist_id and entries:
+            return key, playlist_series(entries)
+        if fallback is None and entries:
+            fallback = key, entries
+    if fallback is None:
+        raise ValueError("No playlist data found")
+    print(f"  Using playlist {fallback[0]}")
+    return fallback[0], playlist_series(fallback[1])
+
+
+def extract_playlist_file(path, playlist_id):
+    """
+    extract_playlist() for a saved response file, streaming `playlist_id`
+    out of it. Only if that playlist is missing or empty is the whole file
+    loaded to pick the fallback playlist.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        count = 0
+
+        def counted():
+            nonlocal count
+            for entry in stream_playlist_entries(f, playlist_id):
+                count += 1
+                yield entry
+
+        series = playlist_series(counted())
+    if count:
+        return playlist_id, series
+    return extract_playlist(load_path(path), playlist_id)
+
+
+def extract_playlists(api_data):
+    """Extract every playlist with data as {playlist id: MmrSeries}."""
+    playlists = {}
+    for key, entries in iter_playlists(api_data):
+        if entries and isinstance(key, int):
+            series = playlist_series(entries)
+            if series:
+                playlists[key] = series
+    return playlists
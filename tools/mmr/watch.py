@@ -0,0 +1,197 @@
+"""
+Wait for a TRN response to be saved to a file.
+
+On Linux the file's directory is watched with inotify (through ctypes, no
+extra package), so a save wakes the watcher immediately; elsewhere, or if
+inotify is unavailable, the file is polled with os.stat() every
+POLL_INTERVAL seconds. Watching the directory rather than the file catches
+editors that save by writing a temp file and renaming it over.
+
+A save is only taken once it is complete: events are allowed to settle
+for SETTLE_SECONDS, the size must not change while the file is read, and
+the body must parse as JSON. A half-written file simply waits for the next
+event. With skip_unchanged (the default), content identical to the last
+drop - or to what was there when watching started - is not reported again,
+so a touch or a re-save of the same response is ignored.
+
+    with open_watcher(path) as watcher:
+        data = watcher.next_drop(timeout=300)   # parsed JSON, or None
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from jsoncodec import loads
+
+POLL_INTERVAL = 0.05
+SETTLE_SECONDS = 0.02
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (then len bytes of name)
+
+
+def _load_libc():
+    """libc with the inotify calls, or None if this platform has none."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+    return libc
+
+
+class _Watcher:
+    """Shared drop detection; subclasses implement _wait(timeout) -> bool (something changed)."""
+
+    kind = None
+
+    def __init__(self, path, skip_unchanged=True):
+        self.path = Path(path)
+        self.skip_unchanged = skip_unchanged
+        self._last_digest = self._digest() if skip_unchanged else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def _digest(self):
+        try:
+            return hashlib.sha256(self.path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def _read_complete(self):
+        """Parsed JSON if the file holds a complete, new drop; else None."""
+        try:
+            before = self.path.stat()
+            body = self.path.read_bytes()
+            after = self.path.stat()
+        except OSError:
+            return None
+        if len(body) != after.st_size or (before.st_size, before.st_mtime_ns) != (after.st_size, after.st_mtime_ns):
+            return None  # still being written
+        digest = hashlib.sha256(body).hexdigest() if self.skip_unchanged else None
+        if digest is not None and digest == self._last_digest:
+            return None
+        try:
+            data = loads(body)
+        except ValueError:
+            return None  # partial write; the rest comes with the next event
+        self._last_digest = digest
+        return data
+
+    def next_drop(self, timeout=None):
+        """Block until a new complete JSON drop is saved. Returns it, or None after `timeout` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if not self._wait(remaining):
+                continue
+            while self._wait(SETTLE_SECONDS):
+                pass
+            data = self._read_complete()
+            if data is not None:
+                return data
+
+
+class InotifyWatcher(_Watcher):
+    """Event-driven watcher (Linux inotify on the file's directory)."""
+
+    kind = "inotify"
+
+    def __init__(self, path, libc, skip_unchanged=True):
+        super().__init__(path, skip_unchanged)
+        self._name = os.fsencode(self.path.name)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.fsencode(self.path.parent.resolve())
+        if libc.inotify_add_watch(self._fd, directory, _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.path.parent}")
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _wait(self, timeout):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        hit, offset = False, 0
+        while offset + _EVENT.size <= len(buf):
+            _, _, _, length = _EVENT.unpack_from(buf, offset)
+            name = buf[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            hit = hit or name == self._name
+            offset += _EVENT.size + length
+        return hit
+
+
+class PollingWatcher(_Watcher):
+    """Fallback watcher: os.stat() every POLL_INTERVAL seconds."""
+
+    kind = "polling"
+
+    def __init__(self, path, skip_unchanged=True, interval=POLL_INTERVAL):
+        super().__init__(path, skip_unchanged)
+        self.interval = interval
+        self._seen = self._signature()
+
+    def _signature(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature = self._signature()
+            if signature != self._seen:
+                self._seen = signature
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            pause = self.interval if deadline is None else min(self.interval, max(0, deadline - time.monotonic()))
+            time.sleep(pause)
+
+
+def open_watcher(path, skip_unchanged=True):
+    """An inotify watcher where available, else a polling one."""
+    libc = _load_libc()
+    if libc is not None:
+        try:
+            return InotifyWatcher(path, libc, skip_unchanged)
+        except OSError as e:
+            print(f"  inotify unavailable ({e}), polling instead")
+    return PollingWatcher(path, skip_unchanged)
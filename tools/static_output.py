@@ -0,0 +1,154 @@
+"""
+static_output.py — Shared output stage for the JSON files the site fetches.
+
+publish_json() writes, next to the pretty (human/git-friendly) file:
+    <name>.min.json      compact separators, what the browser modules load
+
+Every write is atomic (temp file + os.replace) and skipped when the bytes on
+disk are already identical, so unchanged runs touch nothing. No .gz/.br
+siblings are written: GitHub Pages compresses responses itself and never
+serves precompressed files, so the report only estimates the gzip sizes.
+
+Some pretty files are edited by hand (data/posts.json, data/updates.json).
+Run this module after such an edit to regenerate every .min.json from its
+pretty source; CI runs it with --check and fails if any is out of date:
+
+    python tools/static_output.py [--check] [FILE.json ...]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from jsoncodec import dumps_compact, dumps_pretty, loads
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write bytes via a temp file in the same directory, then rename over."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically write `data` unless the file already holds exactly these bytes."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write(path, data)
+    return True
+
+
+def min_path(path: Path) -> Path:
+    """data/mmr-data.json -> data/mmr-data.min.json"""
+    return path.with_name(path.stem + ".min" + path.suffix)
+
+
+def pretty_path(minified: Path) -> Path:
+    """data/mmr-data.min.json -> data/mmr-data.json"""
+    return minified.with_name(minified.name[:-len(".min.json")] + ".json")
+
+
+def encode_pretty(obj: Any, ensure_ascii: bool = True, trailing_newline: bool = False,
+                  default: Optional[Callable] = None) -> bytes:
+    data = dumps_pretty(obj, ensure_ascii, default)
+    return data + b"\n" if trailing_newline else data
+
+
+def encode_compact(obj: Any, ensure_ascii: bool = True, default: Optional[Callable] = None) -> bytes:
+    return dumps_compact(obj, ensure_ascii, default)
+
+
+def publish_json(path, obj: Any, ensure_ascii: bool = True, trailing_newline: bool = False,
+                 default: Optional[Callable] = None, pretty: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Write the pretty JSON file plus its minified sibling.
+    `pretty` may be passed when the caller has already encoded the pretty form.
+
+    Returns a report ("gz" and "gz_pretty" are the gzip -9 sizes of the
+    minified and pretty files, estimates of what the host would send for
+    each; neither is written):
+        {"path", "changed", "sizes": {"pretty", "min", "gz", "gz_pretty"}}
+    """
+    path = Path(path)
+    if pretty is None:
+        pretty = encode_pretty(obj, ensure_ascii, trailing_newline, default)
+    compact = encode_compact(obj, ensure_ascii, default)
+
+    outputs = {path: pretty, min_path(path): compact}
+    sizes = {"pretty": len(pretty), "min": len(compact),
+             "gz": len(gzip.compress(compact, compresslevel=9, mtime=0)),
+             "gz_pretty": len(gzip.compress(pretty, compresslevel=9, mtime=0))}
+
+    changed = [p.name for p, data in outputs.items() if write_if_changed(p, data)]
+    return {"path": str(path), "changed": changed, "sizes": sizes}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """One-line summary of a publish_json() report: the raw and the gzipped saving of .min.json."""
+    sizes = report["sizes"]
+
+    def saved(small: int, big: int) -> str:
+        return f"{100 * (1 - small / big):.0f}%" if big else "0%"
+
+    status = f"wrote {', '.join(report['changed'])}" if report["changed"] else "unchanged"
+    return (f"{Path(report['path']).name}: pretty {sizes['pretty']:,} B / min {sizes['min']:,} B "
+            f"({saved(sizes['min'], sizes['pretty'])} smaller), gzipped {sizes['gz_pretty']:,} B / "
+            f"{sizes['gz']:,} B ({saved(sizes['gz'], sizes['gz_pretty'])} smaller over the wire) - {status}")
+
+
+def tracked_pretty_files(root: Path = REPO_ROOT) -> List[Path]:
+    """Every pretty JSON file in the site that has a .min.json sibling."""
+    return sorted(pretty_path(p) for p in root.rglob("*.min.json")
+                  if ".git" not in p.parts and pretty_path(p).exists())
+
+
+def sync_minified(paths: Iterable[Path], check: bool = False) -> List[Path]:
+    """
+    Bring each pretty file's .min.json in line with it. Returns the files
+    whose minified sibling was out of date (with `check`, nothing is written).
+    """
+    stale = []
+    for path in paths:
+        obj = loads(path.read_bytes())
+        minified = min_path(path)
+        try:
+            current = loads(minified.read_bytes()) == obj
+        except (OSError, ValueError):
+            current = False
+        if current:
+            continue
+        stale.append(path)
+        if not check:
+            write_if_changed(minified, encode_compact(obj, ensure_ascii=False))
+    return stale
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate the .min.json siblings of the site's JSON files")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help="pretty JSON files (default: every one with a .min.json sibling)")
+    parser.add_argument("--check", action="store_true", help="only report stale files; exit 1 if any")
+    args = parser.parse_args(argv)
+
+    paths = args.files or tracked_pretty_files()
+    stale = sync_minified(paths, args.check)
+    for path in stale:
+        print(f"{'Out of date' if args.check else 'Regenerated'}: {os.path.relpath(min_path(path))}")
+    if args.check and stale:
+        print("Run `python tools/static_output.py` and commit the result.")
+        return 1
+    print(f"{len(paths) - len(stale)} of {len(paths)} minified files up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
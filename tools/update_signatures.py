@@ -4,24 +4,72 @@ update_signatures.py — Fetches signature data from the published Google Sheet
 and writes signatures.json for the campaign site.
 
 Usage:
-    python tools/update_signatures.py
+    python tools/update_signatures.py [--full] [--url URL] [--output PATH] [--pages-dir DIR]
+    python tools/update_signatures.py --pages-only   # republish the pages from signatures.json
 
 The script:
-    1. Fetches the published CSV from Google Sheets
+    1. Fetches the published CSV from Google Sheets, conditionally, into a
+       local copy (then decoded from disk as it is parsed)
     2. Counts total submissions
     3. Filters to only approved entries (approval_status = 'approved' or 'auto_approved')
-    4. Extracts public_display_name values
-    5. Writes data/signatures.json
+    4. Extracts public_display_name values, one per signer: names are
+       compared by their normalized form (NFKC, casefolded, whitespace
+       collapsed), so "Bear", " bear " and "ＢＥＡＲ" are one signer and the
+       first approved spelling is the one shown
+    5. Writes signatures.json, only if the published data changed
+    6. Writes the same names as fixed-size pages for the site:
+           signatures-pages/summary.json         counts, page size, page count
+           signatures-pages/signatures-0001.json first PAGE_SIZE names, ...
+       Pages before the first new name are left alone, so an append run
+       rewrites only the last page (or adds one) plus the summary.
+       --pages-only skips steps 1-5 and republishes the pages from the
+       current signatures.json (after a schema change, or in CI to check
+       the committed pages are current).
+
+Incremental runs: after each run a checkpoint (row count + SHA-256 of the
+rows) is saved to tools/.signatures-state.json. The next run hashes the
+same number of leading rows without interpreting them; if they still match,
+only the rows appended since are filtered and added to the previous entries.
+If anything before the checkpoint changed (a moderator edited a status, a
+row was deleted) the local copy is scanned again in full. --full ignores
+the checkpoint and the fetch cache.
+
+Fetch cache: the body is kept in tools/.signatures-cache.csv, with its
+ETag, Last-Modified and SHA-256 in tools/.signatures-cache.json. Requests
+send If-None-Match/If-Modified-Since; a 304, or a 200 whose body hashes
+the same, ends the run before anything is parsed or written. Timeouts,
+dropped connections and 408/429/5xx answers are retried with jittered
+exponential backoff; if the sheet still can't be fetched, the cached copy
+is used instead. The validators are only saved once a body has been fully
+processed, so a failed run is redone next time.
+
+The normalized names seen so far are persisted with it
+(tools/.signatures-index.json, a key -> on-the-wall flag map), so duplicate
+detection for appended rows is one dict lookup per row across runs.
+unique_signers counts distinct normalized names, plus every submission
+without a display name (those cannot be matched).
 """
 
+import argparse
 import csv
+import hashlib
+import io
 import json
+import os
+import random
 import sys
-from io import StringIO
+import time
+import unicodedata
+from itertools import islice
 from pathlib import Path
+from http.client import HTTPException
+from typing import Iterable, List, Optional, Tuple
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 
+from jsoncodec import COMPACT_SEPARATORS, dumps_cache, load_path
+from static_output import format_report, min_path, publish_json, write_if_changed
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -43,94 +91,475 @@ APPROVED_STATUSES = {"approved", "auto_approved"}
 # Output path (relative to repo root)
 OUTPUT_FILE = Path(__file__).parent.parent / "signatures.json"
 
+# Paged copy of the entries: the site loads summary.json and page 1 only
+PAGES_DIR = Path(__file__).parent.parent / "signatures-pages"
+PAGE_SIZE = 250  # names per page; the wall shows 250 (config.js signatureLimit)
+
+# Fetch cache: validators + hash here, the body next to it as .csv (local, not committed)
+FETCH_CACHE_FILE = Path(__file__).parent / ".signatures-cache.json"
+FETCH_ATTEMPTS = 4
+BACKOFF_BASE = 1.0  # seconds; attempt n waits up to BACKOFF_BASE * 2**n (full jitter)
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+DOWNLOAD_CHUNK = 64 * 1024
+
+# Checkpoint of the last run (local cache, not committed)
+STATE_FILE = Path(__file__).parent / ".signatures-state.json"
+STATE_VERSION = 1
+HASH_CHUNK_ROWS = 4096
+
+# Normalized-name index that goes with the checkpoint (local cache, not committed)
+INDEX_FILE = Path(__file__).parent / ".signatures-index.json"
+INDEX_VERSION = 1
+
 # ============================================================================
 # MAIN LOGIC
 # ============================================================================
 
-def fetch_csv(url: str) -> str:
-    """Fetch CSV content from URL."""
+class SheetFetch:
+    """Outcome of fetch_csv(): where the CSV is, and whether it needs processing."""
+    
+    __slots__ = ("path", "status", "validators")
+    
+    def __init__(self, path: Optional[Path], status: str, validators: Optional[dict] = None):
+        self.path = path          # the local copy of the body (None if there is none)
+        self.status = status      # "changed", "unchanged" (304 / same hash) or "cached" (fetch failed)
+        self.validators = validators  # to commit_fetch() once processed
+
+
+def body_path(cache_file: Path) -> Path:
+    return cache_file.with_suffix(".csv")
+
+
+def load_fetch_cache(cache_file: Path, url: str) -> dict:
+    """The validators of the last processed body for `url`, or {} (also if its copy is gone)."""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[Signatures] Warning: Ignoring fetch cache: {e}")
+        return {}
+    if not isinstance(cache, dict) or cache.get("url") != url or not body_path(cache_file).exists():
+        return {}
+    return cache
+
+
+def _download(req: Request, dest: Path) -> Tuple[str, dict]:
+    """Stream the response body to `dest`. Returns (sha256, validators)."""
+    sha = hashlib.sha256()
+    with urlopen(req, timeout=30) as resp, open(dest, "wb") as f:
+        while True:
+            chunk = resp.read(DOWNLOAD_CHUNK)
+            if not chunk:
+                break
+            sha.update(chunk)
+            f.write(chunk)
+        headers = resp.headers
+    digest = sha.hexdigest()
+    return digest, {"etag": headers.get("ETag"), "lastModified": headers.get("Last-Modified"), "sha256": digest}
+
+
+def fetch_csv(url: str, cache_file: Path, conditional: bool = True) -> SheetFetch:
+    """Fetch the sheet into the local copy, conditionally and with retries (see the module docstring)."""
     print(f"[Signatures] Fetching CSV from Google Sheets...")
     
-    req = Request(url, headers={"User-Agent": "MaGnetBear-SignatureUpdater/1.0"})
+    cached = load_fetch_cache(cache_file, url)
+    headers = {"User-Agent": "MaGnetBear-SignatureUpdater/1.0"}
+    if conditional and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if conditional and cached.get("lastModified"):
+        headers["If-Modified-Since"] = cached["lastModified"]
+    req = Request(url, headers=headers)
+    body = body_path(cache_file)
+    tmp = body.with_name(body.name + ".tmp")
     
+    error = None
+    for attempt in range(FETCH_ATTEMPTS):
+        if attempt:
+            delay = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+            print(f"[Signatures] {error} - retrying in {delay:.1f}s ({attempt + 1}/{FETCH_ATTEMPTS})")
+            time.sleep(delay)
+        try:
+            digest, validators = _download(req, tmp)
+        except HTTPError as e:
+            if e.code == 304:
+                print("[Signatures] Not modified since the last run (304)")
+                return SheetFetch(body, "unchanged")
+            error = f"HTTP Error {e.code}: {e.reason}"
+            if e.code not in RETRY_STATUSES:
+                break
+        except (URLError, HTTPException, OSError) as e:
+            error = f"URL Error: {getattr(e, 'reason', e)}"
+        else:
+            if conditional and digest == cached.get("sha256"):
+                os.unlink(tmp)
+                print("[Signatures] Body identical to the last run")
+                return SheetFetch(body, "unchanged")
+            os.replace(tmp, body)
+            print(f"[Signatures] Fetched {body.stat().st_size} bytes")
+            return SheetFetch(body, "changed", validators)
+    
+    print(f"[Signatures] {error}")
+    if os.path.exists(tmp):
+        os.unlink(tmp)
+    if body.exists():
+        print(f"[Signatures] Falling back to the cached copy ({body.name})")
+        return SheetFetch(body, "cached")
+    return SheetFetch(None, "cached")
+
+
+def commit_fetch(cache_file: Path, url: str, validators: dict) -> None:
+    """Remember a processed body's validators, so the next fetch can be conditional."""
+    write_if_changed(cache_file, json.dumps(dict(validators, url=url), indent=2).encode("utf-8"))
+
+
+def open_csv(path: Path) -> io.TextIOWrapper:
+    """The local CSV copy as text lines, decoded incrementally as csv.reader asks for them."""
+    # newline="" hands csv.reader the raw line endings, as the csv docs require
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _hash_records(sha, rows: List[List[str]]) -> None:
+    """Feed CSV records to the checkpoint hash (independent of quoting and line endings)."""
+    sha.update("".join(["\x1f".join(row) + "\x1e" for row in rows]).encode("utf-8"))
+
+
+def normalize_name(name: str) -> str:
+    """Dedupe key for a display name: NFKC, casefolded, runs of whitespace collapsed to one space."""
+    if name.isascii():
+        return " ".join(name.lower().split())  # NFKC is a no-op and casefold == lower for ASCII
+    return " ".join(unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", name).casefold()).split())
+
+
+class NameIndex:
+    """
+    Normalized display names seen in the sheet: key -> 1 once an approved
+    submission put that name on the wall, else 0 (ints, so the dict is
+    saved and loaded as is).
+    """
+    
+    def __init__(self, names: Optional[dict] = None, unnamed: int = 0):
+        self.names = {} if names is None else names
+        self.unnamed = unnamed
+        self.duplicates = 0
+    
+    @property
+    def unique_signers(self) -> int:
+        return len(self.names) + self.unnamed
+    
+    def add(self, name: str, approved: bool) -> bool:
+        """Record one submission. True if `name` is new on the wall (approved, not shown yet)."""
+        if not name:
+            self.unnamed += 1
+            return False
+        key = normalize_name(name)
+        shown = self.names.get(key)
+        if shown is None:
+            self.names[key] = 1 if approved else 0
+            return approved
+        self.duplicates += 1
+        if approved and not shown:
+            self.names[key] = 1
+            return True
+        return False
+
+
+def load_index(path: Path, state: Optional[dict]) -> Optional[NameIndex]:
+    """The name index saved with the checkpoint, or None if missing or out of step with it."""
+    if state is None:
+        return None
+    try:
+        saved = load_path(path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(saved, dict) or saved.get("version") != INDEX_VERSION or saved.get("digest") != state["digest"]:
+        return None
+    if not isinstance(saved.get("names"), dict) or not isinstance(saved.get("unnamed"), int):
+        return None
+    return NameIndex(saved["names"], saved["unnamed"])
+
+
+def save_index(path: Path, index: NameIndex, digest: str) -> None:
+    saved = {"version": INDEX_VERSION, "digest": digest, "unnamed": index.unnamed, "names": index.names}
+    write_if_changed(path, dumps_cache(saved))
+
+
+def entries_digest(entries: List[str]) -> str:
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def load_state(path: Path) -> Optional[dict]:
+    """The last run's checkpoint, or None if missing/unreadable/another version."""
     try:
-        with urlopen(req, timeout=30) as resp:
-            content = resp.read().decode("utf-8")
-            print(f"[Signatures] Fetched {len(content)} bytes")
-            return content
-    except HTTPError as e:
-        print(f"[Signatures] HTTP Error {e.code}: {e.reason}")
-        sys.exit(1)
-    except URLError as e:
-        print(f"[Signatures] URL Error: {e.reason}")
-        sys.exit(1)
-
-
-def parse_signatures(csv_content: str) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[Signatures] Warning: Ignoring checkpoint: {e}")
+        return None
+    return state if isinstance(state, dict) and state.get("version") == STATE_VERSION else None
+
+
+def load_previous(output_path: Path, state: Optional[dict]) -> Optional[dict]:
+    """The published data the checkpoint describes, or None if they no longer match."""
+    if state is None:
+        return None
+    try:
+        with open(output_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        entries = previous["entries"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if previous.get("total_signatures") != state["total"] or entries_digest(entries) != state["entries_digest"]:
+        return None
+    return previous
+
+
+def parse_signatures(lines: Iterable[str], index: NameIndex, state: Optional[dict] = None,
+                     previous: Optional[dict] = None) -> Tuple[Optional[dict], dict]:
     """
-    Parse CSV and extract signature data.
+    Parse CSV lines and extract signature data. Every submission is
+    recorded in `index` (empty for a full scan).
+    
+    With a checkpoint (`state`, plus the `previous` data and the index it
+    describes), the first state["rows"] rows are only hashed; if they
+    match, the previous entries are kept and only the rows after them are
+    filtered.
     
-    Returns:
+    Returns (data, new_state), or (None, {}) if the rows before the
+    checkpoint changed and a full scan is needed. data is:
         {
             "total_signatures": int,
+            "unique_signers": int,
             "approved_signatures": int,
             "entries": [str, ...]
         }
     """
-    reader = csv.DictReader(StringIO(csv_content))
+    reader = csv.reader(lines)
+    sha = hashlib.sha256()
+    header = next(reader, [])
+    _hash_records(sha, [header])
+    status_col = header.index(COL_APPROVAL_STATUS) if COL_APPROVAL_STATUS in header else None
+    name_col = header.index(COL_PUBLIC_DISPLAY_NAME) if COL_PUBLIC_DISPLAY_NAME in header else None
+    rows = filter(None, reader)  # csv.DictReader skipped blank lines too
     
     total = 0
     approved_names = []
     
-    for row in reader:
-        total += 1
-        
-        status = row.get(COL_APPROVAL_STATUS, "").strip().lower()
-        name = row.get(COL_PUBLIC_DISPLAY_NAME, "").strip()
+    if state is not None and previous is not None:
+        # Rows are hashed a chunk at a time so the skipped prefix costs no per-row Python
+        while total < state["rows"]:
+            chunk = list(islice(rows, min(HASH_CHUNK_ROWS, state["rows"] - total)))
+            if not chunk:
+                break
+            _hash_records(sha, chunk)
+            total += len(chunk)
+        if total != state["rows"] or sha.hexdigest() != state["digest"]:
+            return None, {}
+        approved_names = list(previous["entries"])
+        print(f"[Signatures] Checkpoint matched: {total} rows already processed")
+    
+    while True:
+        chunk = list(islice(rows, HASH_CHUNK_ROWS))
+        if not chunk:
+            break
+        _hash_records(sha, chunk)
+        total += len(chunk)
         
-        # Only include if status is approved/auto_approved AND has a display name
-        if status in APPROVED_STATUSES and name:
-            approved_names.append(name)
+        for row in chunk:
+            status = row[status_col].strip().lower() if status_col is not None and status_col < len(row) else ""
+            name = row[name_col].strip() if name_col is not None and name_col < len(row) else ""
+            
+            # Only include if status is approved/auto_approved AND has a display name not shown yet
+            if index.add(name, status in APPROVED_STATUSES):
+                approved_names.append(name)
     
     print(f"[Signatures] Total submissions: {total}")
+    print(f"[Signatures] Unique signers: {index.unique_signers}"
+          f" ({index.duplicates} repeat submission(s) this run)")
     print(f"[Signatures] Approved with names: {len(approved_names)}")
     
-    return {
+    data = {
         "total_signatures": total,
+        "unique_signers": index.unique_signers,
         "approved_signatures": len(approved_names),
         "entries": approved_names
     }
+    new_state = {
+        "version": STATE_VERSION,
+        "rows": total,
+        "digest": sha.hexdigest(),
+        "total": total,
+        "entries_digest": entries_digest(approved_names),
+    }
+    return data, new_state
+
+
+def save_state(path: Path, state: dict) -> None:
+    write_if_changed(path, json.dumps(state, separators=COMPACT_SEPARATORS).encode("utf-8"))
 
 
 def write_json(data: dict, output_path: Path) -> None:
-    """Write data to JSON file with pretty formatting."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")  # trailing newline
+    """Write data to JSON file with pretty formatting, plus its minified sibling."""
+    report = publish_json(output_path, data, ensure_ascii=False, trailing_newline=True)
+    
+    print(f"[Signatures] {format_report(report)}")
+
+
+def page_path(pages_dir: Path, number: int) -> Path:
+    return pages_dir / f"signatures-{number:04d}.json"
+
+
+def page_summary(data: dict, page_size: int) -> dict:
+    summary = {"total_signatures": data["total_signatures"]}
+    if "unique_signers" in data:  # absent from an output written before it was counted
+        summary["unique_signers"] = data["unique_signers"]
+    summary.update({
+        "approved_signatures": data["approved_signatures"],
+        "page_size": page_size,
+        "pages": -(-len(data["entries"]) // page_size),
+    })
+    return summary
+
+
+def load_summary(pages_dir: Path) -> Optional[dict]:
+    try:
+        with open(pages_dir / "summary.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_pages(data: dict, pages_dir: Path, page_size: int, start: int = 0) -> dict:
+    """
+    Publish the entries as pages of `page_size` names plus summary.json.
+    Pages wholly before entry index `start` are known to be current and
+    are not re-encoded. Returns the summary.
+    """
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    entries = data["entries"]
+    summary = page_summary(data, page_size)
     
-    print(f"[Signatures] Wrote {output_path}")
+    rewritten = []
+    for number in range(start // page_size + 1, summary["pages"] + 1):
+        page = entries[(number - 1) * page_size:number * page_size]
+        report = publish_json(page_path(pages_dir, number), page, ensure_ascii=False, trailing_newline=True)
+        if report["changed"]:
+            rewritten.append(number)
+    
+    # Drop pages left over from a longer wall (entries removed by an edit)
+    number = summary["pages"] + 1
+    while page_path(pages_dir, number).exists():
+        pretty = page_path(pages_dir, number)
+        minified = min_path(pretty)
+        for path in (pretty, minified):
+            path.unlink(missing_ok=True)
+        number += 1
+    
+    # Summary last, so it never points at pages that are not written yet
+    publish_json(pages_dir / "summary.json", summary, trailing_newline=True)
+    pages = ", ".join(str(n) for n in rewritten) if rewritten else "none"
+    print(f"[Signatures] Pages: {summary['pages']} x {page_size} names, rewritten: {pages}")
+    return summary
+
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Update signatures.json from the published Google Sheet")
+    parser.add_argument("--url", default=SHEET_CSV_URL, help="CSV URL (default: the published sheet)")
+    parser.add_argument("--output", default=str(OUTPUT_FILE), help="Output JSON (default: signatures.json)")
+    parser.add_argument("--pages-dir", default=str(PAGES_DIR),
+                        help="Directory for the paged output (default: signatures-pages/)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help=f"Names per page (default: {PAGE_SIZE})")
+    parser.add_argument("--state", default=str(STATE_FILE),
+                        help="Checkpoint file (default: tools/.signatures-state.json)")
+    parser.add_argument("--index", default=str(INDEX_FILE),
+                        help="Normalized-name index file (default: tools/.signatures-index.json)")
+    parser.add_argument("--cache", default=str(FETCH_CACHE_FILE),
+                        help="Fetch cache file; the CSV copy goes next to it as .csv "
+                             "(default: tools/.signatures-cache.json)")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the checkpoint and fetch cache: download and rescan every row")
+    parser.add_argument("--pages-only", action="store_true",
+                        help="Don't fetch: republish the pages from the existing output file")
+    args = parser.parse_args(argv)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    return args
 
-def main():
+
+def main(argv=None):
+    args = parse_args(argv)
+    output_file, state_file, pages_dir = Path(args.output), Path(args.state), Path(args.pages_dir)
+    index_file, cache_file = Path(args.index), Path(args.cache)
+    
     print("=" * 60)
     print("MaGnetBear Signature Wall Updater")
     print("=" * 60)
     
+    if args.pages_only:
+        try:
+            with open(output_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Signatures] Cannot read {output_file.name}: {e}")
+            return 1
+        summary = write_pages(data, pages_dir, args.page_size)
+        print(f"[OK] {summary['pages']} pages republished from {output_file.name}")
+        return 0
+    
+    state = None if args.full else load_state(state_file)
+    previous = load_previous(output_file, state)
+    
     # Fetch
-    csv_content = fetch_csv(SHEET_CSV_URL)
+    fetched = fetch_csv(args.url, cache_file, conditional=not args.full)
+    if fetched.path is None:
+        return 1
+    if fetched.status == "unchanged" and previous is not None:
+        print()
+        print("=" * 60)
+        print("[OK] Sheet unchanged since the last run - nothing to do")
+        print("=" * 60)
+        return 0
+    
+    index = load_index(index_file, state) if previous is not None else None
+    if index is None:
+        state, previous, index = None, None, NameIndex()
     
-    # Parse
-    data = parse_signatures(csv_content)
+    # Parse, streamed from the local copy
+    with open_csv(fetched.path) as lines:
+        data, new_state = parse_signatures(lines, index, state, previous)
+    appended = data is not None and previous is not None
+    if data is None:
+        print("[Signatures] Rows before the checkpoint changed - rescanning in full")
+        index = NameIndex()
+        with open_csv(fetched.path) as lines:
+            data, new_state = parse_signatures(lines, index)
     
     # Write
-    write_json(data, OUTPUT_FILE)
+    if data == previous:
+        print(f"[Signatures] No change since the last run - {output_file.name} not rewritten")
+    else:
+        write_json(data, output_file)
+    summary = load_summary(pages_dir)
+    if data != previous or summary != page_summary(data, args.page_size):
+        # After an append run the pages up to the previous entries are still current
+        current = appended and summary == page_summary(previous, args.page_size)
+        write_pages(data, pages_dir, args.page_size, start=len(previous["entries"]) if current else 0)
+    if not (appended and new_state == state):
+        save_index(index_file, index, new_state["digest"])
+        save_state(state_file, new_state)
+    if fetched.validators:
+        commit_fetch(cache_file, args.url, fetched.validators)
     
     # Summary
     print()
     print("=" * 60)
     print(f"[OK] Total signatures:    {data['total_signatures']}")
+    print(f"[OK] Unique signers:      {data['unique_signers']}")
     print(f"[OK] Approved to display: {data['approved_signatures']}")
-    print(f"[OK] Output written to:   {OUTPUT_FILE.name}")
+    print(f"[OK] Output written to:   {output_file.name}")
     print("=" * 60)
     
     # Show preview of names
@@ -141,7 +570,8 @@ def main():
             print(f"  - {name}")
         if len(data["entries"]) > 10:
             print(f"  ... and {len(data['entries']) - 10} more")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())